@@ -0,0 +1 @@
+"""Client-side helpers shared by bug_reproduction_script.py and streamlit_app.py."""
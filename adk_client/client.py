@@ -0,0 +1,133 @@
+"""Pooled HTTP client for the ADK api_server.
+
+All calls share one `requests.Session` per server URL, so session creation, /run and
+/run_sse reuse kept-alive TCP connections instead of opening a new one per call. Pool size,
+timeouts and retry/backoff are set in one place.
+"""
+import json
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_SERVER_URL = "http://localhost:8000"
+
+# Connections kept open per host. One Streamlit server process shares a client across all
+# user sessions, so this is the number of concurrent requests that avoid a new connection.
+POOL_MAXSIZE = 32
+# (connect, read) seconds. The read timeout is the longest gap allowed between bytes, which
+# for /run covers the whole agent turn including slow tools.
+DEFAULT_TIMEOUT = (3.05, 120)
+# Retries only cover failures before the request reaches the agent (connection errors) and
+# gateway errors on idempotent methods; a POST to /run or /run_sse is never replayed after
+# it was sent, since that would re-run the model and tools.
+RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    status=2,
+    backoff_factor=0.25,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+    raise_on_status=False,
+)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+# Event streams may come compressed (see multi_tool_agent/sse_compression.py): gzip, and br
+# when the brotli package is installed. requests decodes them before iter_content.
+SSE_ACCEPT_HEADERS = {"Accept": "text/event-stream", "Accept-Encoding": requests.utils.DEFAULT_ACCEPT_ENCODING}
+SSE_HEADERS = {**JSON_HEADERS, **SSE_ACCEPT_HEADERS}
+
+
+class ADKClient:
+    """Thin wrapper over a pooled `requests.Session` bound to one ADK server URL.
+
+    Methods return `requests.Response` objects, so callers keep their existing
+    `raise_for_status()` / `requests.exceptions` handling.
+    """
+
+    def __init__(self, base_url=DEFAULT_SERVER_URL, pool_maxsize=POOL_MAXSIZE,
+                 timeout=DEFAULT_TIMEOUT, retry=RETRY):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def create_session(self, app_name, user_id, session_id, state=None):
+        """POSTs /apps/{app}/users/{user}/sessions/{id}. A 400 "Session already exists" is
+        returned as-is for the caller to treat as reuse."""
+        return self.post(
+            f"/apps/{app_name}/users/{user_id}/sessions/{session_id}",
+            headers=JSON_HEADERS,
+            data=json.dumps({"state": state or {}}),
+        )
+
+    def get_session(self, app_name, user_id, session_id):
+        """GETs /apps/{app}/users/{user}/sessions/{id}, including the events stored so far."""
+        return self.get(f"/apps/{app_name}/users/{user_id}/sessions/{session_id}")
+
+    def delete_session(self, app_name, user_id, session_id):
+        """DELETEs /apps/{app}/users/{user}/sessions/{id}."""
+        return self.request("DELETE", f"/apps/{app_name}/users/{user_id}/sessions/{session_id}")
+
+    def run(self, app_name, user_id, session_id, text):
+        """POSTs a user message to the non-streaming /run endpoint."""
+        return self.post("/run", headers=JSON_HEADERS,
+                         data=json.dumps(run_payload(app_name, user_id, session_id, text)))
+
+    def run_sse(self, app_name, user_id, session_id, text, headers=None):
+        """POSTs a user message to /run_sse and returns the open streaming response.
+
+        Use it as a context manager so the connection goes back to the pool when done.
+        """
+        return self.post(
+            "/run_sse",
+            headers={**SSE_HEADERS, **(headers or {})},
+            data=json.dumps(run_payload(app_name, user_id, session_id, text, streaming=True)),
+            stream=True,
+        )
+
+    def close(self):
+        self.session.close()
+
+
+def run_payload(app_name, user_id, session_id, text, streaming=False):
+    payload = {
+        "app_name": app_name,
+        "user_id": user_id,
+        "session_id": session_id,
+        "new_message": {"role": "user", "parts": [{"text": text}]},
+    }
+    if streaming:
+        payload["streaming"] = True
+    return payload
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(base_url=DEFAULT_SERVER_URL):
+    """Returns the process-wide shared client for base_url, creating it on first use."""
+    key = base_url.rstrip("/")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = ADKClient(key)
+        return client
@@ -0,0 +1,142 @@
+"""Reads a stream on a background thread into a bounded queue, for UIs that poll.
+
+The Streamlit app used to iterate the /run_sse response in its script thread, so a slow agent
+held the script run and a stop request was only noticed between events. A StreamConsumer
+iterates the stream (e.g. a ResumableStream) on its own daemon thread and hands items over
+through a bounded queue: the UI drains whatever arrived at its own cadence, and a consumer
+that falls behind applies backpressure to the socket instead of buffering without limit.
+`cancel()` shuts down the open socket, so a read blocked on a silent server returns at once.
+A UI that stops polling altogether (its browser tab was closed) is detected by the queue
+staying full for `stall_timeout` seconds: the consumer then cancels itself, so the thread and
+its socket do not outlive the page.
+"""
+import queue
+import socket
+import threading
+import time
+
+STREAM_QUEUE_SIZE = 1000  # items buffered between the reader thread and the UI
+STREAM_STALL_TIMEOUT_SECONDS = 60  # queue full this long without a poll: nobody is reading
+
+# Queue item kinds
+ITEM = "item"  # an item of the stream
+STATUS = "status"  # an out-of-band status text, e.g. "reconnecting"
+DONE = "done"  # the stream ended; the value is the exception that ended it, or None
+
+
+def shutdown_response(response):
+    """Shuts down a streaming requests response's socket, waking a read blocked on it."""
+    connection = getattr(response.raw, "_connection", None)
+    sock = getattr(connection, "sock", None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # already closed
+
+
+class StreamConsumer:
+    """Iterates `stream` on a background thread; `poll()` returns what arrived since.
+
+    `stream` may have a `cancel()` method (ResumableStream does), which is called on cancel.
+    Code that opens the HTTP response passes it to `watch()`, so `cancel()` can shut down its
+    socket. `stalled` is set when the consumer cancelled itself because nobody polled.
+    """
+
+    def __init__(self, stream, maxsize=STREAM_QUEUE_SIZE, name="stream-consumer",
+                 stall_timeout=STREAM_STALL_TIMEOUT_SECONDS):
+        self.stream = stream
+        self.queue = queue.Queue(maxsize)
+        self.stall_timeout = stall_timeout
+        self.stalled = False
+        self._cancelled = threading.Event()
+        self._response = None
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.done = False  # set by poll() once the DONE item was returned
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def watch(self, response):
+        """Registers the currently open response (None when it is closed)."""
+        with self._lock:
+            self._response = response
+        if response is not None and self.cancelled:
+            shutdown_response(response)
+
+    def status(self, text):
+        """Queues a status text for the UI (from the reader thread, e.g. on reconnect)."""
+        self._put((STATUS, text))
+
+    def _put(self, entry):
+        deadline = None
+        while not self.cancelled:
+            try:
+                self.queue.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                # The UI is behind: wait, which stops reading from the socket. Polling would
+                # have made room, so a queue full past the stall timeout has no reader left.
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.stall_timeout
+                elif now >= deadline:
+                    self.stalled = True
+                    self.cancel()
+        return False
+
+    def _run(self):
+        error = None
+        iterator = iter(self.stream)
+        try:
+            for item in iterator:
+                if not self._put((ITEM, item)):
+                    break
+        except Exception as e:
+            error = e
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+        if self.cancelled:
+            error = None  # the error is the socket shutdown
+        if not self._put((DONE, error)):
+            # Cancelled: nobody wants the rest, so make room for DONE
+            with self.queue.mutex:
+                self.queue.queue.clear()
+            self.queue.put_nowait((DONE, error))
+
+    def poll(self, max_items=None, timeout=0.0):
+        """Returns queued (kind, value) pairs without blocking (or waiting up to `timeout` for
+        the first one). At most `max_items`, to bound the work per UI frame."""
+        entries = []
+        try:
+            entries.append(self.queue.get(timeout=timeout) if timeout else self.queue.get_nowait())
+            while max_items is None or len(entries) < max_items:
+                entries.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if any(kind == DONE for kind, _ in entries):
+            self.done = True
+        return entries
+
+    def cancel(self):
+        """Stops the stream: no reconnects, and the socket is shut down right away."""
+        self._cancelled.set()
+        cancel = getattr(self.stream, "cancel", None)
+        if cancel is not None:
+            cancel()
+        with self._lock:
+            response = self._response
+        if response is not None:
+            shutdown_response(response)
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
@@ -0,0 +1,59 @@
+"""Readers for ADK event dicts: fields that are not plain content, and partial text events."""
+
+# Custom metadata key of tool progress events (see multi_tool_agent/progress.py).
+PROGRESS_METADATA_KEY = "progress"
+
+
+def progress_of(event):
+    """Returns the {"tool", "message"} progress report carried by an ADK event dict, or None."""
+    metadata = event.get("customMetadata") or event.get("custom_metadata")
+    if not isinstance(metadata, dict):
+        return None
+    return metadata.get(PROGRESS_METADATA_KEY)
+
+
+class PartialText:
+    """A partial text event, the bulk of a streamed answer, without its nested dicts.
+
+    Made from an ADK event with `partial: true` whose parts are all text (`text` joins them),
+    or from a partial `speak` event of the speak/tool_code/tool_result envelope. Every other
+    event stays a dict.
+    """
+
+    __slots__ = ("id", "text", "invocation_id", "author", "utterance_id")
+    partial = True
+
+    def __init__(self, id, text, invocation_id=None, author=None, utterance_id=None):
+        self.id = id
+        self.text = text
+        self.invocation_id = invocation_id
+        self.author = author
+        self.utterance_id = utterance_id
+
+    def __repr__(self):
+        return f"PartialText(id={self.id!r}, text={self.text!r}, utterance_id={self.utterance_id!r})"
+
+    @classmethod
+    def from_event(cls, event):
+        """The PartialText for an event dict, or None if it is not a partial text event."""
+        kind = event.get("event")
+        if kind is not None:  # speak/tool_code/tool_result envelope
+            data = event.get("data")
+            if kind != "speak" or not isinstance(data, dict) or not data.get("partial"):
+                return None
+            text = data.get("text")
+            if not isinstance(text, str):
+                return None
+            return cls(event.get("id"), text, utterance_id=data.get("utterance_id"))
+
+        if event.get("partial") is not True or "customMetadata" in event or "errorCode" in event:
+            return None
+        content = event.get("content")
+        parts = content.get("parts") if isinstance(content, dict) else None
+        if not parts:
+            return None
+        texts = [part.get("text") if isinstance(part, dict) else None for part in parts]
+        if not all(isinstance(text, str) for text in texts):
+            return None
+        return cls(event.get("id"), texts[0] if len(texts) == 1 else "".join(texts),
+                   event.get("invocationId"), event.get("author"))
@@ -0,0 +1,171 @@
+"""Pluggable JSON parsing of SSE event payloads, straight from bytes.
+
+A streamed answer is thousands of small `data:` payloads, each parsed on the client. A
+backend parses the payload bytes as they come out of a raw SSEDecoder, without decoding
+them to text first: orjson or msgspec when installed (neither is required), otherwise the
+stdlib json module. Set ADK_CLIENT_JSON_BACKEND to orjson, msgspec
+or json to choose; by default the first installed one in that order is used, except by a
+typed EventDecoder, which prefers msgspec (see TYPED_JSON_BACKENDS).
+
+An EventDecoder also turns partial text events into PartialText objects (see
+adk_client.events). With msgspec they are decoded into typed Structs directly, without
+building the nested dicts at all. Malformed payloads raise ValueError with every backend.
+"""
+import functools
+import importlib
+import json
+import os
+from typing import Any, Optional
+
+from .events import PartialText
+
+JSON_BACKEND_ENV = "ADK_CLIENT_JSON_BACKEND"
+JSON_BACKENDS = ("orjson", "msgspec", "json")  # in order of preference
+# For typed decoding msgspec comes first: it builds PartialText from typed Structs, while
+# orjson builds the nested dicts and converts them after, which bench_json_decoding shows
+# running at about half the speed of orjson dicts and barely ahead of the stdlib.
+TYPED_JSON_BACKENDS = ("msgspec", "orjson", "json")
+
+_backends = {}
+
+
+class JsonBackend:
+    """A named `loads(bytes or str)`; `module` is the imported library."""
+
+    __slots__ = ("name", "loads", "module")
+
+    def __init__(self, name, loads, module):
+        self.name = name
+        self.loads = loads
+        self.module = module
+
+    def __repr__(self):
+        return f"JsonBackend({self.name!r})"
+
+
+def _stdlib_loads(data):
+    # json.loads would detect the encoding of bytes first; the payload is always UTF-8.
+    return json.loads(data if isinstance(data, str) else data.decode("utf-8"))
+
+
+def _load_backend(name):
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected one of {', '.join(JSON_BACKENDS)}")
+    module = importlib.import_module(name)
+    if name == "msgspec":
+        import msgspec.json
+        return JsonBackend(name, msgspec.json.Decoder().decode, module)
+    if name == "json":
+        return JsonBackend(name, _stdlib_loads, module)
+    return JsonBackend(name, module.loads, module)
+
+
+def available_backends():
+    """Names of the JSON backends installed here, in order of preference."""
+    names = []
+    for name in JSON_BACKENDS:
+        try:
+            get_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name=None, preference=JSON_BACKENDS):
+    """The JsonBackend called `name`, or the configured / first installed one of `preference`.
+
+    Raises ImportError if a backend asked for by name is not installed.
+    """
+    name = name or os.environ.get(JSON_BACKEND_ENV) or None
+    if name is None:
+        for candidate in preference:
+            try:
+                return get_backend(candidate)
+            except ImportError:
+                continue
+    if name not in _backends:
+        _backends[name] = _load_backend(name)
+    return _backends[name]
+
+
+@functools.lru_cache(maxsize=None)
+def _msgspec_partial_decoder():
+    """A msgspec decoder of the fields a PartialText needs (other fields are skipped)."""
+    import msgspec
+
+    class Part(msgspec.Struct):
+        text: Optional[str] = None
+
+    class Content(msgspec.Struct):
+        parts: Optional[list[Part]] = None
+
+    class SpeakData(msgspec.Struct):
+        text: Optional[str] = None
+        partial: bool = False
+        utterance_id: Optional[str] = None
+
+    class Event(msgspec.Struct):
+        id: Any = None
+        partial: Optional[bool] = None
+        content: Optional[Content] = None
+        invocationId: Optional[str] = None
+        author: Optional[str] = None
+        customMetadata: Optional[dict] = None
+        errorCode: Optional[str] = None
+        event: Optional[str] = None
+        data: Optional[SpeakData] = None
+
+    return msgspec.json.Decoder(Event).decode, msgspec.ValidationError
+
+
+def _partial_from_struct(event):
+    if event.event is not None:
+        data = event.data
+        if event.event != "speak" or data is None or not data.partial or data.text is None:
+            return None
+        return PartialText(event.id, data.text, utterance_id=data.utterance_id)
+    if event.partial is not True or event.customMetadata is not None or event.errorCode is not None:
+        return None
+    parts = event.content.parts if event.content is not None else None
+    if not parts or any(part.text is None for part in parts):
+        return None
+    text = parts[0].text if len(parts) == 1 else "".join(part.text for part in parts)
+    return PartialText(event.id, text, event.invocationId, event.author)
+
+
+class EventDecoder:
+    """Parses one SSE payload (bytes or str) into an event dict, or a PartialText if `typed`.
+
+    Args:
+        backend: A JsonBackend or backend name. If None, the configured default, or the
+            first installed of TYPED_JSON_BACKENDS when `typed`.
+        typed: Whether partial text events come back as PartialText. Code that needs every
+            field of every event (e.g. to print the full JSON) passes False.
+    """
+
+    def __init__(self, backend=None, typed=True):
+        if isinstance(backend, JsonBackend):
+            self.backend = backend
+        else:
+            self.backend = get_backend(backend, TYPED_JSON_BACKENDS if typed else JSON_BACKENDS)
+        self.typed = typed
+        self._loads = self.backend.loads
+        self._typed_loads = None
+        if typed and self.backend.name == "msgspec":
+            self._typed_loads, self._validation_error = _msgspec_partial_decoder()
+
+    def __call__(self, data):
+        if self._typed_loads is not None:
+            # Most events are partial text, so try the typed decode first; the few others are
+            # parsed again as dicts.
+            try:
+                partial = _partial_from_struct(self._typed_loads(data))
+            except self._validation_error:
+                partial = None  # e.g. a `data` that is not a speak payload
+            if partial is not None:
+                return partial
+        event = self._loads(data)
+        if self.typed and isinstance(event, dict):
+            return PartialText.from_event(event) or event
+        return event
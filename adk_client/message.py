@@ -0,0 +1,124 @@
+"""Incremental display model for a streamed, multi-utterance assistant message.
+
+Text is kept as an append-only list of segments in arrival order: one segment per run of
+`speak` text and one per tool/error notice. Only the open speak segment of an utterance can
+still change, so everything before the first open segment is joined once into a cached
+prefix. Rendering a frame is then the cached prefix plus the few segments after it, instead
+of re-sorting utterances and re-joining the whole message on every event.
+
+The open speak segment is a PartialMerger (adk_client.partials), so partial `speak` text may
+be cumulative or delta chunks: each event only appends its new suffix.
+"""
+from .partials import PartialMerger
+
+
+class Utterance:
+    __slots__ = ("utterance_id", "open_segment", "partial_received", "final_text_set")
+
+    def __init__(self, utterance_id):
+        self.utterance_id = utterance_id
+        self.open_segment = None  # index of the speak segment (a PartialMerger) later partials merge into
+        self.partial_received = False
+        self.final_text_set = False
+
+
+class AssistantMessage:
+    """Builds the display text of one assistant message from stream events.
+
+    Utterances are tracked in arrival order. Events without an utterance_id are grouped
+    under the `None` utterance so they follow the same rules. `partial_mode` is the kind of
+    partial chunks (adk_client.partials.CUMULATIVE or DELTA), detected from the first
+    utterance if None and then kept for the following ones.
+    """
+
+    __slots__ = ("utterances", "status", "partial_mode", "_segments", "_frozen_upto", "_prefix", "_last_utterance",
+                 "_rendered")
+
+    def __init__(self, partial_mode=None):
+        self.utterances = {}
+        self.partial_mode = partial_mode
+        self.status = None  # latest progress update of a running tool; not part of the text
+        self._segments = []
+        self._frozen_upto = 0  # segments[:_frozen_upto] can no longer change
+        self._prefix = ""  # "".join(segments[:_frozen_upto])
+        self._last_utterance = None
+        self._rendered = None
+
+    def _utterance(self, utterance_id):
+        utt = self.utterances.get(utterance_id)
+        if utt is None:
+            utt = self.utterances[utterance_id] = Utterance(utterance_id)
+            self._last_utterance = utt
+        return utt
+
+    def _close(self, utt):
+        if utt.open_segment is not None:
+            merger = self._segments[utt.open_segment]
+            self._segments[utt.open_segment] = merger.text
+            self.partial_mode = self.partial_mode or merger.mode
+            utt.open_segment = None
+            self._advance_prefix()
+
+    def _advance_prefix(self):
+        open_segments = [u.open_segment for u in self.utterances.values() if u.open_segment is not None]
+        upto = min(open_segments) if open_segments else len(self._segments)
+        if upto > self._frozen_upto:
+            self._prefix += "".join(self._segments[self._frozen_upto:upto])
+            self._frozen_upto = upto
+
+    def speak(self, utterance_id, text, partial):
+        """Applies a speak event. Partial text is merged into the utterance's open segment;
+        final text completes (or corrects) it."""
+        self.status = None
+        utt = self._utterance(utterance_id)
+        if utt.open_segment is None:
+            utt.open_segment = len(self._segments)
+            self._segments.append(PartialMerger(self.partial_mode))
+        merger = self._segments[utt.open_segment]
+        self._rendered = None
+        if partial:
+            merger.add(text)
+            utt.partial_received = True
+            utt.final_text_set = False
+        else:
+            merger.final(text)
+            utt.final_text_set = True
+            self._close(utt)
+
+    def append(self, utterance_id, text):
+        """Appends a fixed notice (tool call, tool result, error) after the utterance's text."""
+        self.status = None
+        utt = self._utterance(utterance_id)
+        self._close(utt)
+        self._segments.append(text)
+        self._rendered = None
+        self._advance_prefix()
+
+    def progress(self, text):
+        """Shows a running tool's latest progress update until the next text or notice arrives."""
+        self.status = text
+
+    def finish(self):
+        """Marks every utterance final, e.g. when the stream ends without a final speak event."""
+        self.status = None
+        for utt in self.utterances.values():
+            utt.final_text_set = True
+            self._close(utt)
+        self._advance_prefix()
+
+    @property
+    def streaming(self):
+        """True while the most recent utterance still expects more text."""
+        return self._last_utterance is not None and not self._last_utterance.final_text_set
+
+    def __bool__(self):
+        return bool(self._segments)
+
+    def text(self):
+        if self._rendered is None:
+            if self._frozen_upto == len(self._segments):
+                self._rendered = self._prefix
+            else:
+                self._rendered = self._prefix + "".join(
+                    segment if type(segment) is str else segment.text for segment in self._segments[self._frozen_upto:])
+        return self._rendered
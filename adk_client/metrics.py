@@ -0,0 +1,243 @@
+"""Timing instrumentation for streamed agent responses.
+
+A StreamTimer is created right before a request is sent and follows it through the shared
+stream path: `timer.chunks()` wraps the raw body iterator to catch the first byte, and
+`timer.observe()` sees every parsed event to catch the first text, pair each tool call
+with its first progress update and its result, and note each model call's token usage and
+time to first output (from the request, or from the tool results it answers). `timer.finish()` builds a flat record and
+hands it to the configured sinks, e.g. a JsonlSink file or an in-process LatencyHistogram.
+
+Both event shapes in this repo are understood: ADK events (`content.parts` with `text`,
+`functionCall`, `functionResponse`, plus progress in `customMetadata`) and the
+speak/tool_code/tool_result/progress envelope, as dicts or, for partial text, PartialText.
+"""
+import json
+import threading
+import time
+
+from .events import PartialText, progress_of
+
+
+class StreamTimer:
+    """Timestamps for one streamed response. All durations in records are milliseconds."""
+
+    def __init__(self, label="", sinks=(), clock=time.perf_counter):
+        self.label = label
+        self.sinks = list(sinks)
+        self._clock = clock
+        self.started_at = time.time()
+        self.request_start = clock()
+        self.first_byte = None
+        self.first_event = None
+        self.first_text = None
+        self.last_event = None
+        self.end = None
+        self.events = 0
+        self.max_inter_event = 0.0
+        self.tool_calls = []  # dicts: tool, called_ms, gap_ms, feedback_ms
+        self.model_calls = []  # dicts: input_tokens, cached_tokens, output_tokens, ttft_ms
+        self._pending_tools = {}
+        self._model_call_start = self.request_start
+        self._model_call_first = None
+        self.record = None
+
+    def chunks(self, chunks):
+        """Passes raw body chunks through, noting when the first one arrives."""
+        for chunk in chunks:
+            if self.first_byte is None and chunk:
+                self.first_byte = self._clock()
+            yield chunk
+
+    def observe(self, event):
+        """Notes one parsed event (a dict or PartialText) from the stream."""
+        now = self._clock()
+        self.events += 1
+        if self.first_event is None:
+            self.first_event = now
+        if self.last_event is not None:
+            self.max_inter_event = max(self.max_inter_event, now - self.last_event)
+        self.last_event = now
+        if isinstance(event, PartialText):
+            if event.text:
+                self._text(now)
+                self._model_output(now)
+            return
+        if not isinstance(event, dict):
+            return
+
+        kind = event.get("event")
+        if kind is not None:  # speak/tool_code/tool_result envelope
+            data = event.get("data") or {}
+            if kind == "speak" and data.get("text"):
+                self._text(now)
+            elif kind == "tool_code":
+                self._tool_called(data.get("tool_name"), data.get("tool_name"), now)
+            elif kind == "tool_result":
+                self._tool_returned(data.get("tool_name"), now)
+            elif kind == "progress":
+                self._tool_progress(data.get("tool_name"), now)
+            return
+
+        progress = progress_of(event)
+        if progress:
+            self._tool_progress(progress.get("tool"), now)
+
+        content = event.get("content") or {}
+        for part in content.get("parts") or ():
+            if not isinstance(part, dict):
+                continue
+            if part.get("text"):
+                self._text(now)
+                self._model_output(now)
+            call = part.get("functionCall")
+            if call:
+                self._model_output(now)
+                self._tool_called(call.get("id") or call.get("name"), call.get("name"), now)
+            response = part.get("functionResponse")
+            if response:
+                self._tool_returned(response.get("id") or response.get("name"), now)
+                # The next model call answers the tool results.
+                self._model_call_start, self._model_call_first = now, None
+
+        usage = event.get("usageMetadata")
+        if usage and not event.get("partial"):  # the complete response of a model call
+            self._model_call(usage)
+
+    def _text(self, now):
+        if self.first_text is None:
+            self.first_text = now
+
+    def _model_output(self, now):
+        if self._model_call_first is None:
+            self._model_call_first = now
+
+    def _model_call(self, usage):
+        first = self._model_call_first
+        self.model_calls.append({
+            "input_tokens": usage.get("promptTokenCount"),
+            "cached_tokens": usage.get("cachedContentTokenCount") or 0,
+            "output_tokens": usage.get("candidatesTokenCount"),
+            "ttft_ms": None if first is None else (first - self._model_call_start) * 1000,
+        })
+
+    def _tool_called(self, key, name, now):
+        self._pending_tools[key] = [name, now, None]  # name, called at, first progress at
+
+    def _tool_progress(self, name, now):
+        for pending in self._pending_tools.values():
+            if pending[2] is None and (name is None or pending[0] == name):
+                pending[2] = now
+
+    def _tool_returned(self, key, now):
+        name, called, progressed = self._pending_tools.pop(key, (key, None, None))
+        self.tool_calls.append({
+            "tool": name,
+            "called_ms": self._ms(called),
+            "gap_ms": None if called is None else (now - called) * 1000,
+            # Time until the first sign of life from the tool: a progress event, or the result.
+            "feedback_ms": None if called is None else ((progressed or now) - called) * 1000,
+        })
+
+    def _ms(self, timestamp):
+        return None if timestamp is None else (timestamp - self.request_start) * 1000
+
+    def finish(self, error=None):
+        """Marks the end of the stream, builds the record and exports it. Returns the record."""
+        if self.record is not None:
+            return self.record
+        self.end = self._clock()
+        self.record = {
+            "label": self.label,
+            "started_at": self.started_at,
+            "ttfb_ms": self._ms(self.first_byte),
+            "first_event_ms": self._ms(self.first_event),
+            "ttft_ms": self._ms(self.first_text),
+            "total_ms": self._ms(self.end),
+            "events": self.events,
+            "max_inter_event_ms": self.max_inter_event * 1000,
+            "tool_calls": self.tool_calls,
+            "model_calls": self.model_calls,
+            "error": error,
+        }
+        for sink in self.sinks:
+            sink(self.record)
+        return self.record
+
+
+def format_record(record):
+    """One-line human summary of a timing record."""
+    def ms(value):
+        return "-" if value is None else f"{value:.0f}ms"
+
+    parts = [f"ttfb {ms(record['ttfb_ms'])}", f"first text {ms(record['ttft_ms'])}",
+             f"total {ms(record['total_ms'])}", f"{record['events']} events",
+             f"max gap {ms(record['max_inter_event_ms'])}"]
+    for call in record["tool_calls"]:
+        feedback = call.get("feedback_ms")
+        progress = f" (first progress {ms(feedback)})" if feedback is not None and feedback != call["gap_ms"] else ""
+        parts.append(f"{call['tool']} {ms(call['gap_ms'])}{progress}")
+    for i, call in enumerate(record.get("model_calls", ()), 1):
+        parts.append(f"model call {i}: {call['input_tokens']} input tokens ({call['cached_tokens']} cached), "
+                     f"first output {ms(call['ttft_ms'])}")
+    return ", ".join(parts)
+
+
+class JsonlSink:
+    """Appends each record as one JSON line to a file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record) + "\n"
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class LatencyHistogram:
+    """In-process log-bucketed histograms of TTFB, time to first text, total time and tool gaps
+    (call to result, and call to first progress or result)."""
+
+    METRICS = ("ttfb_ms", "ttft_ms", "total_ms", "tool_gap_ms", "tool_feedback_ms")
+    # Upper bucket bounds in ms, roughly x2 apart, up to 2 minutes.
+    BOUNDS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {metric: [0] * (len(self.BOUNDS) + 1) for metric in self.METRICS}
+        self.totals = {metric: 0 for metric in self.METRICS}
+
+    def __call__(self, record):
+        with self._lock:
+            for metric in ("ttfb_ms", "ttft_ms", "total_ms"):
+                self._add(metric, record.get(metric))
+            for call in record.get("tool_calls", ()):
+                self._add("tool_gap_ms", call.get("gap_ms"))
+                self._add("tool_feedback_ms", call.get("feedback_ms"))
+
+    def _add(self, metric, value):
+        if value is None:
+            return
+        bucket = next((i for i, bound in enumerate(self.BOUNDS) if value <= bound), len(self.BOUNDS))
+        self.counts[metric][bucket] += 1
+        self.totals[metric] += 1
+
+    def percentile(self, metric, p):
+        """Upper bound of the bucket holding the p-th percentile (None if no samples)."""
+        with self._lock:
+            total = self.totals[metric]
+            if not total:
+                return None
+            threshold = p / 100 * total
+            seen = 0
+            for i, count in enumerate(self.counts[metric]):
+                seen += count
+                if seen >= threshold:
+                    return self.BOUNDS[i] if i < len(self.BOUNDS) else float("inf")
+        return float("inf")
+
+    def summary(self):
+        return {metric: {"count": self.totals[metric],
+                         **{f"p{p}": self.percentile(metric, p) for p in (50, 90, 99)}}
+                for metric in self.METRICS}
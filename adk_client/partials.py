@@ -0,0 +1,109 @@
+"""Merging of partial text chunks into an utterance, for servers that send either kind.
+
+ADK streams each partial text event as a delta (only the new tokens); the speak protocol
+of the Streamlit app, and other servers, send the cumulative text so far. Pass the mode when
+the server is known (DELTA for ADK). Otherwise a PartialMerger detects it: a chunk that does
+not extend the previous chunk settles on DELTA at once, while CUMULATIVE takes
+CUMULATIVE_EVIDENCE chunks in a row that each extend the one before, so repeated deltas
+("ha", "ha") are not mistaken for cumulative text. Until then the text shown is the
+cumulative reading; if the stream turns out to be deltas, the text is rebuilt once.
+
+Once the mode is known the merger works out the new suffix in O(1) + the suffix length: a
+cumulative chunk is sliced at the known length, after checking only a short tail of the text
+at the boundary. Text is kept as a list of appended chunks and joined once when read.
+
+The final (non-partial) event carries the whole text. If it differs from what the chunks
+added up to, it replaces the text and is counted as a correction.
+"""
+
+CUMULATIVE = "cumulative"
+DELTA = "delta"
+
+BOUNDARY_CHECK_CHARS = 16  # tail of the text compared against each cumulative chunk
+CUMULATIVE_EVIDENCE = 3  # chunks in a row extending the previous one before assuming CUMULATIVE
+
+
+class PartialMerger:
+    """Text of one utterance built from its partial chunks.
+
+    Args:
+        mode: CUMULATIVE or DELTA if known, e.g. from the previous utterance of the same
+            stream; None to detect it from the chunks.
+
+    `add()` and `final()` return the text to append to what is already shown, or None when
+    earlier text changed and the whole `text` has to be shown again.
+    """
+
+    __slots__ = ("mode", "length", "corrections", "_chunks", "_tail", "_seen")
+
+    def __init__(self, mode=None):
+        self.mode = mode
+        self.length = 0
+        self.corrections = 0
+        self._chunks = []
+        self._tail = ""  # last BOUNDARY_CHECK_CHARS characters of the text
+        self._seen = []  # chunks received while the mode is being detected
+
+    @property
+    def text(self):
+        chunks = self._chunks
+        if len(chunks) > 1:
+            chunks[:] = ["".join(chunks)]
+        return chunks[0] if chunks else ""
+
+    def __len__(self):
+        return self.length
+
+    def _append(self, suffix):
+        if suffix:
+            self._chunks.append(suffix)
+            self.length += len(suffix)
+            tail = self._tail + suffix if len(suffix) < BOUNDARY_CHECK_CHARS else suffix
+            self._tail = tail[-BOUNDARY_CHECK_CHARS:]
+        return suffix
+
+    def _replace(self, text, correction=True):
+        self.corrections += correction
+        self._chunks = [text] if text else []
+        self.length = len(text)
+        self._tail = text[-BOUNDARY_CHECK_CHARS:]
+        return None
+
+    def add(self, chunk):
+        """Merges one partial chunk; returns the new text it adds (None if text was replaced)."""
+        if self.mode is None:
+            return self._detect(chunk)
+        if not self.length or self.mode == DELTA:
+            return self._append(chunk)
+        length = self.length
+        tail = self._tail
+        if len(chunk) >= length and chunk.startswith(tail, length - len(tail)):
+            return self._append(chunk[length:])
+        return self._replace(chunk)  # the server rewrote earlier text
+
+    def _detect(self, chunk):
+        if not chunk:
+            return ""
+        seen = self._seen
+        if seen and not (len(chunk) > len(seen[-1]) and chunk.startswith(seen[-1])):
+            # Cumulative chunks always extend the previous one: these are deltas.
+            self.mode = DELTA
+            seen.append(chunk)
+            self._seen = []
+            if len(seen) == 2:  # the text shown is the first chunk: the same in both readings
+                return self._append(chunk)
+            return self._replace("".join(seen), correction=False)
+        suffix = chunk[len(seen[-1]):] if seen else chunk
+        seen.append(chunk)
+        if len(seen) > CUMULATIVE_EVIDENCE:
+            self.mode = CUMULATIVE
+            self._seen = []
+        return self._append(suffix)
+
+    def final(self, text):
+        """Applies the final, complete text; returns the text it adds (None if it replaced)."""
+        if not text or len(text) == self.length and text == self.text:
+            return ""
+        if len(text) > self.length and text.startswith(self.text):
+            return self._append(text[self.length:])
+        return self._replace(text)
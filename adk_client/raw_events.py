@@ -0,0 +1,142 @@
+"""Bounded, compressed capture of raw SSE events for the chat's debug expanders.
+
+Each assistant message gets a RawEventLog: the most recent events stay as plain strings,
+older ones are zlib-compressed in blocks, and the log is a ring buffer that evicts its
+oldest block once it holds `max_events`. All logs of one chat share a RawEventStore with a
+byte budget; when the chat goes over it, blocks are evicted from the oldest (or largest)
+message first. Compressed blocks are only inflated when the events are actually shown.
+"""
+import zlib
+from collections import deque
+
+RAW_EVENTS_PER_MESSAGE = 2000  # ring buffer size per message
+RAW_EVENTS_HOT = 64  # most recent events of a message kept uncompressed
+RAW_EVENTS_BLOCK = 64  # events per compressed block
+RAW_EVENTS_BUDGET_BYTES = 4 * 1024 * 1024  # stored bytes per chat, across all messages
+EVICTION_POLICIES = ("oldest", "largest")
+
+
+class RawEventLog:
+    """Raw event lines of one message. Append-only, bounded, mostly compressed."""
+
+    __slots__ = ("max_events", "hot_events", "block_events", "dropped",
+                 "_hot", "_hot_bytes", "_blocks", "_block_count", "_block_bytes", "_store")
+
+    def __init__(self, max_events=RAW_EVENTS_PER_MESSAGE, hot_events=RAW_EVENTS_HOT,
+                 block_events=RAW_EVENTS_BLOCK, store=None):
+        self.max_events = max_events
+        self.hot_events = hot_events
+        self.block_events = block_events
+        self.dropped = 0  # events evicted so far
+        self._hot = deque()
+        self._hot_bytes = 0
+        self._blocks = deque()  # (event count, compressed bytes), oldest first
+        self._block_count = 0
+        self._block_bytes = 0
+        self._store = store
+
+    def __len__(self):
+        return self._block_count + len(self._hot)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held: UTF-8 size of plain lines plus compressed block sizes."""
+        return self._hot_bytes + self._block_bytes
+
+    def append(self, line):
+        before = self.nbytes
+        self._hot.append(line)
+        self._hot_bytes += len(line.encode("utf-8"))
+        if len(self._hot) >= self.hot_events + self.block_events:
+            self._compress(self.block_events)
+        while len(self) > self.max_events:
+            self._evict_oldest()
+        if self._store is not None:
+            self._store._grew(self, self.nbytes - before)
+
+    def seal(self):
+        """Compresses the remaining plain events, e.g. once the message has finished streaming."""
+        before = self.nbytes
+        if self._hot:
+            self._compress(len(self._hot))
+        if self._store is not None:
+            self._store._grew(self, self.nbytes - before)
+
+    def _compress(self, count):
+        lines = [self._hot.popleft() for _ in range(count)]
+        raw = "\n".join(lines).encode("utf-8")
+        self._hot_bytes -= len(raw) - (count - 1)
+        block = zlib.compress(raw, 6)
+        self._blocks.append((count, block))
+        self._block_count += count
+        self._block_bytes += len(block)
+
+    def _evict_oldest(self):
+        """Drops the oldest block (or oldest plain line if nothing is compressed). Returns bytes freed."""
+        if self._blocks:
+            count, block = self._blocks.popleft()
+            self._block_count -= count
+            self._block_bytes -= len(block)
+            self.dropped += count
+            return len(block)
+        if self._hot:
+            freed = len(self._hot.popleft().encode("utf-8"))
+            self._hot_bytes -= freed
+            self.dropped += 1
+            return freed
+        return 0
+
+    def lines(self):
+        """Yields the retained lines, oldest first, inflating compressed blocks on the way."""
+        for _, block in self._blocks:
+            yield from zlib.decompress(block).decode("utf-8").split("\n")
+        yield from self._hot
+
+    def text(self):
+        body = "\n".join(self.lines())
+        if self.dropped:
+            return f"[{self.dropped} older events evicted]\n{body}"
+        return body
+
+
+class RawEventStore:
+    """Byte budget shared by the RawEventLogs of one chat.
+
+    Args:
+        budget_bytes: Maximum bytes held across all logs.
+        evict: "oldest" takes blocks from the earliest message first, "largest" from the
+            message currently holding the most bytes.
+    """
+
+    def __init__(self, budget_bytes=RAW_EVENTS_BUDGET_BYTES, evict="oldest", **log_kwargs):
+        if evict not in EVICTION_POLICIES:
+            raise ValueError(f"evict must be one of {EVICTION_POLICIES}, got {evict!r}")
+        self.budget_bytes = budget_bytes
+        self.evict = evict
+        self.nbytes = 0
+        self._log_kwargs = log_kwargs
+        self._logs = []
+
+    def new_log(self):
+        log = RawEventLog(store=self, **self._log_kwargs)
+        self._logs.append(log)
+        return log
+
+    def _grew(self, log, delta):
+        self.nbytes += delta
+        while self.nbytes > self.budget_bytes:
+            victim = self._pick_victim()
+            if victim is None:
+                break
+            self.nbytes -= victim._evict_oldest()
+
+    def _pick_victim(self):
+        candidates = [log for log in self._logs if log]
+        if not candidates:
+            return None
+        if self.evict == "largest":
+            return max(candidates, key=lambda log: log.nbytes)
+        return candidates[0]
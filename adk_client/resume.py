@@ -0,0 +1,191 @@
+"""Reconnecting event streams with replay dedup, shared by the script and the Streamlit app.
+
+A ResumableStream wraps a `connect(last_event_id, attempt)` callable that opens the stream
+and yields `(ServerSentEvent, event)` pairs (see `sse_json_events`). When the
+connection drops mid-stream (reset, truncated chunked body, read timeout), it waits with
+exponential backoff and jitter, calls `connect` again with the id of the last event it
+passed on, and skips events whose id it has already seen, so a server that replays from
+`Last-Event-ID` (or from the start) never produces duplicates. A clean end of the body ends
+the stream.
+
+How to resume is up to `connect`: the Streamlit protocol reconnects with a
+`Last-Event-ID` header. ADK's POST /run_sse cannot resume (posting again would re-run the
+model and tools), so the script recovers the events the server stored in the session instead.
+"""
+import json
+import random
+import threading
+
+import requests
+
+from .events import PartialText
+from .json_backend import EventDecoder
+from .sse import SSEDecoder, ServerSentEvent, iter_sse_events
+
+RECONNECT_ATTEMPTS = 5  # consecutive failed connections before giving up
+RECONNECT_BACKOFF = 0.5  # seconds before the first reconnect, doubled per failed attempt
+RECONNECT_MAX_BACKOFF = 8.0
+
+# Errors that mean the connection went away, as opposed to the server rejecting the request.
+DROPPED_STREAM_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ReadTimeout,
+)
+
+
+class NotResumable(requests.exceptions.RequestException):
+    """Raised by a connect() that cannot pick up a dropped stream."""
+
+
+def sse_json_events(chunks, decoder=None, typed=True, backend=None):
+    """Yields (ServerSentEvent, parsed event or None) for each event in raw body chunks.
+
+    Payloads are parsed from bytes by the JSON `backend` (see adk_client.json_backend). Events
+    are dicts, except partial text events, which are PartialText objects when `typed`.
+    `decoder` is an optional SSEDecoder, best created with `raw=True`.
+    """
+    parse = EventDecoder(backend, typed)
+    for sse_event in iter_sse_events(chunks, decoder or SSEDecoder(raw=True)):
+        data = sse_event.data
+        if not data or data.isspace():
+            continue
+        try:
+            event = parse(data)
+        except ValueError:
+            event = None
+        yield sse_event, event
+
+
+def replayed_event(event):
+    """An (SSE event, dict) pair for an event recovered outside the stream, e.g. from the session."""
+    return ServerSentEvent(json.dumps(event), id=event.get("id")), event
+
+
+class ResumableStream:
+    """Iterates `(ServerSentEvent, event or None)` pairs across reconnects.
+
+    Args:
+        connect: Callable (last_event_id, attempt) returning an iterable of pairs. Attempt 0
+            is the initial request.
+        last_event_id: Id to resume from on the first request, if any.
+        attempts, backoff, max_backoff: Reconnect policy. A server `retry:` field replaces
+            `backoff` as the base delay. The attempt count resets once events flow again.
+        on_reconnect: Optional callback (attempt, delay, error) run before each reconnect.
+
+    `cancel()` (from any thread) ends the stream at the next failure instead of reconnecting,
+    and cuts a backoff wait short.
+    """
+
+    def __init__(self, connect, last_event_id=None, attempts=RECONNECT_ATTEMPTS, backoff=RECONNECT_BACKOFF,
+                 max_backoff=RECONNECT_MAX_BACKOFF, on_reconnect=None, sleep=None):
+        self._connect = connect
+        self.last_event_id = last_event_id
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_reconnect = on_reconnect
+        self._cancelled = threading.Event()
+        self._sleep = sleep or self._cancelled.wait
+        self.seen_ids = set()
+        self.reconnects = 0
+        self.duplicates = 0
+        self.retry_ms = None  # latest `retry:` value sent by the server
+
+    @staticmethod
+    def event_id(sse_event, event):
+        if sse_event.id is not None:
+            return sse_event.id
+        if isinstance(event, dict):
+            return event.get("id")
+        return getattr(event, "id", None)  # PartialText
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def delay(self, failures):
+        base = self.retry_ms / 1000 if self.retry_ms is not None else self.backoff
+        return min(self.max_backoff, base * 2 ** (failures - 1)) * random.uniform(0.5, 1.0)
+
+    def __iter__(self):
+        failures = 0
+        attempt = 0
+        while True:
+            stream = self._connect(self.last_event_id, attempt)
+            try:
+                for sse_event, event in stream:
+                    if sse_event.retry is not None:
+                        self.retry_ms = sse_event.retry
+                    event_id = self.event_id(sse_event, event)
+                    if event_id is not None:
+                        if event_id in self.seen_ids:
+                            self.duplicates += 1
+                            continue
+                        self.seen_ids.add(event_id)
+                        self.last_event_id = event_id
+                    failures = 0
+                    yield sse_event, event
+                return
+            except DROPPED_STREAM_ERRORS as e:
+                error = e
+            except requests.exceptions.HTTPError as e:
+                # A server restarting behind a proxy answers 502/503/504 for a while.
+                if e.response is None or e.response.status_code < 500:
+                    raise
+                error = e
+            finally:
+                close = getattr(stream, "close", None)
+                if close is not None:
+                    close()
+            if self.cancelled:
+                return
+            failures += 1
+            if failures > self.attempts:
+                raise error
+            attempt += 1
+            self.reconnects += 1
+            delay = self.delay(failures)
+            if self.on_reconnect is not None:
+                self.on_reconnect(attempt, delay, error)
+            self._sleep(delay)
+            if self.cancelled:
+                return
+
+
+def adk_run_sse(client, app_name, user_id, session_id, text, wrap_chunks=None, typed=True):
+    """connect() for a ResumableStream over ADK's POST /run_sse.
+
+    The first attempt posts the message. The api_server stops the run when its client goes
+    away and has no way to resume it, so later attempts do not post again: they fetch the
+    session and yield the events it stored for this invocation, which the stream dedups
+    against what was already received. `wrap_chunks` can wrap the raw body iterator, e.g.
+    StreamTimer.chunks. `typed` is passed on to sse_json_events.
+    """
+    invocation = {}
+
+    def connect(last_event_id, attempt):
+        if attempt == 0:
+            with client.run_sse(app_name, user_id, session_id, text) as response:
+                response.raise_for_status()
+                chunks = response.iter_content(chunk_size=None)
+                for sse_event, event in sse_json_events(wrap_chunks(chunks) if wrap_chunks else chunks, typed=typed):
+                    if "id" not in invocation:
+                        invocation_id = (event.invocation_id if isinstance(event, PartialText)
+                                         else event.get("invocationId") if isinstance(event, dict) else None)
+                        if invocation_id is not None:
+                            invocation["id"] = invocation_id
+                    yield sse_event, event
+            return
+        if "id" not in invocation:
+            raise NotResumable("The /run_sse stream dropped before its first event; not re-sending the message")
+        response = client.get_session(app_name, user_id, session_id)
+        response.raise_for_status()
+        for event in response.json().get("events", []):
+            if event.get("invocationId") == invocation["id"]:
+                yield replayed_event(event)
+
+    return connect
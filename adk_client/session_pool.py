@@ -0,0 +1,214 @@
+"""Pre-created sessions, so creating one is off the critical path of a user's first message.
+
+A SessionPool keeps up to `size` sessions created ahead of time on worker threads and hands
+them out without a round-trip. A session that waits in the pool longer than `idle_ttl` is
+dropped instead of handed out, since a server with an expiring session store may have evicted
+it. Anonymous sessions the pool created are then also deleted on the server, if the pool has a
+`delete` callable, as are the ready sessions still unused when the pool is closed. A specific session id can be `reserve`d ahead of time too, e.g. the
+script's default session while the user is still answering the startup prompts.
+
+Creating a session with an id the server already knows answers 400 "Session already
+exists"; that is treated as success and the existing session is reused, with no extra GET.
+"""
+import collections
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SESSION_POOL_SIZE = 2  # sessions kept ready per pool
+SESSION_IDLE_TTL = 10 * 60  # seconds a pre-created session may wait before it is dropped
+SESSION_POOL_WORKERS = 2  # concurrent session creations
+
+
+class PooledSession:
+    """A session handed out by a SessionPool.
+
+    `existed` is True when the server already had a session with this id. `response` is the
+    creation response (None for sessions created before the pool was involved). `warm` is
+    True when the session was ready before it was asked for.
+    """
+
+    __slots__ = ("session_id", "response", "existed", "created_at", "warm")
+
+    def __init__(self, session_id, response=None, existed=False, created_at=None):
+        self.session_id = session_id
+        self.response = response
+        self.existed = existed
+        self.created_at = time.monotonic() if created_at is None else created_at
+        self.warm = False
+
+    def __repr__(self):
+        return f"PooledSession({self.session_id!r}, existed={self.existed}, warm={self.warm})"
+
+
+def session_exists(response):
+    return response.status_code == 400 and "Session already exists" in response.text
+
+
+def adk_session_factory(client, app_name, user_id):
+    """(create, delete) callables for ADK's /apps/{app}/users/{user}/sessions/{id}.
+
+    create(session_id=None) generates an id when none is given. It returns a PooledSession
+    and raises requests.exceptions.HTTPError for any answer other than success or
+    "Session already exists".
+    """
+
+    def create(session_id=None):
+        session_id = session_id or f"s_{uuid.uuid4().hex[:16]}"
+        response = client.create_session(app_name, user_id, session_id)
+        existed = session_exists(response)
+        if not existed:
+            response.raise_for_status()
+        return PooledSession(session_id, response, existed)
+
+    def delete(session):
+        client.delete_session(app_name, user_id, session.session_id)
+
+    return create, delete
+
+
+class SessionPool:
+    """Hands out pre-created sessions; see the module docstring.
+
+    Args:
+        create: Callable (session_id=None) returning a PooledSession. Called on worker
+            threads; exceptions are kept and re-raised by `acquire` only if no session
+            could be created at all.
+        size: Pre-created sessions to keep ready.
+        idle_ttl: Seconds a ready session may wait in the pool before it is dropped.
+        delete: Optional callable (PooledSession) run for dropped sessions, best effort.
+    """
+
+    def __init__(self, create, size=SESSION_POOL_SIZE, idle_ttl=SESSION_IDLE_TTL, delete=None,
+                 workers=SESSION_POOL_WORKERS, clock=time.monotonic):
+        self._create = create
+        self.size = size
+        self.idle_ttl = idle_ttl
+        self._delete = delete
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._ready = collections.deque()  # futures of anonymous sessions, oldest first
+        self._reserved = {}  # session id -> future
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="session-pool")
+        self._closed = False
+        self.hits = 0  # handed out without waiting
+        self.waits = 0  # handed out after waiting for an in-flight creation
+        self.misses = 0  # created on demand
+        self.expired = 0
+
+    def _submit(self, session_id=None):
+        return self._executor.submit(self._create_session, session_id)
+
+    def _create_session(self, session_id):
+        session = self._create(session_id)
+        session.created_at = self._clock()
+        return session
+
+    def _usable(self, future, delete=True):
+        """False for failed creations and for sessions that idled past the TTL."""
+        if not future.done():
+            return True
+        if future.exception() is not None:
+            return False
+        session = future.result()
+        if self._clock() - session.created_at <= self.idle_ttl:
+            return True
+        self.expired += 1
+        if delete and self._delete is not None and not session.existed:
+            self._executor.submit(self._delete_quietly, session)
+        return False
+
+    def _delete_quietly(self, session):
+        try:
+            self._delete(session)
+        except Exception as e:
+            logger.warning("Session pool: could not delete session %s: %s", session.session_id, e)
+
+    def _delete_created(self, future):
+        """Done callback deleting the session an unused creation produced, if it made one."""
+        if future.cancelled() or future.exception() is not None:
+            return
+        session = future.result()
+        if not session.existed:
+            self._delete_quietly(session)
+
+    def fill(self):
+        """Drops expired sessions and starts creating new ones up to `size`. Non-blocking."""
+        with self._lock:
+            if self._closed:
+                return
+            self._ready = collections.deque(f for f in self._ready if self._usable(f))
+            while len(self._ready) < self.size:
+                self._ready.append(self._submit())
+
+    def reserve(self, session_id):
+        """Starts creating (or validating) `session_id` in the background, for a later acquire."""
+        with self._lock:
+            if not self._closed and session_id not in self._reserved:
+                self._reserved[session_id] = self._submit(session_id)
+
+    def _take(self, future):
+        warm = future.done()
+        session = future.result()  # waits if the creation is still in flight
+        session.warm = warm
+        if warm:
+            self.hits += 1
+        else:
+            self.waits += 1
+        return session
+
+    def acquire(self, session_id=None):
+        """Returns a PooledSession: a ready one if possible, else one created now.
+
+        With `session_id`, returns that session, taken from `reserve` when it was reserved
+        and has not expired. Without, the oldest ready anonymous session is used.
+        """
+        with self._lock:
+            if session_id is not None:
+                future = self._reserved.pop(session_id, None)
+                # A reserved id may name a session with history: never delete it, just re-validate
+                if future is not None and not self._usable(future, delete=False):
+                    future = None
+            else:
+                future = None
+                while self._ready and future is None:
+                    future = self._ready.popleft()
+                    if not self._usable(future):
+                        future = None
+        try:
+            if future is not None:
+                try:
+                    return self._take(future)
+                except Exception:
+                    pass  # the background creation failed: create one now instead
+            self.misses += 1
+            return self._create_session(session_id)
+        finally:
+            if session_id is None:
+                self.fill()
+
+    def stats(self):
+        with self._lock:
+            ready = sum(1 for f in self._ready if f.done() and f.exception() is None)
+        return {"ready": ready, "hits": self.hits, "waits": self.waits, "misses": self.misses,
+                "expired": self.expired}
+
+    def close(self):
+        """Stops creating sessions and deletes the ready ones nobody took, best effort.
+
+        Reserved sessions are left alone: their ids may name sessions with history.
+        """
+        with self._lock:
+            self._closed = True
+            ready = list(self._ready)
+            self._ready.clear()
+            self._reserved.clear()
+        if self._delete is not None:
+            for future in ready:
+                if not future.cancel():  # created or being created: delete it once it exists
+                    future.add_done_callback(self._delete_created)
+        self._executor.shutdown(wait=False, cancel_futures=True)
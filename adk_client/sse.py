@@ -0,0 +1,178 @@
+"""Incremental Server-Sent Events decoder for ADK /run_sse streams.
+
+Raw chunks are appended to one bytearray and lines are found by moving a cursor through
+it, so each byte is copied once into the buffer and once into its line. The consumed
+prefix is dropped once per chunk rather than once per line, and the newline search resumes
+where the previous chunk's ended, which keeps decoding linear in the stream size no matter
+how many events arrive in a single chunk or how many chunks a single event spans.
+
+Field handling follows the WHATWG event-stream format: multi-line `data:` fields are joined
+with "\\n", `event:`, `id:` and `retry:` are tracked, comment lines (":") are ignored, and a
+blank line dispatches the event. Lines may end in "\\n" or "\\r\\n"; bare "\\r" endings are
+split out as well, as long as the stream ends each event with a "\\n" somewhere.
+
+With `raw=True` the data is kept as bytes, for JSON parsers that read bytes directly
+(see adk_client.json_backend): no UTF-8 decode and no str copy per line.
+"""
+
+class ServerSentEvent:
+    """One dispatched SSE event. `data` is the decoded text with multi-line fields joined, or
+    the raw bytes (bytes or bytearray) from a `raw` decoder; `text` is always text."""
+
+    __slots__ = ("event", "data", "id", "retry")
+
+    def __init__(self, data, event="message", id=None, retry=None):
+        self.data = data
+        self.event = event
+        self.id = id
+        self.retry = retry
+
+    @property
+    def text(self):
+        data = self.data
+        return data if isinstance(data, str) else data.decode("utf-8", errors="replace")
+
+    def __repr__(self):
+        return f"ServerSentEvent(event={self.event!r}, id={self.id!r}, retry={self.retry!r}, data={self.data!r})"
+
+
+class SSEDecoder:
+    """Stateful decoder: feed raw byte chunks, get back the events they complete.
+
+    `last_event_id` and `retry` keep the most recent values seen on the stream, which is
+    what a client needs to reconnect with a Last-Event-ID header. With `raw=True`, event
+    data is left as bytes instead of being decoded to text.
+    """
+
+    def __init__(self, raw=False):
+        self.raw = raw
+        self._buf = bytearray()
+        self._scanned = 0  # bytes at the start of _buf already searched for a newline
+        self._data_lines = []
+        self._event_type = ""
+        self.last_event_id = None
+        self.retry = None
+
+    def feed(self, chunk):
+        """Adds a chunk of raw bytes and returns the list of events it completed."""
+        if not chunk:
+            return []
+        buf = self._buf
+        buf += chunk
+        events = []
+        pos = 0
+        scan = self._scanned
+        find = buf.find
+        startswith = buf.startswith
+        data_lines = self._data_lines
+        raw = self.raw
+        while True:
+            nl = find(b"\n", scan)
+            if nl == -1:
+                break
+            start = pos
+            end = nl - 1 if nl > start and buf[nl - 1] == 0x0D else nl
+            pos = scan = nl + 1
+            if start == end:
+                if data_lines:
+                    events.append(self._dispatch())
+                continue
+            if startswith(b"data: ", start, end) and find(b"\r", start, end) == -1:
+                # Fast path for the overwhelmingly common field: one copy, straight from the buffer.
+                value = buf[start + 6:end]
+                data_lines.append(value if raw else value.decode("utf-8", errors="replace"))
+                continue
+            line = buf[start:end]
+            if b"\r" in line:
+                # Bare "\r" line endings, only seen from unusual servers.
+                for sub_line in line.split(b"\r"):
+                    event = self._process_line(sub_line)
+                    if event is not None:
+                        events.append(event)
+                continue
+            event = self._process_line(line)
+            if event is not None:
+                events.append(event)
+        self._scanned = len(buf) - pos
+        if pos:
+            del buf[:pos]
+        return events
+
+    def close(self):
+        """Flushes what is left at end of stream and returns any final event.
+
+        The SSE spec discards an event that was not terminated by a blank line. ADK and
+        most proxies always send the blank line, but a truncated stream can lose it, so the
+        pending event is dispatched instead of silently dropped.
+        """
+        events = []
+        if self._buf:
+            for line in self._buf.rstrip(b"\r").split(b"\r"):
+                event = self._process_line(line)
+                if event is not None:
+                    events.append(event)
+            self._buf = bytearray()
+            self._scanned = 0
+        event = self._dispatch()
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _process_line(self, line):
+        if not line:
+            return self._dispatch()
+        if line[0] == 0x3A:  # ":" starts a comment, used for keep-alives
+            return None
+        colon = line.find(b":")
+        if colon == -1:
+            field, value = line, b""
+        else:
+            field = line[:colon]
+            value = line[colon + 1:]
+            if value[:1] == b" ":
+                value = value[1:]
+        if field == b"data":
+            self._data_lines.append(value if self.raw else value.decode("utf-8", errors="replace"))
+        elif field == b"event":
+            self._event_type = value.decode("utf-8", errors="replace")
+        elif field == b"id":
+            if b"\x00" not in value:
+                self.last_event_id = value.decode("utf-8", errors="replace")
+        elif field == b"retry":
+            if value.isdigit():
+                self.retry = int(value)
+        return None
+
+    def _dispatch(self):
+        if not self._data_lines:
+            self._event_type = ""
+            return None
+        data_lines = self._data_lines
+        if self.raw:
+            data = data_lines[0] if len(data_lines) == 1 else b"\n".join(data_lines)
+        else:
+            data = "\n".join(data_lines)
+        event = ServerSentEvent(
+            data=data,
+            event=self._event_type or "message",
+            id=self.last_event_id,
+            retry=self.retry,
+        )
+        self._data_lines.clear()
+        self._event_type = ""
+        return event
+
+
+def iter_sse_events(chunks, decoder=None):
+    """Yields ServerSentEvent objects decoded from an iterable of raw byte chunks.
+
+    Args:
+        chunks: Iterable of bytes, e.g. `response.iter_content(chunk_size=None)`.
+        decoder: Optional SSEDecoder to use, so the caller can read `last_event_id`
+            after the stream ends.
+    """
+    if decoder is None:
+        decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
@@ -0,0 +1,86 @@
+"""Runs the ADK api_server for the agents in this directory, with sessions stored in SQLite.
+
+Serves the same FastAPI app as `adk api_server` (without the dev UI), with
+multi_tool_agent.session_store.SqliteSessionService instead of in-memory sessions: sessions
+from Cell 1 and the Streamlit app survive restarts, and loading one reads only its events.
+
+Run from the repository root:
+    python api_server.py --db sessions.db --port 8000
+"""
+import argparse
+import contextlib
+import os
+
+import uvicorn
+from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
+from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
+from google.adk.cli.adk_web_server import AdkWebServer
+from google.adk.cli.utils.agent_loader import AgentLoader
+from google.adk.evaluation.local_eval_set_results_manager import LocalEvalSetResultsManager
+from google.adk.evaluation.local_eval_sets_manager import LocalEvalSetsManager
+from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
+
+from multi_tool_agent.session_store import EVENT_BATCH_SIZE, SqliteSessionService
+from multi_tool_agent.sse_coalescing import COALESCE_BYTES, CoalescingMiddleware
+from multi_tool_agent.sse_compression import CompressionMiddleware
+
+AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def create_app(db_path, batch_size=EVENT_BATCH_SIZE, agents_dir=AGENTS_DIR, allow_origins=None,
+               coalesce_delay=0.0, coalesce_bytes=COALESCE_BYTES, compress=True):
+    """The api_server FastAPI app with sessions in the SQLite file at db_path.
+
+    With `coalesce_delay` > 0, adjacent partial text events on /run_sse are merged for up to
+    that many seconds (see multi_tool_agent.sse_coalescing). With `compress`, event streams
+    are compressed for clients that accept it (see multi_tool_agent.sse_compression).
+    """
+    session_service = SqliteSessionService(db_path, batch_size=batch_size)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        try:
+            yield
+        finally:
+            session_service.close()  # commits the events still queued
+
+    web_server = AdkWebServer(
+        agent_loader=AgentLoader(agents_dir),
+        session_service=session_service,
+        artifact_service=InMemoryArtifactService(),
+        memory_service=InMemoryMemoryService(),
+        credential_service=InMemoryCredentialService(),
+        eval_sets_manager=LocalEvalSetsManager(agents_dir=agents_dir),
+        eval_set_results_manager=LocalEvalSetResultsManager(agents_dir=agents_dir),
+        agents_dir=agents_dir,
+    )
+    app = web_server.get_fast_api_app(lifespan=lifespan, allow_origins=allow_origins)
+    if coalesce_delay > 0:
+        app.add_middleware(CoalescingMiddleware, max_delay=coalesce_delay, max_bytes=coalesce_bytes)
+    if compress:
+        app.add_middleware(CompressionMiddleware)  # added last, so it compresses the coalesced stream
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default=os.path.join(AGENTS_DIR, "sessions.db"), help="SQLite database file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--batch-size", type=int, default=EVENT_BATCH_SIZE, help="Events committed per transaction at most")
+    parser.add_argument("--allow-origins", nargs="*", default=None)
+    parser.add_argument("--coalesce-ms", type=float, default=0.0,
+                        help="Merge partial text events on /run_sse within this window (0: off)")
+    parser.add_argument("--coalesce-bytes", type=int, default=COALESCE_BYTES,
+                        help="Send merged partial text once it reaches this size")
+    parser.add_argument("--no-compress", dest="compress", action="store_false",
+                        help="Send event streams uncompressed even to clients that accept gzip/br")
+    args = parser.parse_args()
+    app = create_app(args.db, batch_size=args.batch_size, allow_origins=args.allow_origins,
+                     coalesce_delay=args.coalesce_ms / 1000, coalesce_bytes=args.coalesce_bytes,
+                     compress=args.compress)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
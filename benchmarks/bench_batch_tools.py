@@ -0,0 +1,71 @@
+"""Benchmark: model turns and wall time for multi-city questions, single-city vs batch tools.
+
+Runs root_agent's tools through a real ADK InMemoryRunner, with the Gemini model replaced
+by a MockLlm that waits `--model-latency` seconds per turn and then emits the
+function calls a model makes for "weather and time in N cities" with each tool set:
+
+* single-city tools, one call per turn (what the old tool list led to),
+* single-city tools, all calls as parallel function calls in one turn (best case for them),
+* the batch tools, one call per tool.
+
+No network or API key is needed.
+
+Run from the repository root:
+    python -m benchmarks.bench_batch_tools --cities 5 --model-latency 0.5
+"""
+import argparse
+import asyncio
+import time
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from multi_tool_agent import agent
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.tool_cache import TOOL_CACHES
+
+CITIES = ["New York", "London", "Tokyo", "Paris", "Sydney", "Mumbai", "Sao Paulo", "Cairo",
+          "Toronto", "Berlin", "Singapore", "Mexico City", "Seoul", "Madrid", "Chicago", "Dubai"]
+
+
+def plans(cities):
+    single = [[("get_weather", {"city": c})] for c in cities] + [[("get_current_time", {"city": c})] for c in cities]
+    return [
+        ("single-city, one call per turn", single),
+        ("single-city, parallel calls", [[call for turn in single for call in turn]]),
+        ("batch tools", [[("get_weather_for_cities", {"cities": cities}),
+                          ("get_current_time_for_cities", {"cities": cities})]]),
+    ]
+
+
+async def run_question(plan, latency):
+    llm = MockLlm(script=plan, latency=latency)
+    runner = InMemoryRunner(agent=agent.root_agent.clone(update={"model": llm}), app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text="What's the weather and time in these cities?")])
+    start = time.perf_counter()
+    responses = 0
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        responses += len(event.get_function_responses())
+    return llm.turns, llm.tool_calls, responses, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=5)
+    parser.add_argument("--model-latency", type=float, default=0.5, help="Seconds per model turn")
+    args = parser.parse_args()
+
+    cities = [CITIES[i % len(CITIES)] for i in range(args.cities)]
+    print(f"weather and time in {args.cities} cities, {args.model_latency:g}s per model turn")
+    print(f"  {'tools':<32} {'model turns':>11} {'tool calls':>10} {'wall s':>7}")
+    for label, plan in plans(cities):
+        for cache in TOOL_CACHES.values():
+            cache.clear()
+        turns, calls, responses, elapsed = asyncio.run(run_question(plan, args.model_latency))
+        assert responses == calls, (responses, calls)
+        print(f"  {label:<32} {turns:>11} {calls:>10} {elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
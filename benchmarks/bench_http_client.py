@@ -0,0 +1,89 @@
+"""Benchmark: per-request latency of top-level requests calls vs the pooled ADKClient.
+
+Runs the same call sequence the clients make (session create, /run, /run_sse drained to
+the end) against the local stub server, once with a new `requests.post` connection per
+call and once through adk_client.client.ADKClient's kept-alive pool.
+
+Run from the repository root:
+    python -m benchmarks.bench_http_client --iterations 300
+"""
+import argparse
+import json
+import statistics
+import time
+
+import requests
+
+from adk_client.client import JSON_HEADERS, SSE_HEADERS, ADKClient, run_payload
+from benchmarks.stub_server import start_stub_server
+
+APP, USER = "multi_tool_agent", "u_bench"
+
+
+def unpooled_calls(base_url, session_id):
+    requests.post(f"{base_url}/apps/{APP}/users/{USER}/sessions/{session_id}",
+                  headers=JSON_HEADERS, data=json.dumps({"state": {}})).raise_for_status()
+    requests.post(f"{base_url}/run", headers=JSON_HEADERS,
+                  data=json.dumps(run_payload(APP, USER, session_id, "weather in new york"))).raise_for_status()
+    with requests.post(f"{base_url}/run_sse", headers=SSE_HEADERS, stream=True,
+                       data=json.dumps(run_payload(APP, USER, session_id, "weather in new york", True))) as r:
+        for _ in r.iter_content(chunk_size=None):
+            pass
+
+
+def pooled_calls(client, session_id):
+    client.create_session(APP, USER, session_id).raise_for_status()
+    client.run(APP, USER, session_id, "weather in new york").raise_for_status()
+    with client.run_sse(APP, USER, session_id, "weather in new york") as r:
+        for _ in r.iter_content(chunk_size=None):
+            pass
+
+
+def measure(label, server, iterations, call):
+    connections_before = server.connections
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        call(f"s_{label}_{i}")
+        samples.append((time.perf_counter() - start) / 3 * 1000)
+    samples.sort()
+    return {
+        "mean": statistics.fmean(samples),
+        "p50": samples[len(samples) // 2],
+        "p99": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+        "connections": server.connections - connections_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--partials", type=int, default=5, help="Partial events per /run_sse turn")
+    args = parser.parse_args()
+
+    server = start_stub_server(partials=args.partials)
+    client = ADKClient(server.base_url)
+    try:
+        # Warm up imports and the server's thread machinery before timing.
+        unpooled_calls(server.base_url, "warmup_a")
+        pooled_calls(client, "warmup_b")
+        results = {
+            "requests.post per call": measure("unpooled", server, args.iterations,
+                                              lambda sid: unpooled_calls(server.base_url, sid)),
+            "ADKClient (pooled)": measure("pooled", server, args.iterations,
+                                          lambda sid: pooled_calls(client, sid)),
+        }
+    finally:
+        client.close()
+        server.shutdown()
+
+    print(f"{args.iterations} x (session create + /run + /run_sse) against {server.base_url}")
+    print(f"{'client':<24} {'mean ms/req':>12} {'p50':>8} {'p99':>8} {'new connections':>16}")
+    for label, r in results.items():
+        print(f"{label:<24} {r['mean']:>12.3f} {r['p50']:>8.3f} {r['p99']:>8.3f} {r['connections']:>16}")
+    saved = results["requests.post per call"]["mean"] - results["ADKClient (pooled)"]["mean"]
+    print(f"saved per request: {saved:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: import time of multi_tool_agent and its modules, from `python -X importtime`.
+
+Each statement runs `--runs` times in a fresh interpreter started from the repository root
+with `-X importtime`. Reported per statement (medians):
+
+* import ms: the cumulative time of the top-level imports it triggered, as -X importtime logs
+  them (interpreter startup imports excluded),
+* wall ms: the statement's own run time, measured in the child, which also counts work done
+  outside imports such as building root_agent,
+* ADK: whether google.adk ended up imported.
+
+`import multi_tool_agent.agent` is what `import multi_tool_agent` cost while the package
+imported the agent eagerly. With `--max-import-ms`, exits non-zero when `import
+multi_tool_agent` takes longer, so a regression to eager imports fails a CI run.
+
+Run from the repository root:
+    python -m benchmarks.bench_import_time --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = [
+    ("package", "import multi_tool_agent"),
+    ("middlewares", "import multi_tool_agent.sse_coalescing, multi_tool_agent.sse_compression"),
+    ("time zone lookup", "from multi_tool_agent import timezones; timezones.lookup_city('Tokyo')"),
+    ("root_agent", "from multi_tool_agent import root_agent"),
+    ("old eager package", "import multi_tool_agent.agent"),
+]
+
+# Runs the statement between two markers so the imports it triggers can be told apart from
+# the interpreter's own startup imports in the -X importtime log.
+CHILD = """import sys, time
+sys.stderr.write("--start--\\n")
+start = time.perf_counter()
+{statement}
+wall = time.perf_counter() - start
+sys.stderr.write("--end--\\n")
+print(wall * 1000, "google.adk" in sys.modules)
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(statement):
+    """(import ms, wall ms, ADK imported) for one run of statement in a new interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD.format(statement=statement)],
+                            cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    log = result.stderr.split("--start--\n", 1)[1].split("--end--\n", 1)[0]
+    imports_us = 0
+    for line in log.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) == 1:  # top level: one space after the bar
+            imports_us += int(match.group(2))
+    wall_ms, adk = result.stdout.split()
+    return imports_us / 1000, float(wall_ms), adk == "True"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None,
+                        help="Fail when `import multi_tool_agent` takes longer (median import ms)")
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} fresh interpreters, {sys.executable}")
+    print(f"  {'':<18} {'import ms':>9} {'wall ms':>8} {'ADK':>4}  statement")
+    package_ms = None
+    for label, statement in STATEMENTS:
+        runs = [measure(statement) for _ in range(args.runs)]
+        import_ms = statistics.median(run[0] for run in runs)
+        wall_ms = statistics.median(run[1] for run in runs)
+        print(f"  {label:<18} {import_ms:>9.1f} {wall_ms:>8.1f} {'yes' if runs[0][2] else 'no':>4}  {statement}")
+        if label == "package":
+            package_ms = import_ms
+    if args.max_import_ms is not None and package_ms > args.max_import_ms:
+        print(f"FAIL: import multi_tool_agent took {package_ms:.1f} ms (budget {args.max_import_ms:g} ms)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark: parse throughput of /run_sse event payloads per JSON backend, dicts vs PartialText.
+
+Builds an ADK /run_sse body of `--tokens` one-word partial text events (shaped like the
+api_server's, with actions and timestamp), plus a tool call, its response and the final
+event, and parses it with:
+
+* the previous path: text SSE decoder, `.strip()`, then stdlib `json.loads` on the str,
+* each installed backend of adk_client.json_backend from raw bytes, as dicts (typed=False),
+* the same, with partial text events as PartialText objects (typed),
+* the default EventDecoder(), which is typed and picks its own backend.
+
+Reports microseconds per event and events per second for the payloads alone and for the
+whole path from body chunks (SSE decoding included), and the memory held per parsed
+partial text event.
+
+Run from the repository root:
+    python -m benchmarks.bench_json_decoding --tokens 10000 --chunk-size 4096
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from adk_client.json_backend import EventDecoder, available_backends
+from adk_client.resume import sse_json_events
+from adk_client.sse import SSEDecoder, iter_sse_events
+
+
+def adk_event(i, **fields):
+    return {"content": {"parts": [{"text": f"word{i} "}], "role": "model"}, "partial": True,
+            "invocationId": "e-5b0e1c3a-7d2f-4c61-9a8e-1f2d3c4b5a69", "author": "weather_time_agent",
+            "actions": {"stateDelta": {}, "artifactDelta": {}, "requestedAuthConfigs": {}},
+            "id": f"Xk2{i:05d}", "timestamp": 1760000000.0 + i / 1000, **fields}
+
+
+def build_body(tokens):
+    """(body bytes, payload bytes list) of an answer streamed one word per event."""
+    events = [adk_event(0, content={"parts": [{"functionCall": {"id": "adk-1", "name": "get_weather",
+                                                                "args": {"city": "New York"}}}], "role": "model"},
+                        partial=None),
+              adk_event(1, content={"parts": [{"functionResponse": {"id": "adk-1", "name": "get_weather",
+                                                                    "response": {"status": "success"}}}],
+                                    "role": "user"}, partial=None)]
+    events += [adk_event(i) for i in range(2, tokens + 2)]
+    events.append(adk_event(tokens + 2, content={"parts": [{"text": "The weather in New York is sunny."}],
+                                                 "role": "model"}, partial=None))
+    payloads = [json.dumps({k: v for k, v in event.items() if v is not None}, separators=(",", ":")).encode()
+                for event in events]
+    return b"".join(b"data: " + payload + b"\n\n" for payload in payloads), payloads
+
+
+def old_path(chunks):
+    count = 0
+    for sse_event in iter_sse_events(chunks):
+        data = sse_event.data.strip()
+        if data:
+            json.loads(data)
+            count += 1
+    return count
+
+
+def new_path(backend, typed):
+    def parse(chunks):
+        count = 0
+        for _ in sse_json_events(chunks, SSEDecoder(raw=True), typed=typed, backend=backend):
+            count += 1
+        return count
+    return parse
+
+
+def parse_all(parse, payloads):
+    for payload in payloads:
+        parse(payload)
+
+
+def best_of(repeat, func, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def retained_bytes(parse, payloads):
+    """Memory held per parsed event, for the partial text payloads only."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    parsed = [parse(payload) for payload in payloads]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return held / len(parsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=10000, help="Partial text events in the answer")
+    parser.add_argument("--chunk-size", type=int, default=4096, help="Bytes per body chunk")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    body, payloads = build_body(args.tokens)
+    chunks = [body[i:i + args.chunk_size] for i in range(0, len(body), args.chunk_size)]
+    partial_payloads = payloads[2:-1][:2000]
+
+    variants = [("str + json.loads (old)", lambda payload: json.loads(payload.decode("utf-8").strip()), old_path)]
+    for name in available_backends():
+        variants.append((f"{name} bytes, dicts", EventDecoder(name, typed=False), new_path(name, False)))
+        variants.append((f"{name} bytes, typed", EventDecoder(name), new_path(name, True)))
+    default = EventDecoder()
+    variants.append((f"default ({default.backend.name}, typed)", default, new_path(None, True)))
+
+    n = len(payloads)
+    print(f"{n} events, {len(body) / 1e6:.2f} MB body in {len(chunks)} chunks of {args.chunk_size} bytes; "
+          f"installed backends: {', '.join(available_backends())}")
+    print(f"  {'parser':<26} {'payload us/ev':>13} {'stream us/ev':>12} {'events/s':>10} {'speedup':>8} "
+          f"{'bytes/partial':>13}")
+    baseline = None
+    for label, parse, path in variants:
+        payload_s, _ = best_of(args.repeat, parse_all, parse, payloads)
+        stream_s, count = best_of(args.repeat, path, chunks)
+        assert count == n, (label, count, n)
+        baseline = baseline or stream_s
+        print(f"  {label:<26} {payload_s / n * 1e6:>13.2f} {stream_s / n * 1e6:>12.2f} {n / stream_s:>10.0f} "
+              f"{baseline / stream_s:>7.2f}x {retained_bytes(parse, partial_payloads):>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
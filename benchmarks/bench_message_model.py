@@ -0,0 +1,85 @@
+"""Benchmark: per-event render cost of a long, tool-heavy answer, old dict model vs AssistantMessage.
+
+Replays one assistant message made of many utterances, each a run of cumulative partial
+`speak` events followed by a tool call and tool result, and renders the display text after
+every event (as a frame would). Reports the mean render time per event over successive
+slices of the stream, so growth with answer length is visible.
+
+Run from the repository root:
+    python -m benchmarks.bench_message_model --utterances 200 --partials 30
+"""
+import argparse
+import time
+
+from adk_client.message import AssistantMessage
+
+
+def build_events(n_utterances, n_partials):
+    events = []
+    for u in range(n_utterances):
+        utt_id = f"utterance_{u:04d}"
+        text = ""
+        for p in range(n_partials):
+            text += f"tok{p} "
+            events.append(("speak", utt_id, text, True))
+        events.append(("speak", utt_id, text, False))
+        events.append(("tool_code", utt_id, f"\n*Executing tool: `get_weather` with input:*\n```json\n{{\"city\": \"c{u}\"}}\n```\n", None))
+        events.append(("tool_result", utt_id, "\n*Tool `get_weather` result:*\n```json\n{\"status\": \"success\"}\n```\n", None))
+    return events
+
+
+def legacy_replay(events):
+    """The previous streamlit_app logic: dict per utterance, += for tools, sort + join per render."""
+    utterances = {}
+    timings = []
+    for kind, utt_id, text, partial in events:
+        start = time.perf_counter()
+        utt = utterances.setdefault(utt_id, {"text": "", "partial_received": False, "final_text_set": False})
+        if kind == "speak":
+            utt["text"] = text
+            utt["final_text_set"] = not partial
+        else:
+            utt["text"] += text
+        "".join(utterances[k]["text"] for k in sorted(utterances.keys()))
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def model_replay(events):
+    message = AssistantMessage()
+    timings = []
+    for kind, utt_id, text, partial in events:
+        start = time.perf_counter()
+        if kind == "speak":
+            message.speak(utt_id, text, partial)
+        else:
+            message.append(utt_id, text)
+        message.text()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def slice_means(timings, slices):
+    size = max(1, len(timings) // slices)
+    return [sum(timings[i:i + size]) / len(timings[i:i + size]) for i in range(0, size * slices, size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--utterances", type=int, default=200)
+    parser.add_argument("--partials", type=int, default=30, help="Partial speak events per utterance")
+    parser.add_argument("--slices", type=int, default=5)
+    args = parser.parse_args()
+
+    events = build_events(args.utterances, args.partials)
+    legacy = legacy_replay(events)
+    model = model_replay(events)
+    print(f"{len(events)} events; mean render cost per event (us) by position in the stream")
+    print(f"{'slice':>6} {'legacy':>10} {'AssistantMessage':>18}")
+    for i, (old, new) in enumerate(zip(slice_means(legacy, args.slices), slice_means(model, args.slices))):
+        print(f"{i + 1:>6} {old * 1e6:>10.1f} {new * 1e6:>18.1f}")
+    print(f"{'total':>6} {sum(legacy) * 1e3:>9.1f}ms {sum(model) * 1e3:>17.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: the real api_server /run_sse path, end to end and offline, with the mock model.
+
+Starts ADK's FastAPI app (what `adk api_server` serves) in-process on uvicorn, with
+root_agent's model swapped for MockLlm, and streams `--requests` answers through
+adk_client. With a fixed answer length and token rate, runs are deterministic and comparable
+across commits. Reports:
+
+* SSE throughput: events and bytes per second from first byte to stream end,
+* parse cost: microseconds per event to decode the recorded bodies (adk_client.sse plus the
+  JSON backend of adk_client.json_backend), measured apart from the network,
+* tool overhead: get_weather call -> result gap as seen by the client,
+* time to first byte, first text and stream end.
+
+`--tokens-per-second 0` streams as fast as the server can produce events.
+
+Run from the repository root:
+    python -m benchmarks.bench_mock_streaming --requests 50 --answer-words 200 --chunk-words 1
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+import uvicorn
+from google.adk.cli.fast_api import get_fast_api_app
+
+from adk_client.client import ADKClient
+from adk_client.metrics import StreamTimer
+from adk_client.resume import sse_json_events
+from multi_tool_agent import agent
+from multi_tool_agent.mock_model import MockLlm
+
+APP, USER = "multi_tool_agent", "u_bench"
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def start_api_server():
+    """Serves ADK's FastAPI app for the agents in the repository root on a free port."""
+    app = get_fast_api_app(agents_dir=REPO_ROOT, web=False)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    threading.Thread(target=server.run, name="adk-api-server", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, f"http://127.0.0.1:{port}"
+
+
+def recorded(chunks, body):
+    for chunk in chunks:
+        body.append(chunk)
+        yield chunk
+
+
+def stream_answer(client, session_id, question):
+    timer = StreamTimer()
+    body = []
+    with client.run_sse(APP, USER, session_id, question) as r:
+        r.raise_for_status()
+        for _, event in sse_json_events(timer.chunks(recorded(r.iter_content(chunk_size=None), body))):
+            timer.observe(event)
+    return timer.finish(), body
+
+
+def parse_cost(bodies, repeat=5):
+    events = sum(1 for body in bodies for _ in sse_json_events(body))
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for body in bodies:
+            for _ in sse_json_events(body):
+                pass
+    return (time.perf_counter() - start) / repeat / events * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--answer-words", type=int, default=200)
+    parser.add_argument("--chunk-words", type=int, default=1, help="Words per partial text event")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Words per second (0: unthrottled)")
+    args = parser.parse_args()
+
+    agent.root_agent.model = MockLlm(
+        final_text=" ".join(f"word{i}" for i in range(args.answer_words)),
+        tokens_per_second=args.tokens_per_second, chunk_tokens=args.chunk_words)
+    server, url = start_api_server()
+    client = ADKClient(url)
+    try:
+        records, bodies = [], []
+        for i in range(args.requests):
+            # A new session per answer, so the model context (and event size) does not grow
+            client.create_session(APP, USER, f"s_bench_{i}").raise_for_status()
+            record, body = stream_answer(client, f"s_bench_{i}", "weather in new york")
+            records.append(record)
+            bodies.append(body)
+    finally:
+        client.close()
+        server.should_exit = True
+
+    def median(values):
+        values = [v for v in values if v is not None]
+        return statistics.median(values) if values else float("nan")
+
+    transfer_s = sum(r["total_ms"] - r["ttfb_ms"] for r in records) / 1000
+    events = sum(r["events"] for r in records)
+    size = sum(len(chunk) for body in bodies for chunk in body)
+    tool_gaps = [call["gap_ms"] for r in records for call in r["tool_calls"]]
+    print(f"{args.requests} answers of {args.answer_words} words, {args.chunk_words} word(s) per event, "
+          f"{args.tokens_per_second or 'unthrottled'} words/s")
+    print(f"  events per answer        {events / len(records):>10.1f}")
+    print(f"  SSE throughput           {events / transfer_s:>10.0f} events/s {size / transfer_s / 1e6:>8.2f} MB/s")
+    print(f"  parse cost               {parse_cost(bodies):>10.2f} us/event")
+    print(f"  get_weather call->result {median(tool_gaps):>10.2f} ms (median)")
+    print(f"  ttfb / first text / end  {median(r['ttfb_ms'] for r in records):>6.1f} / "
+          f"{median(r['ttft_ms'] for r in records):.1f} / {median(r['total_ms'] for r in records):.1f} ms (median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark: latency of a model turn with several function calls, sequential vs parallel_tools.
+
+Runs an LlmAgent through a real ADK InMemoryRunner with a MockLlm that makes one turn of
+function calls, then answers. The tools are stand-ins that block for a set time (as a sync
+HTTP client or file read would), one per `--delays` value, plus an async tool that awaits
+`--async-delay`. Each tool list is run:
+
+* as ADK calls it: sync tools one after another on the event loop,
+* wrapped with multi_tool_agent.parallel_tools: sync tools on a thread pool, all overlapping.
+
+Reports the time from the function call event to the merged function response event against
+the sum and the maximum of the delays, and checks that results come back in call order. A
+last run adds a tool that raises: plain ADK fails the turn, the wrapped list returns an error
+result for that call and the other results.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel_tools --delays 0.2,0.4,0.8 --async-delay 0.5
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.parallel_tools import parallel_tools
+
+
+def blocking_tool(name, delay):
+    def tool(city: str) -> dict:
+        time.sleep(delay)
+        return {"status": "success", "report": f"{name} for {city}"}
+    tool.__name__ = tool.__doc__ = name
+    return tool
+
+
+def async_tool(name, delay):
+    async def tool(city: str) -> dict:
+        await asyncio.sleep(delay)
+        return {"status": "success", "report": f"{name} for {city}"}
+    tool.__name__ = tool.__doc__ = name
+    return tool
+
+
+def failing_tool(city: str) -> dict:
+    """failing_tool"""
+    raise ConnectionError("upstream unavailable")
+
+
+async def run_turn(tools, calls):
+    """(seconds from function calls to responses, (name, response) pairs in order, error or None)."""
+    llm = MockLlm(script=[calls, "Done."])
+    runner = InMemoryRunner(agent=LlmAgent(name="bench_agent", model=llm, tools=tools), app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text="Check everything for Paris")])
+    called = elapsed = None
+    results = []
+    try:
+        async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            if event.get_function_calls():
+                called = time.perf_counter()
+            responses = event.get_function_responses()
+            if responses:
+                elapsed = time.perf_counter() - called
+                results = [(r.name, r.response) for r in responses]
+    except Exception as e:
+        return time.perf_counter() - called, [], f"{type(e).__name__}: {e}"
+    return elapsed, results, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delays", default="0.2,0.4,0.8", help="Seconds each blocking tool takes")
+    parser.add_argument("--async-delay", type=float, default=0.5, help="Seconds the async tool takes (0: none)")
+    args = parser.parse_args()
+
+    delays = [float(d) for d in args.delays.split(",") if d]
+    tools = [blocking_tool(f"blocking_{i}", delay) for i, delay in enumerate(delays)]
+    if args.async_delay:
+        tools.append(async_tool("async_0", args.async_delay))
+        delays.append(args.async_delay)
+    calls = [(tool.__name__, {"city": "Paris"}) for tool in tools]
+    executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="bench-tool")
+
+    print(f"{len(calls)} function calls in one turn, tool delays {', '.join(f'{d:g}s' for d in delays)}: "
+          f"sum {sum(delays):.2f}s, slowest {max(delays):.2f}s")
+    print(f"  {'tools':<28} {'call -> responses':>17}  result")
+    for label, tool_list in [("sequential (ADK default)", tools), ("parallel_tools", parallel_tools(tools, executor))]:
+        elapsed, responses, error = asyncio.run(run_turn(tool_list, calls))
+        assert [name for name, _ in responses] == [name for name, _ in calls], "results out of call order"
+        print(f"  {label:<28} {elapsed:>16.3f}s  {len(responses)} results in call order")
+
+    calls.append(("failing_tool", {"city": "Paris"}))
+    tools.append(failing_tool)
+    print(f"with failing_tool added as call {len(calls)}:")
+    for label, tool_list in [("sequential (ADK default)", tools), ("parallel_tools", parallel_tools(tools, executor))]:
+        elapsed, responses, error = asyncio.run(run_turn(tool_list, calls))
+        outcome = (f"turn failed: {error}" if error else
+                   f"{sum(r.get('status') == 'success' for _, r in responses)} results, "
+                   f"error result: {responses[-1][1].get('error_message')}")
+        print(f"  {label:<28} {elapsed:>16.3f}s  {outcome}")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: merging the partial text of a 10k-token answer, prefix rescans vs PartialMerger.
+
+The same answer is streamed as cumulative chunks (each the text so far, as the speak
+protocol sends) and as delta chunks (only the new token, as ADK sends). For each, the
+text is merged with:
+
+* rescan: the README recipe, `startswith` on the text so far, then slice off the delta
+  and `+=` it to the utterance string,
+* PartialMerger: kind of chunk detected from the first chunks, new suffix sliced at the known
+  length after a short boundary check, text kept as appended chunks.
+
+Reports the merge cost per token for the first and last 1,000 tokens (a rescan grows with
+the text), the total, and AssistantMessage rendering a frame every `--frame-every` events.
+
+Run from the repository root:
+    python -m benchmarks.bench_partial_merge --tokens 10000
+"""
+import argparse
+import time
+
+from adk_client.message import AssistantMessage
+from adk_client.partials import PartialMerger
+
+
+def build_chunks(tokens):
+    words = [f"word{i} " for i in range(tokens)]
+    cumulative = []
+    text = ""
+    for word in words:
+        text += word
+        cumulative.append(text)
+    return cumulative, words, text
+
+
+def rescan(chunks):
+    """Per-event seconds for the prefix-comparing merge."""
+    text = ""
+    timings = []
+    for chunk in chunks:
+        start = time.perf_counter()
+        if chunk.startswith(text):
+            text += chunk[len(text):]
+        else:
+            text += chunk
+        timings.append(time.perf_counter() - start)
+    return timings, text
+
+
+def merger(chunks):
+    merged = PartialMerger()
+    timings = []
+    for chunk in chunks:
+        start = time.perf_counter()
+        merged.add(chunk)
+        timings.append(time.perf_counter() - start)
+    return timings, merged.text
+
+
+def message_frames(chunks, final_text, frame_every):
+    message = AssistantMessage()
+    start = time.perf_counter()
+    for i, chunk in enumerate(chunks):
+        message.speak("utterance_1", chunk, True)
+        if i % frame_every == 0:
+            message.text()
+    message.speak("utterance_1", final_text, False)
+    assert message.text() == final_text
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=10000)
+    parser.add_argument("--frame-every", type=int, default=50, help="Events per rendered frame")
+    args = parser.parse_args()
+
+    cumulative, deltas, final_text = build_chunks(args.tokens)
+    window = min(1000, args.tokens)
+    print(f"{args.tokens} tokens, {len(final_text) / 1000:.0f}k characters")
+    print(f"  {'chunks':<11} {'merge':<14} {'first us/tok':>12} {'last us/tok':>12} {'total ms':>9}")
+    for kind, chunks in [("cumulative", cumulative), ("delta", deltas)]:
+        for label, merge in [("rescan", rescan), ("PartialMerger", merger)]:
+            timings, text = merge(chunks)
+            assert text == final_text, (kind, label)
+            first = sum(timings[:window]) / window * 1e6
+            last = sum(timings[-window:]) / window * 1e6
+            print(f"  {kind:<11} {label:<14} {first:>12.2f} {last:>12.2f} {sum(timings) * 1000:>9.1f}")
+        print(f"  {kind:<11} {'AssistantMessage, a frame every ' + str(args.frame_every) + ' events':<40} "
+              f"{message_frames(chunks, final_text, args.frame_every) * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Benchmark: input tokens per model call and time to first output, old prompt vs static prefix.
+
+Plays the same conversation (`--sessions` sessions of the questions in TURNS) through a real
+ADK InMemoryRunner for two versions of root_agent:
+
+* old: the verbose instruction root_agent had before, and tool descriptions from the whole
+  docstrings (Args and Returns sections included),
+* static prefix: agent.create_root_agent(), with ROOT_AGENT_INSTRUCTION and one-paragraph
+  tool descriptions.
+
+A before_model_callback sizes each model request (prompt_prefix.request_footprint) and hashes
+its prefix (system instruction and tool declarations); the runner's events go through a
+StreamTimer as on the client, which gives each model call's input and cached tokens from its
+usage metadata and its time to first output. Reported per version: prefix characters and
+estimated tokens, distinct prefixes over all calls (1: every call of every session starts the
+same), mean input tokens per call and the part of it outside the prefix, and model call
+TTFT.
+
+Offline on MockLlm by default, whose token counts are estimates from the request size. With
+`--model gemini-2.5-flash` (and an API key) the counts and TTFT are Gemini's own, and the
+cached tokens column shows what the model's implicit caching served.
+
+Run from the repository root:
+    python -m benchmarks.bench_prompt_footprint --sessions 3
+"""
+import argparse
+import asyncio
+import statistics
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_client.metrics import StreamTimer
+from multi_tool_agent import agent
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.parallel_tools import parallel_tools
+from multi_tool_agent.prompt_prefix import estimate_tokens, prefix_key, request_footprint
+
+# root_agent's instruction before the static prefix, as it was sent.
+OLD_INSTRUCTION = (
+    "You are a helpful agent who can answer user questions about the time and weather in a city.\n"
+    "        You have two tools for weather: get_weather (fast) and slow_get_weather (slow).\n"
+    "        Each tool has a variant taking a list of cities (get_weather_for_cities, slow_get_weather_for_cities,\n"
+    "        get_current_time_for_cities). When a question is about more than one city, call the list variant once\n"
+    "        with all the cities instead of calling the single-city tool for each city.\n"
+    "        IMPORTANT: before calling the slow weather app, inform the user BEFORE making the call"
+    " (don't ask permission, just inform). \n"
+    "        Once the slow weather tool has run inform the user again.\n"
+    "        Use slow weather if user asks for it. \n"
+    "        Otherwise never use it, and no need to inform the user about it. \n"
+    "        Thank you agent for your service."
+)
+OLD_TOOLS = [agent.get_weather_for_cities, agent.slow_get_weather_for_cities, agent.get_current_time_for_cities,
+             agent.get_weather, agent.slow_get_weather, agent.get_current_time]
+
+TURNS = ["What's the weather in New York?", "What time is it in London and Paris?",
+         "Get me the slow weather in New York", "And the time in Tokyo?"]
+
+
+async def run_conversation(root, sessions):
+    """(footprint dicts, prefix keys, model call records) over all model calls of all sessions."""
+    footprints, keys = [], []
+
+    def size_request(callback_context, llm_request):
+        footprints.append(request_footprint(llm_request))
+        keys.append(prefix_key(llm_request))
+
+    runner = InMemoryRunner(agent=root.clone(update={"before_model_callback": size_request}), app_name="bench")
+    model_calls = []
+    for _ in range(sessions):
+        session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+        for question in TURNS:
+            timer = StreamTimer()
+            message = types.Content(role="user", parts=[types.Part(text=question)])
+            async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+                timer.observe(event.model_dump(mode="json", exclude_none=True, by_alias=True))
+            model_calls += timer.finish()["model_calls"]
+    return footprints, keys, model_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--model", default="mock", help="Model name; default: MockLlm, offline")
+    args = parser.parse_args()
+
+    agent.SLOW_WEATHER_DELAY_SECONDS = 0.2
+    current = agent.create_root_agent()
+    versions = [("old", current.clone(update={"instruction": OLD_INSTRUCTION,
+                                              "tools": parallel_tools(OLD_TOOLS, agent._blocking_tool_executor)})),
+                ("static prefix", current)]
+    print(f"{args.sessions} sessions x {len(TURNS)} questions on {args.model}"
+          + (" (token counts estimated, 4 chars a token)" if args.model == "mock" else ""))
+    print(f"  {'version':<15} {'system ch':>9} {'tools ch':>9} {'prefix tok':>10} {'prefixes':>8} {'calls':>5} "
+          f"{'input tok':>9} {'outside prefix':>14} {'cached tok':>10} {'model ttft p50':>14}")
+    for label, root in versions:
+        model = MockLlm() if args.model == "mock" else args.model
+        footprints, keys, model_calls = asyncio.run(run_conversation(root.clone(update={"model": model}),
+                                                                     args.sessions))
+        prefix_chars = footprints[0]["system_chars"] + footprints[0]["tool_chars"]
+        input_tokens = statistics.fmean(call["input_tokens"] for call in model_calls)
+        ttfts = [call["ttft_ms"] for call in model_calls if call["ttft_ms"] is not None]
+        print(f"  {label:<15} {footprints[0]['system_chars']:>9} {footprints[0]['tool_chars']:>9} "
+              f"{estimate_tokens(prefix_chars):>10} {len(set(keys)):>8} {len(model_calls):>5} "
+              f"{input_tokens:>9.0f} {input_tokens - estimate_tokens(prefix_chars):>14.0f} "
+              f"{statistics.fmean(call['cached_tokens'] for call in model_calls):>10.0f} "
+              f"{statistics.median(ttfts) if ttfts else float('nan'):>12.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
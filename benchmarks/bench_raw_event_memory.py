@@ -0,0 +1,90 @@
+"""Memory benchmark: raw-event capture over a long synthetic chat, plain lists vs RawEventStore.
+
+Simulates a session of `--turns` assistant messages, each streaming `--events` ADK-shaped
+SSE lines, and measures memory retained for raw events (tracemalloc) plus the raw-event
+text a rerun sends to the page with every expander closed.
+
+Run from the repository root:
+    python -m benchmarks.bench_raw_event_memory --turns 500 --events 80
+"""
+import argparse
+import json
+import time
+import tracemalloc
+import uuid
+
+from adk_client.raw_events import RAW_EVENTS_BUDGET_BYTES, RawEventStore
+
+
+def event_line(turn, i):
+    event = {
+        "content": {"parts": [{"text": f"turn {turn} token {i} "}], "role": "model"},
+        "partial": True,
+        "invocationId": f"e-{uuid.uuid4()}",
+        "author": "weather_time_agent",
+        "actions": {"stateDelta": {}, "artifactDelta": {}, "requestedAuthConfigs": {}},
+        "id": str(uuid.uuid4()),
+        "timestamp": time.time(),
+    }
+    return f"data: {json.dumps(event)}"
+
+
+def run_lists(turns, events):
+    history = []
+    for turn in range(turns):
+        raw_events = []
+        for i in range(events):
+            raw_events.append(event_line(turn, i))
+        history.append(raw_events)
+    # Every rerun used to dump all events into st.text, expanders closed or not.
+    page_bytes = sum(len("\n".join(raw).encode("utf-8")) for raw in history)
+    return history, page_bytes, sum(len(raw) for raw in history)
+
+
+def run_store(turns, events, budget, evict):
+    store = RawEventStore(budget_bytes=budget, evict=evict)
+    history = []
+    for turn in range(turns):
+        log = store.new_log()
+        for i in range(events):
+            log.append(event_line(turn, i))
+        log.seal()
+        history.append(log)
+    # Closed expanders send nothing; events are inflated only when one is opened.
+    return (store, history), 0, sum(len(log) for log in history)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept, page_bytes, retained = fn(*args)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current, peak, page_bytes, retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=500)
+    parser.add_argument("--events", type=int, default=80, help="Raw events per assistant message")
+    parser.add_argument("--budget-mb", type=float, default=RAW_EVENTS_BUDGET_BYTES / 1024 / 1024)
+    parser.add_argument("--evict", choices=("oldest", "largest"), default="oldest")
+    args = parser.parse_args()
+
+    budget = int(args.budget_mb * 1024 * 1024)
+    rows = [
+        ("list per message", measure(run_lists, args.turns, args.events)),
+        (f"RawEventStore {args.budget_mb:g} MB", measure(run_store, args.turns, args.events, budget, args.evict)),
+        ("RawEventStore unbounded", measure(run_store, args.turns, args.events, 1 << 62, args.evict)),
+    ]
+    print(f"{args.turns} turns x {args.events} raw events")
+    print(f"{'storage':<26} {'retained MB':>12} {'peak MB':>9} {'events kept':>12} {'page KB/rerun':>14} {'time s':>7}")
+    for label, (current, peak, page_bytes, retained, elapsed) in rows:
+        print(f"{label:<26} {current / 1e6:>12.2f} {peak / 1e6:>9.2f} {retained:>12} "
+              f"{page_bytes / 1024:>14.0f} {elapsed:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
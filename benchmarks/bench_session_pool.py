@@ -0,0 +1,81 @@
+"""Benchmark: time to a user's first answer with on-demand vs pre-created sessions.
+
+Against the local stub server with `--session-delay` seconds per session creation (a
+persistent session store), each "user" gets a session and then streams one /run_sse answer.
+On demand, the session is created right before the query, as Cell 1 and the Streamlit app
+did. Pooled, it comes from adk_client.session_pool.SessionPool, refilled in the background
+while the previous user's answer streams. Also times reusing an existing session id
+("Session already exists") through the pool, and reports the pool counters.
+
+Run from the repository root:
+    python -m benchmarks.bench_session_pool --users 20 --session-delay 0.2
+"""
+import argparse
+import statistics
+import time
+
+from adk_client.client import ADKClient
+from adk_client.session_pool import SessionPool, adk_session_factory
+from benchmarks.stub_server import start_stub_server
+
+APP, USER = "multi_tool_agent", "u_bench"
+
+
+def first_answer(client, session_id):
+    with client.run_sse(APP, USER, session_id, "weather in new york") as r:
+        r.raise_for_status()
+        for _ in r.iter_content(chunk_size=None):
+            pass
+
+
+def measure(users, get_session, client):
+    samples = []
+    for _ in range(users):
+        start = time.perf_counter()
+        first_answer(client, get_session())
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.fmean(samples), max(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--session-delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--partials", type=int, default=20)
+    args = parser.parse_args()
+
+    server = start_stub_server(partials=args.partials, token_delay=args.token_delay,
+                               session_delay=args.session_delay)
+    client = ADKClient(server.base_url)
+    create, delete = adk_session_factory(client, APP, USER)
+    pool = SessionPool(create, delete=delete)
+    pool.fill()
+    time.sleep(args.session_delay * 2)  # the pool is warmed at startup, before users arrive
+    try:
+        print(f"{args.users} users, session creation {args.session_delay * 1000:.0f}ms, "
+              f"answer about {args.partials * args.token_delay * 1000:.0f}ms")
+        print(f"  {'session':<24} {'mean ms':>9} {'max ms':>9}")
+        for label, get_session in [("created on demand", lambda: create().session_id),
+                                   ("from the pool", lambda: pool.acquire().session_id)]:
+            mean, worst = measure(args.users, get_session, client)
+            print(f"  {label:<24} {mean:>9.1f} {worst:>9.1f}")
+
+        pool.reserve("s_existing")
+        pool.acquire("s_existing")  # created
+        pool.reserve("s_existing")
+        time.sleep(args.session_delay * 1.5)
+        start = time.perf_counter()
+        session = pool.acquire("s_existing")
+        reuse_ms = (time.perf_counter() - start) * 1000
+        assert session.existed and session.warm, session
+        print(f"  reserved existing session handed out in {reuse_ms:.2f}ms (existed={session.existed})")
+        print(f"  pool counters: {pool.stats()}")
+    finally:
+        pool.close()
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark: event append and session load latency with 100k stored events, ADK's
+DatabaseSessionService on SQLite vs multi_tool_agent.session_store.SqliteSessionService.
+
+Fills a SQLite database with `--events` events over `--sessions` sessions (bulk insert), then
+copies it: the baseline copy runs ADK's DatabaseSessionService as `adk api_server
+--session_service_uri sqlite:///...` would (rollback journal, no session index, a commit per
+event); the other runs SqliteSessionService (WAL, events indexed by session, batched writes).
+On each it measures:
+
+* append: `--appends` events appended to one session, as a turn does; latency seen by the
+  caller per event, and the total including the final flush to disk,
+* load: get_session for `--loads` random sessions, each holding `events / sessions` events.
+
+Run from the repository root:
+    python -m benchmarks.bench_session_store --events 100000 --sessions 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions.database_session_service import DatabaseSessionService, StorageEvent
+from google.genai import types
+
+from multi_tool_agent.session_store import SqliteSessionService
+
+APP, USER = "multi_tool_agent", "u_bench"
+
+
+def fill(path, n_events, n_sessions):
+    """Creates the sessions through the service, then bulk-inserts the events."""
+    service = SqliteSessionService(path)
+
+    async def create():
+        for i in range(n_sessions):
+            await service.create_session(app_name=APP, user_id=USER, session_id=f"s_{i}")
+    asyncio.run(create())
+
+    start = time.time() - n_events
+    rows = [{"id": f"e_{i}", "app_name": APP, "user_id": USER, "session_id": f"s_{i % n_sessions}",
+             "invocation_id": f"inv_{i // 10}", "author": "weather_time_agent", "actions": EventActions(),
+             "timestamp": datetime.fromtimestamp(start + i),
+             "content": {"parts": [{"text": f"The weather in city {i} is sunny."}], "role": "model"}}
+            for i in range(n_events)]
+    with service.db_engine.begin() as connection:
+        connection.execute(StorageEvent.__table__.insert(), rows)
+    service.close()
+
+
+def as_baseline(path):
+    """Turns a copy back into what DatabaseSessionService creates: no WAL, no session index."""
+    connection = sqlite3.connect(path)
+    connection.execute("DROP INDEX IF EXISTS ix_events_session_timestamp")
+    connection.execute("PRAGMA journal_mode=DELETE")
+    connection.close()
+
+
+def new_event(i):
+    return Event(author="weather_time_agent", invocation_id="inv_bench",
+                 content=types.Content(role="model", parts=[types.Part(text=f"Appended event {i}.")]))
+
+
+async def measure(service, appends, loads, n_sessions, seed=0):
+    session = await service.get_session(app_name=APP, user_id=USER, session_id="s_0")
+    append_ms = []
+    start = time.perf_counter()
+    for i in range(appends):
+        event_start = time.perf_counter()
+        await service.append_event(session, new_event(i))
+        append_ms.append((time.perf_counter() - event_start) * 1000)
+    if isinstance(service, SqliteSessionService):
+        await service.flush()
+    append_total = time.perf_counter() - start
+
+    rng = random.Random(seed)
+    load_ms = []
+    for _ in range(loads):
+        session_id = f"s_{rng.randrange(n_sessions)}"
+        load_start = time.perf_counter()
+        loaded = await service.get_session(app_name=APP, user_id=USER, session_id=session_id)
+        load_ms.append((time.perf_counter() - load_start) * 1000)
+        assert loaded is not None and loaded.events
+    return append_ms, append_total, load_ms
+
+
+def p99(values):
+    return sorted(values)[int(len(values) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--appends", type=int, default=500)
+    parser.add_argument("--loads", type=int, default=200)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_session_store_")
+    try:
+        tuned_path = os.path.join(workdir, "tuned.db")
+        baseline_path = os.path.join(workdir, "baseline.db")
+        fill_start = time.perf_counter()
+        fill(tuned_path, args.events, args.sessions)
+        shutil.copy(tuned_path, baseline_path)
+        as_baseline(baseline_path)
+        print(f"{args.events} events in {args.sessions} sessions, filled in {time.perf_counter() - fill_start:.1f}s; "
+              f"{args.appends} appends to one session, {args.loads} session loads")
+        print(f"  {'service':<24} {'append mean':>11} {'p99 ms':>8} {'events/s':>9} {'load mean':>10} {'p99 ms':>8}")
+        for label, make in [("DatabaseSessionService", lambda: DatabaseSessionService(f"sqlite:///{baseline_path}")),
+                            ("SqliteSessionService", lambda: SqliteSessionService(tuned_path))]:
+            service = make()
+            append_ms, append_total, load_ms = asyncio.run(measure(service, args.appends, args.loads, args.sessions))
+            if isinstance(service, SqliteSessionService):
+                service.close()
+            service.db_engine.dispose()
+            print(f"  {label:<24} {statistics.fmean(append_ms):>8.3f} ms {p99(append_ms):>8.3f} "
+                  f"{args.appends / append_total:>9.0f} {statistics.fmean(load_ms):>7.2f} ms {p99(load_ms):>8.2f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
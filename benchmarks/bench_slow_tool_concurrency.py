@@ -0,0 +1,55 @@
+"""Load benchmark: N concurrent sessions calling the slow weather tool.
+
+Each simulated session awaits the tool on one shared event loop, the same way the ADK
+runner awaits tools for concurrent /run_sse requests in a single api_server process.
+
+Run from the repository root:
+    python -m benchmarks.bench_slow_tool_concurrency --sessions 20 --delay 5
+"""
+import argparse
+import asyncio
+import time
+
+from multi_tool_agent import agent
+
+
+async def _run_sessions(tool, sessions):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(tool("New York") for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    assert all(r["status"] == "success" for r in results)
+    return elapsed
+
+
+async def _blocking_on_loop(city):
+    # What ADK does with a plain sync tool: call it directly on the event loop thread.
+    return agent.blocking_slow_get_weather(city)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=agent.SLOW_WEATHER_DELAY_SECONDS,
+                        help="Tool delay in seconds (default: the tool's own delay)")
+    parser.add_argument("--skip-blocking", action="store_true",
+                        help="Skip the blocking baseline, which takes sessions x delay seconds")
+    args = parser.parse_args()
+
+    agent.SLOW_WEATHER_DELAY_SECONDS = args.delay
+    variants = [
+        # Unwrapped past the result cache, which would coalesce the concurrent calls into one.
+        ("async slow_get_weather", agent.slow_get_weather.__wrapped__),
+        ("run_in_thread_pool(blocking_slow_get_weather)",
+         agent.run_in_thread_pool(agent.blocking_slow_get_weather)),
+    ]
+    if not args.skip_blocking:
+        variants.append(("blocking_slow_get_weather on event loop", _blocking_on_loop))
+
+    print(f"{args.sessions} concurrent sessions, tool delay {args.delay:.2f}s")
+    for label, tool in variants:
+        elapsed = asyncio.run(_run_sessions(tool, args.sessions))
+        print(f"  {label:<48} {elapsed:7.2f}s total  ({elapsed / args.delay:5.1f}x delay)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Benchmark: bytes and client CPU per streamed answer, /run_sse with and without coalescing.
+
+Serves ADK's FastAPI app in-process on uvicorn with root_agent on MockLlm (as in
+bench_mock_streaming), once as is and once per `--windows` value behind
+multi_tool_agent.sse_coalescing.CoalescingMiddleware, and streams `--requests` answers of
+`--answer-words` words from each. Reports per answer:
+
+* events and bytes on the wire,
+* client CPU: parsing the recorded body (adk_client.sse + JSON backend) and merging its text
+  with PartialMerger, measured apart from the network,
+* time to first text and to the end of the stream (medians),
+
+and checks that every configuration delivers the same text.
+
+Run from the repository root:
+    python -m benchmarks.bench_sse_coalescing --requests 20 --answer-words 500 --tokens-per-second 200
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import uvicorn
+from google.adk.cli.fast_api import get_fast_api_app
+
+from adk_client.client import ADKClient
+from adk_client.events import PartialText
+from adk_client.metrics import StreamTimer
+from adk_client.partials import DELTA, PartialMerger
+from adk_client.resume import sse_json_events
+from benchmarks.bench_mock_streaming import APP, REPO_ROOT, USER, recorded
+from multi_tool_agent import agent
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.sse_coalescing import COALESCE_BYTES, CoalescingMiddleware
+
+
+def start_server(window_ms):
+    app = get_fast_api_app(agents_dir=REPO_ROOT, web=False)
+    if window_ms:
+        app.add_middleware(CoalescingMiddleware, max_delay=window_ms / 1000, max_bytes=COALESCE_BYTES)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    threading.Thread(target=server.run, name=f"adk-api-server-{window_ms}", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}"
+
+
+def answer_text(body):
+    """The final answer as the clients build it: partial text merged, closed by the final event."""
+    merger = PartialMerger(DELTA)
+    text = ""
+    for _, event in sse_json_events(body):
+        if isinstance(event, PartialText):
+            merger.add(event.text)
+        elif isinstance(event, dict) and not event.get("partial"):
+            parts = (event.get("content") or {}).get("parts") or ()
+            texts = [part["text"] for part in parts if "text" in part]
+            if texts:
+                merger.final("".join(texts))
+                text = merger.text
+                merger = PartialMerger(merger.mode)
+    return text
+
+
+def client_cpu(bodies, repeat=5):
+    start = time.process_time()
+    for _ in range(repeat):
+        for body in bodies:
+            answer_text(body)
+    return (time.process_time() - start) / repeat / len(bodies) * 1000
+
+
+def run(url, requests, label):
+    client = ADKClient(url)
+    records, bodies = [], []
+    try:
+        for i in range(requests):
+            session_id = f"s_{label}_{i}"
+            client.create_session(APP, USER, session_id).raise_for_status()
+            timer = StreamTimer(label)
+            body = []
+            with client.run_sse(APP, USER, session_id, "weather in new york") as r:
+                r.raise_for_status()
+                for _, event in sse_json_events(timer.chunks(recorded(r.iter_content(chunk_size=None), body))):
+                    timer.observe(event)
+            records.append(timer.finish())
+            bodies.append(body)
+    finally:
+        client.close()
+    return records, bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--answer-words", type=int, default=500)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Words per second (0: unthrottled)")
+    parser.add_argument("--windows", default="20,50,100", help="Coalescing windows to compare, in ms")
+    args = parser.parse_args()
+
+    agent.root_agent.model = MockLlm(final_text=" ".join(f"word{i}" for i in range(args.answer_words)),
+                                     tokens_per_second=args.tokens_per_second)
+    print(f"{args.requests} answers of {args.answer_words} words at {args.tokens_per_second or 'unthrottled'} words/s")
+    print(f"  {'stream':<16} {'events':>7} {'KB':>8} {'client CPU ms':>14} {'first text ms':>14} {'end ms':>8}")
+    expected = None
+    for window_ms in [0] + [float(w) for w in args.windows.split(",") if w]:
+        server, url = start_server(window_ms)
+        try:
+            records, bodies = run(url, args.requests, f"w{window_ms:g}")
+        finally:
+            server.should_exit = True
+        texts = {answer_text(body) for body in bodies}
+        assert len(texts) == 1 and (expected is None or texts == expected), "coalescing changed the answer"
+        expected = texts
+        label = "uncoalesced" if not window_ms else f"coalesced {window_ms:g}ms"
+        print(f"  {label:<16} {statistics.fmean(r['events'] for r in records):>7.1f} "
+              f"{statistics.fmean(sum(map(len, body)) for body in bodies) / 1024:>8.1f} "
+              f"{client_cpu(bodies):>14.2f} {statistics.median(r['ttft_ms'] for r in records):>14.1f} "
+              f"{statistics.median(r['total_ms'] for r in records):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: bytes on the wire and latency of /run_sse, uncompressed vs streaming compression.
+
+Serves ADK's FastAPI app in-process on uvicorn with root_agent on MockLlm (as in
+bench_mock_streaming), as is and behind multi_tool_agent.sse_compression.CompressionMiddleware
+with each available coding (gzip, plus br when `brotli` is installed), also combined with a
+50 ms CoalescingMiddleware. Streams `--requests` tool-using answers of `--answer-words` words
+through adk_client and reports per answer:
+
+* body bytes sent by the server (after compression) and the event bytes the client decoded,
+* time to first text and to the end of the stream, and the largest gap between events, all
+  medians: a compressor that buffered events would show up here,
+* client CPU per answer (the reading thread only) for the stream, decompression included.
+
+Run from the repository root:
+    python -m benchmarks.bench_sse_compression --requests 20 --answer-words 500 --tokens-per-second 200
+"""
+import argparse
+import statistics
+import threading
+import time
+
+import uvicorn
+from google.adk.cli.fast_api import get_fast_api_app
+
+from adk_client.client import ADKClient
+from adk_client.metrics import StreamTimer
+from adk_client.resume import sse_json_events
+from benchmarks.bench_mock_streaming import APP, REPO_ROOT, USER
+from multi_tool_agent import agent
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.sse_coalescing import CoalescingMiddleware
+from multi_tool_agent.sse_compression import CompressionMiddleware, available_encodings
+
+
+class BodyBytes:
+    """Outermost ASGI middleware recording the response body bytes of each /run_sse request."""
+
+    def __init__(self, app, sizes):
+        self.app = app
+        self.sizes = sizes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != "/run_sse":
+            await self.app(scope, receive, send)
+            return
+        size = 0
+
+        async def counting_send(message):
+            nonlocal size
+            if message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, counting_send)
+        finally:
+            self.sizes.append(size)
+
+
+def start_server(encoding, coalesce_delay, sizes):
+    app = get_fast_api_app(agents_dir=REPO_ROOT, web=False)
+    if coalesce_delay:
+        app.add_middleware(CoalescingMiddleware, max_delay=coalesce_delay)
+    if encoding:
+        app.add_middleware(CompressionMiddleware, encodings=(encoding,))
+    app.add_middleware(BodyBytes, sizes=sizes)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    threading.Thread(target=server.run, name="adk-api-server", daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{server.servers[0].sockets[0].getsockname()[1]}"
+
+
+def stream_answer(client, session_id):
+    timer = StreamTimer()
+    decoded = 0
+    cpu_start = time.thread_time()
+    with client.run_sse(APP, USER, session_id, "weather in new york") as r:
+        r.raise_for_status()
+        for sse_event, event in sse_json_events(timer.chunks(r.iter_content(chunk_size=None))):
+            timer.observe(event)
+            decoded += len(sse_event.data) + 8  # "data: " and the blank line
+        encoding = r.headers.get("Content-Encoding", "identity")
+    return timer.finish(), decoded, time.thread_time() - cpu_start, encoding
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--answer-words", type=int, default=500)
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="Words per second (0: unthrottled)")
+    args = parser.parse_args()
+
+    agent.root_agent.model = MockLlm(final_text=" ".join(f"word{i}" for i in range(args.answer_words)),
+                                     tokens_per_second=args.tokens_per_second)
+    configs = [(None, 0.0)] + [(coding, 0.0) for coding in available_encodings()]
+    configs += [(None, 0.05)] + [(coding, 0.05) for coding in available_encodings()]
+    print(f"{args.requests} answers of {args.answer_words} words at {args.tokens_per_second or 'unthrottled'} words/s")
+    print(f"  {'stream':<30} {'wire KB':>8} {'events KB':>10} {'ratio':>6} {'first text ms':>14} "
+          f"{'end ms':>8} {'max gap ms':>11} {'client CPU ms':>14}")
+    for encoding, coalesce_delay in configs:
+        sizes = []
+        server, url = start_server(encoding, coalesce_delay, sizes)
+        client = ADKClient(url)
+        try:
+            results = []
+            for i in range(args.requests):
+                client.create_session(APP, USER, f"s_bench_{i}").raise_for_status()
+                results.append(stream_answer(client, f"s_bench_{i}"))
+        finally:
+            client.close()
+            server.should_exit = True
+        assert all(result[3] == (encoding or "identity") for result in results), "unexpected Content-Encoding"
+        records = [result[0] for result in results]
+        wire = statistics.fmean(sizes)
+        decoded = statistics.fmean(result[1] for result in results)
+        label = (encoding or "uncompressed") + (f" + coalesce {coalesce_delay * 1000:g}ms" if coalesce_delay else "")
+        print(f"  {label:<30} {wire / 1024:>8.1f} {decoded / 1024:>10.1f} {decoded / wire:>5.1f}x "
+              f"{statistics.median(r['ttft_ms'] for r in records):>14.1f} "
+              f"{statistics.median(r['total_ms'] for r in records):>8.1f} "
+              f"{statistics.median(r['max_inter_event_ms'] for r in records):>11.1f} "
+              f"{statistics.fmean(result[2] for result in results) * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
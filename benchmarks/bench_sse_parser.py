@@ -0,0 +1,135 @@
+"""Microbenchmark: adk_client.sse decoder vs the old per-line `buffer = buffer[pos+1:]` loop.
+
+The old loop re-copies the whole remaining buffer for every line, so a large chunk with many
+events costs O(lines x chunk size). The stream is fed in chunks of several sizes, from
+network-sized reads up to the whole stream at once (a proxy flushing a batched response).
+
+Run from the repository root:
+    python -m benchmarks.bench_sse_parser --sizes 1 2 4 --chunk-sizes 4096 65536 0
+"""
+import argparse
+import json
+import time
+
+from adk_client.sse import iter_sse_events
+
+
+def build_stream(target_bytes):
+    """Builds an ADK-style /run_sse body of roughly target_bytes of partial-text events."""
+    events = []
+    size = 0
+    i = 0
+    while size < target_bytes:
+        event = {
+            "content": {"parts": [{"text": f"token {i} of a long streamed answer. "}], "role": "model"},
+            "partial": True,
+            "invocationId": "e-0a1b2c3d",
+            "author": "weather_time_agent",
+            "id": f"evt-{i}",
+        }
+        line = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+        events.append(line)
+        size += len(line)
+        i += 1
+    return b"".join(events), i
+
+
+def build_long_event(target_bytes):
+    """Builds a /run_sse body holding one function response event of roughly target_bytes."""
+    report = "x" * target_bytes
+    event = {
+        "content": {"parts": [{"functionResponse": {"name": "get_weather", "response": {"report": report}}}],
+                    "role": "user"},
+        "invocationId": "e-0a1b2c3d",
+        "author": "weather_time_agent",
+        "id": "evt-0",
+    }
+    return f"data: {json.dumps(event)}\n\n".encode("utf-8"), 1
+
+
+def legacy_parse(chunks):
+    """The loop previously copied into run_cell3/4/5."""
+    count = 0
+    buffer = b''
+    for chunk in chunks:
+        if not chunk: continue
+        buffer += chunk
+        while True:
+            try: newline_pos = buffer.index(b'\n')
+            except ValueError: break
+            line_bytes = buffer[:newline_pos]
+            buffer = buffer[newline_pos+1:]
+            if not line_bytes.strip(): continue
+            try: decoded_line = line_bytes.decode('utf-8')
+            except UnicodeDecodeError: continue
+            if decoded_line.startswith('data: '):
+                json_str = decoded_line[len('data: '):].strip()
+                if json_str:
+                    count += 1
+    return count
+
+
+def sse_parse(chunks):
+    count = 0
+    for sse_event in iter_sse_events(chunks):
+        if sse_event.data:
+            count += 1
+    return count
+
+
+def split(stream, chunk_size):
+    if chunk_size <= 0:
+        return [stream]
+    return [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+
+
+def timed(parse, chunks):
+    start = time.perf_counter()
+    count = parse(chunks)
+    return time.perf_counter() - start, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="*", default=[1, 2, 4],
+                        help="Stream sizes in MB")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[4096, 65536, 0],
+                        help="Chunk sizes in bytes; 0 feeds the whole stream as one chunk")
+    parser.add_argument("--long-event-sizes", type=float, nargs="*", default=[1, 2, 4],
+                        help="Sizes in MB of single events fed in --long-event-chunk-size chunks")
+    parser.add_argument("--long-event-chunk-size", type=int, default=1024,
+                        help="Chunk size in bytes for the single-event streams")
+    parser.add_argument("--skip-legacy", action="store_true",
+                        help="Only time the new decoder (the legacy loop is quadratic)")
+    args = parser.parse_args()
+
+    header = f"{'MB':>5} {'chunk':>8} {'events':>8} {'legacy s':>10} {'sse s':>8} {'speedup':>8}"
+    cases = [(size_mb, build_stream, chunk_size) for size_mb in args.sizes for chunk_size in args.chunk_sizes]
+    long_cases = [(size_mb, build_long_event, args.long_event_chunk_size) for size_mb in args.long_event_sizes]
+    for title, rows in (("Many short events", cases), ("One long event", long_cases)):
+        if not rows:
+            continue
+        print(title)
+        print(header)
+        for size_mb, build, chunk_size in rows:
+            stream, n_events = build(int(size_mb * 1024 * 1024))
+            print(row(size_mb, stream, n_events, chunk_size, args.skip_legacy))
+        print()
+
+
+def row(size_mb, stream, n_events, chunk_size, skip_legacy):
+    chunks = split(stream, chunk_size)
+    new_s, new_count = timed(sse_parse, chunks)
+    assert new_count == n_events, (new_count, n_events)
+    if skip_legacy:
+        legacy_col, speedup_col = "-", "-"
+    else:
+        old_s, old_count = timed(legacy_parse, chunks)
+        assert old_count == n_events, (old_count, n_events)
+        legacy_col, speedup_col = f"{old_s:.3f}", f"{old_s / new_s:.1f}x"
+    chunk_label = "all" if chunk_size <= 0 else str(chunk_size)
+    return f"{size_mb:>5g} {chunk_label:>8} {n_events:>8} {legacy_col:>10} {new_s:>8.3f} {speedup_col:>8}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: reading /run_sse inline vs on a StreamConsumer thread, as the Streamlit app does.
+
+Against the local stub server, whose tool call is silent for `--tool-delay` seconds:
+
+* hold time: how long the caller (the Streamlit script thread) is blocked per answer. Inline,
+  that is the whole stream; with a consumer, only starting the thread.
+* stop latency: a stop requested during the silent tool call. Inline, the stop flag is
+  only checked when the next event arrives; StreamConsumer.cancel() shuts the socket down.
+* `--streams` answers streamed at once through consumers drained by one polling loop (one
+  UI frame every `--interval`): wall time, slowest frame, and that every answer completed.
+
+Run from the repository root:
+    python -m benchmarks.bench_stream_consumer --streams 20 --tool-delay 1
+"""
+import argparse
+import time
+
+from adk_client.client import ADKClient
+from adk_client.consumer import DONE, ITEM, StreamConsumer
+from adk_client.resume import ResumableStream, sse_json_events
+from benchmarks.stub_server import start_stub_server
+
+
+def open_stream(client, session_id, watch=None):
+    def connect(last_event_id, attempt):
+        params = {"session_id": session_id, "question": "weather in new york", "streaming": "true"}
+        with client.get("/run_sse", params=params, stream=True) as r:
+            if watch is not None:
+                watch(r)
+            r.raise_for_status()
+            yield from sse_json_events(r.iter_content(chunk_size=None))
+    return ResumableStream(connect)
+
+
+def start_consumer(client, session_id):
+    # As in streamlit_app: the stream registers its open response with its own consumer.
+    consumer = StreamConsumer(open_stream(client, session_id, watch=lambda r: consumer.watch(r)))
+    return consumer.start()
+
+
+def inline(client, session_id, stop_at=None):
+    """Reads the stream in the calling thread; returns (blocked seconds, stop latency)."""
+    start = time.perf_counter()
+    stream = iter(open_stream(client, session_id))
+    for _ in stream:
+        if stop_at is not None and time.perf_counter() - start >= stop_at:
+            break  # the stop flag, seen only when an event arrives
+    stream.close()
+    blocked = time.perf_counter() - start
+    return blocked, (blocked - stop_at if stop_at is not None else None)
+
+
+def consumed(client, session_id, stop_at=None):
+    """Reads the stream on a StreamConsumer; returns (blocked seconds, stop latency)."""
+    start = time.perf_counter()
+    consumer = start_consumer(client, session_id)
+    blocked = time.perf_counter() - start
+    latency = None
+    if stop_at is not None:
+        time.sleep(max(0.0, stop_at - (time.perf_counter() - start)))
+        requested = time.perf_counter()
+        consumer.cancel()
+        consumer.join()
+        latency = time.perf_counter() - requested
+    else:
+        consumer.join()
+    return blocked, latency
+
+
+def concurrent(client, streams, interval):
+    consumers = [start_consumer(client, f"s_many_{i}") for i in range(streams)]
+    start = time.perf_counter()
+    events = [0] * streams
+    slowest_frame = 0.0
+    while not all(consumer.done for consumer in consumers):
+        frame_start = time.perf_counter()
+        for i, consumer in enumerate(consumers):
+            for kind, value in consumer.poll():
+                if kind == ITEM:
+                    events[i] += 1
+                elif kind == DONE and value is not None:
+                    raise value
+        slowest_frame = max(slowest_frame, time.perf_counter() - frame_start)
+        time.sleep(interval)
+    return time.perf_counter() - start, slowest_frame, events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--partials", type=int, default=50)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--tool-delay", type=float, default=1.0)
+    parser.add_argument("--interval", type=float, default=0.05, help="UI frame interval in seconds")
+    args = parser.parse_args()
+
+    server = start_stub_server(partials=args.partials, token_delay=args.token_delay, tool_delay=args.tool_delay)
+    client = ADKClient(server.base_url)
+    stop_at = args.tool_delay / 2  # the stub's answer opens with the tool call, silent until its result
+    try:
+        print(f"answers of {args.partials + 4} events, tool silent for {args.tool_delay:g}s")
+        print(f"  {'reader':<16} {'caller blocked':>15} {'stop latency':>13}")
+        for label, read in [("inline", inline), ("StreamConsumer", consumed)]:
+            blocked, _ = read(client, "s_hold")
+            _, latency = read(client, "s_stop", stop_at=stop_at)
+            print(f"  {label:<16} {blocked * 1000:>12.1f} ms {latency * 1000:>10.1f} ms")
+
+        wall, slowest, events = concurrent(client, args.streams, args.interval)
+        expected = args.partials + 4
+        print(f"{args.streams} concurrent answers, one poll loop every {args.interval * 1000:.0f}ms: "
+              f"{wall:.2f}s wall, slowest frame {slowest * 1000:.2f}ms, "
+              f"{sum(e == expected for e in events)}/{args.streams} complete")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
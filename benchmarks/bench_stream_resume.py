@@ -0,0 +1,96 @@
+"""Benchmark: recovering a /run_sse stream that drops mid-answer, resume vs asking again.
+
+Against the local stub server, each stream's connection is reset after `--drop-after`
+events. The answer is then completed two ways: with adk_client.resume.ResumableStream,
+which reconnects with Last-Event-ID and drops replayed events by id, and by asking the
+question again from scratch (tool call included), which is what the Streamlit app did
+before. Reports time to the complete answer, events received and duplicates passed on.
+Reconnect backoff is disabled so only the recovery itself is timed.
+
+Run from the repository root:
+    python -m benchmarks.bench_stream_resume --tool-delay 0.5 --partials 50
+"""
+import argparse
+import itertools
+import statistics
+import time
+
+import requests
+
+from adk_client.client import ADKClient
+from adk_client.resume import ResumableStream, sse_json_events
+from benchmarks.stub_server import start_stub_server
+
+questions = (f"weather in new york #{i}" for i in itertools.count())
+
+
+def stream(client, question, last_event_id=None):
+    headers = {"Accept": "text/event-stream"}
+    if last_event_id:
+        headers["Last-Event-ID"] = str(last_event_id)
+    params = {"session_id": "s_bench", "question": question, "streaming": "true"}
+    with client.get("/run_sse", headers=headers, params=params, stream=True) as r:
+        r.raise_for_status()
+        yield from sse_json_events(r.iter_content(chunk_size=None), typed=False)
+
+
+def resumed(client):
+    question = next(questions)
+    resumable = ResumableStream(lambda last_event_id, attempt: stream(client, question, last_event_id),
+                                sleep=lambda seconds: None)
+    events = [event for _, event in resumable]
+    return events, resumable.reconnects
+
+
+def asked_again(client):
+    question = next(questions)
+    events = []
+    try:
+        events.extend(event for _, event in stream(client, question))
+    except requests.exceptions.ChunkedEncodingError:
+        # Start over: the partial answer is thrown away and the turn runs again.
+        events.extend(event for _, event in stream(client, question))
+    return events, 1
+
+
+def measure(client, iterations, recover):
+    samples = []
+    received = duplicates = reconnects = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        events, count = recover(client)
+        samples.append((time.perf_counter() - start) * 1000)
+        ids = [event["id"] for event in events]
+        received += len(ids)
+        duplicates += len(ids) - len(set(ids))
+        reconnects += count
+        assert events[-1]["event"] == "end", events[-1]
+    return statistics.fmean(samples), received / iterations, duplicates, reconnects
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--partials", type=int, default=50)
+    parser.add_argument("--tool-delay", type=float, default=0.5)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--drop-after", type=int, default=40)
+    args = parser.parse_args()
+
+    server = start_stub_server(partials=args.partials, tool_delay=args.tool_delay,
+                               token_delay=args.token_delay, drop_after=args.drop_after)
+    client = ADKClient(f"http://127.0.0.1:{server.server_address[1]}")
+    try:
+        print(f"stream reset after {args.drop_after} of {args.partials + 4} events, "
+              f"tool delay {args.tool_delay:g}s, {args.iterations} answers")
+        print(f"  {'recovery':<20} {'mean ms':>9} {'events/answer':>13} {'duplicates':>10} {'reconnects':>10}")
+        for label, recover in [("Last-Event-ID resume", resumed), ("ask again", asked_again)]:
+            mean, received, duplicates, reconnects = measure(client, args.iterations, recover)
+            print(f"  {label:<20} {mean:>9.1f} {received:>13.1f} {duplicates:>10} {reconnects:>10}")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
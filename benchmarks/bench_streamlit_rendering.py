@@ -0,0 +1,91 @@
+"""Benchmark: re-renders per response and CPU for per-event st.rerun() vs the fragment loop.
+
+Streamlit itself is not needed. A "rerun" is modelled as what the app used to do per event:
+rebuild and serialize the display text of every message in the chat history. The app now
+draws the in-flight message from a fragment that runs every render interval
+(streamlit_app.show_active_stream): each run drains the events queued since the last one,
+at most MAX_EVENTS_PER_FRAME, and rebuilds and serializes only that message, whether events
+arrived or not. Events are replayed on a simulated clock at a fixed token rate, so frame
+counts are deterministic and the CPU figure (process time) measures rendering work only,
+without sleeping.
+
+Run from the repository root:
+    python -m benchmarks.bench_streamlit_rendering --history 40 --tokens 600 --rate 100
+"""
+import argparse
+import time
+
+# As in streamlit_app.
+MIN_RENDER_INTERVAL_SECONDS = 0.01
+MAX_EVENTS_PER_FRAME = 500
+
+
+def make_message(n_tokens):
+    text = "".join(f"word{i} " for i in range(n_tokens))
+    return {"role": "assistant", "utterances": {"utterance_1": {"text": text}}}
+
+
+def render_message(entry):
+    # Mirrors streamlit_app.build_display_text plus the markdown payload Streamlit serializes.
+    text = "".join(entry["utterances"][k]["text"] for k in sorted(entry["utterances"]))
+    return len(text.encode("utf-8"))
+
+
+def replay(history, n_tokens, rate, interval):
+    """Streams n_tokens partials into a new message. interval=None means rerun per event,
+    else a fragment run every interval seconds."""
+    entry = {"role": "assistant", "utterances": {"utterance_1": {"text": ""}}}
+    messages = history + [entry]
+    renders = 0
+    start = time.process_time()
+    text = ""
+    if interval is None:
+        for i in range(n_tokens):
+            text += f"word{i} "
+            entry["utterances"]["utterance_1"]["text"] = text  # cumulative partial, as in the app
+            for message in messages:
+                render_message(message)
+            renders += 1
+    else:
+        interval = max(interval, MIN_RENDER_INTERVAL_SECONDS)
+        arrived = 0  # events applied so far; event i arrives at (i + 1) / rate
+        fragment_run = 0
+        while arrived < n_tokens:
+            fragment_run += 1
+            now = fragment_run * interval
+            drained = 0
+            while arrived < n_tokens and (arrived + 1) / rate <= now and drained < MAX_EVENTS_PER_FRAME:
+                text += f"word{arrived} "
+                arrived += 1
+                drained += 1
+            entry["utterances"]["utterance_1"]["text"] = text
+            render_message(entry)
+            renders += 1
+    # Final redraw: one rerun of the whole page in both modes.
+    for message in messages:
+        render_message(message)
+    renders += 1
+    return renders, time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=40, help="Messages already in the chat")
+    parser.add_argument("--history-tokens", type=int, default=400, help="Tokens per history message")
+    parser.add_argument("--tokens", type=int, default=600, help="Partial events in the streamed answer")
+    parser.add_argument("--rate", type=float, default=100.0, help="Partial events per second")
+    parser.add_argument("--intervals-ms", type=float, nargs="+", default=[10, 50, 100])
+    args = parser.parse_args()
+
+    history = [make_message(args.history_tokens) for _ in range(args.history)]
+    print(f"{args.history} history messages, {args.tokens} partials at {args.rate:g}/s")
+    print(f"{'mode':<26} {'renders/response':>17} {'cpu ms':>9}")
+    renders, cpu = replay(history, args.tokens, args.rate, None)
+    print(f"{'st.rerun() per event':<26} {renders:>17} {cpu * 1000:>9.1f}")
+    for interval_ms in args.intervals_ms:
+        renders, cpu = replay(history, args.tokens, args.rate, interval_ms / 1000)
+        print(f"{f'fragment every {interval_ms:g} ms':<26} {renders:>17} {cpu * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
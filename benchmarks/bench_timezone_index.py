@@ -0,0 +1,107 @@
+"""Benchmark: city -> time zone lookups as the city table grows.
+
+Builds tables of increasing size (the bundled cities plus synthetic ones), then times
+`--lookups` random lookups through CityTimezoneIndex and through a linear scan of
+(name, zone) pairs, the natural extension of the old if/elif branch. Also times the
+get_current_time tool itself (uncached) over the bundled cities, with memoized ZoneInfo
+objects vs a new ZoneInfo per call, and the one-off cost of loading the bundled index.
+
+Run from the repository root:
+    python -m benchmarks.bench_timezone_index --lookups 10000
+"""
+import argparse
+import datetime
+import random
+import time
+from zoneinfo import ZoneInfo
+
+from multi_tool_agent import agent, timezones
+from multi_tool_agent.timezones import CityTimezoneIndex
+
+
+def bundled_rows():
+    rows = []
+    with open(timezones.TIMEZONE_DATA_PATH, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                zone, names = line.rstrip("\n").split("\t", 1)
+                rows.append((zone, names.split("|")))
+    return rows
+
+
+def build_table(rows, size):
+    """(zone, [name]) rows padded with synthetic cities up to `size` names."""
+    rows = list(rows)
+    zones = [zone for zone, _ in rows]
+    count = sum(len(names) for _, names in rows)
+    i = 0
+    while count < size:
+        rows.append((zones[i % len(zones)], [f"Synthetic City {i}"]))
+        count += 1
+        i += 1
+    return rows
+
+
+def linear_lookup(pairs, city):
+    key = city.strip().lower()
+    for name, zone in pairs:
+        if name == key:
+            return zone
+    return None
+
+
+def time_lookups(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def current_time_fresh_zoneinfo(city):
+    # get_current_time as before: a new ZoneInfo per call (cache cleared to defeat ZoneInfo's own).
+    _, zone = timezones.lookup_city(city)
+    ZoneInfo.clear_cache()
+    return datetime.datetime.now(ZoneInfo(zone))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=10000)
+    parser.add_argument("--sizes", default="50000,100000,200000", help="Comma-separated table sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    rows = bundled_rows()
+
+    start = time.perf_counter()
+    index = CityTimezoneIndex.from_file(timezones.TIMEZONE_DATA_PATH)
+    print(f"bundled index: {len(index)} names, loaded in {(time.perf_counter() - start) * 1e3:.2f}ms")
+
+    print(f"{args.lookups} lookups per table size, mean per lookup")
+    print(f"  {'names':>8} {'index':>10} {'linear scan':>12}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        table = build_table(rows, size)
+        index = CityTimezoneIndex()
+        pairs = []
+        for zone, names in table:
+            index.add(zone, names)
+            pairs.extend((name.lower(), zone) for name in names)
+        names = [name for _, row_names in table for name in row_names]
+        queries = [rng.choice(names) for _ in range(args.lookups)]
+        indexed = time_lookups(index.lookup, queries)
+        linear_queries = queries[: max(1, min(args.lookups, 2_000_000 // len(pairs)))]
+        linear = time_lookups(lambda q: linear_lookup(pairs, q), linear_queries)
+        print(f"  {len(index):>8} {indexed * 1e6:>8.2f}us {linear * 1e6:>10.1f}us")
+
+    cities = [names[0] for _, names in rows]
+    queries = [rng.choice(cities) for _ in range(args.lookups)]
+    tool = agent.get_current_time.__wrapped__
+    print(f"get_current_time over {len(cities)} bundled cities, {args.lookups} calls, mean per call")
+    print(f"  {'memoized zone_info':<24} {time_lookups(tool, queries) * 1e6:>8.2f}us")
+    print(f"  {'new ZoneInfo per call':<24} {time_lookups(current_time_fresh_zoneinfo, queries) * 1e6:>8.2f}us")
+    assert all(tool(city)["status"] == "success" for city in cities)
+    assert all(index.lookup(city) for city in cities)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark: repeated and concurrent tool calls with and without the tool result cache.
+
+Calls slow_get_weather for the same city in different spellings ("New York", "new york",
+"  NEW   YORK ") one after another, then as a burst of concurrent first calls, and compares
+the uncached tool (`__wrapped__`) with the cached one. Prints the cache counters at the end.
+
+Run from the repository root:
+    python -m benchmarks.bench_tool_cache --calls 20 --delay 5
+"""
+import argparse
+import asyncio
+import time
+
+from multi_tool_agent import agent
+from multi_tool_agent.tool_cache import cache_stats
+
+SPELLINGS = ("New York", "new york", "  NEW   YORK ", "New york")
+
+
+async def _sequential(tool, calls):
+    durations = []
+    for i in range(calls):
+        start = time.perf_counter()
+        result = await tool(SPELLINGS[i % len(SPELLINGS)])
+        durations.append(time.perf_counter() - start)
+        assert result["status"] == "success"
+    return durations
+
+
+async def _burst(tool, calls):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(tool(SPELLINGS[i % len(SPELLINGS)]) for i in range(calls)))
+    assert all(r["status"] == "success" for r in results)
+    return time.perf_counter() - start
+
+
+def _fmt(seconds):
+    if seconds >= 0.1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20, help="Calls per scenario")
+    parser.add_argument("--delay", type=float, default=agent.SLOW_WEATHER_DELAY_SECONDS,
+                        help="Tool delay in seconds (default: the tool's own delay)")
+    parser.add_argument("--skip-uncached", action="store_true",
+                        help="Skip the uncached sequential run, which takes calls x delay seconds")
+    args = parser.parse_args()
+
+    agent.SLOW_WEATHER_DELAY_SECONDS = args.delay
+    cached = agent.slow_get_weather
+    uncached = cached.__wrapped__
+    print(f"slow_get_weather, {args.calls} calls, tool delay {args.delay:.2f}s")
+
+    if not args.skip_uncached:
+        durations = asyncio.run(_sequential(uncached, args.calls))
+        print(f"  {'uncached, sequential':<28} total {_fmt(sum(durations)):>9}  per call {_fmt(sum(durations) / len(durations)):>9}")
+
+    cached.cache.clear()
+    durations = asyncio.run(_sequential(cached, args.calls))
+    repeats = durations[1:] or [0.0]
+    print(f"  {'cached, sequential':<28} total {_fmt(sum(durations)):>9}  first {_fmt(durations[0]):>9}  "
+          f"repeat median {_fmt(sorted(repeats)[len(repeats) // 2]):>9}  max {_fmt(max(repeats)):>9}")
+
+    for label, tool in (("uncached, concurrent burst", uncached), ("cached, concurrent burst", cached)):
+        cached.cache.clear()
+        misses = cached.cache.misses
+        elapsed = asyncio.run(_burst(tool, args.calls))
+        runs = args.calls if tool is uncached else cached.cache.misses - misses
+        print(f"  {label:<28} total {_fmt(elapsed):>9}  tool ran {runs} time(s)")
+
+    print("cache stats:")
+    for name, stats in cache_stats().items():
+        print(f"  {name:<18} " + "  ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
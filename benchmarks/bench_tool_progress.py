@@ -0,0 +1,91 @@
+"""Timing check: gap before the first event after a slow tool call, with and without progress events.
+
+Runs root_agent through a real ADK InMemoryRunner (the event stream /run_sse forwards), with
+a MockLlm that calls slow_get_weather("New York") and then answers. For the ProgressAgent
+root_agent and for a plain LlmAgent with the same tools, measures the time from the function
+call event to the next event, and to the function response.
+
+Exits non-zero unless, with progress, the first event after the call arrives within
+`--max-feedback` seconds while the tool itself still takes about `--delay` seconds.
+
+Run from the repository root:
+    python -m benchmarks.bench_tool_progress --delay 5
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from multi_tool_agent import agent
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.tool_cache import TOOL_CACHES
+
+
+async def time_slow_call(root):
+    runner = InMemoryRunner(agent=root, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text="get slow weather for new york")])
+    called = first_after_call = responded = None
+    progress_events = 0
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        now = time.perf_counter()
+        if called is not None and first_after_call is None:
+            first_after_call = now
+        if event.get_function_calls():
+            called = now
+        if event.get_function_responses():
+            responded = now
+        if event.custom_metadata and "progress" in event.custom_metadata:
+            progress_events += 1
+    return first_after_call - called, responded - called, progress_events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=agent.SLOW_WEATHER_DELAY_SECONDS)
+    parser.add_argument("--interval", type=float, default=agent.SLOW_WEATHER_PROGRESS_INTERVAL_SECONDS)
+    parser.add_argument("--max-feedback", type=float, default=1.0,
+                        help="Seconds allowed between the call and the first progress event")
+    args = parser.parse_args()
+
+    agent.SLOW_WEATHER_DELAY_SECONDS = args.delay
+    agent.SLOW_WEATHER_PROGRESS_INTERVAL_SECONDS = args.interval
+
+    def model():
+        return MockLlm(script=[[("slow_get_weather", {"city": "New York"})]],
+                           final_text="The weather in New York is sunny.")
+
+    variants = [
+        ("ProgressAgent (root_agent)", agent.root_agent.clone(update={"model": model()})),
+        ("plain LlmAgent", LlmAgent(name="plain_agent", model=model(), tools=agent.root_agent.tools)),
+    ]
+    print(f"slow_get_weather, delay {args.delay:g}s, progress every {args.interval:g}s")
+    print(f"  {'agent':<28} {'call -> next event':>18} {'call -> result':>14} {'progress events':>15}")
+    results = {}
+    for label, root in variants:
+        for cache in TOOL_CACHES.values():
+            cache.clear()
+        results[label] = feedback, result, progress = asyncio.run(time_slow_call(root))
+        print(f"  {label:<28} {feedback:>17.3f}s {result:>13.3f}s {progress:>15}")
+
+    feedback, result, progress = results["ProgressAgent (root_agent)"]
+    failures = []
+    if feedback > args.max_feedback:
+        failures.append(f"first event after the call took {feedback:.3f}s (> {args.max_feedback:g}s)")
+    if progress < 1:
+        failures.append("no progress events were streamed")
+    if result < args.delay * 0.9:
+        failures.append(f"tool returned after {result:.3f}s, expected about {args.delay:g}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: progress reached the stream within the feedback budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Asyncio load generator for the api_server serving multi_tool_agent.
+
+Opens `--sessions` sessions through /apps/{app}/users/{user}/sessions/{id}, then replays a
+weighted query mix against /run and /run_sse, either closed-loop at a fixed concurrency or
+open-loop at a target request rate. SSE bodies are consumed as they arrive and decoded with
+adk_client.sse and adk_client.json_backend, so a slow stream never blocks the others. Each
+session serves one request at a time, as ADK sessions are sequential.
+
+Reports throughput and latency percentiles: time to first event, time to first text part,
+and end-to-end latency.
+
+Against a running server:
+    python -m benchmarks.load_test --url http://localhost:8000 --requests 200 --concurrency 20
+Offline, against the local stub server:
+    python -m benchmarks.load_test --stub --requests 500 --concurrency 50
+    python -m benchmarks.load_test --stub --rate 100 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+import httpx
+
+from adk_client.client import JSON_HEADERS, SSE_HEADERS, run_payload
+from adk_client.events import PartialText
+from adk_client.json_backend import EventDecoder
+from adk_client.sse import SSEDecoder
+
+DEFAULT_MIX = [
+    # (weight, endpoint, query)
+    (6, "/run_sse", "weather in new york"),
+    (2, "/run", "weather in new york"),
+    (1, "/run_sse", "what time is it in new york"),
+    (1, "/run_sse", "get slow weather for new york"),
+]
+
+decode_event = EventDecoder()  # JSON backend from ADK_CLIENT_JSON_BACKEND, else the fastest installed
+
+
+class Sample:
+    __slots__ = ("endpoint", "ok", "status", "start", "first_event", "first_text", "end", "events", "error")
+
+    def __init__(self, endpoint, start):
+        self.endpoint = endpoint
+        self.start = start
+        self.ok = False
+        self.status = None
+        self.first_event = None
+        self.first_text = None
+        self.end = None
+        self.events = 0
+        self.error = None
+
+
+def has_text(event):
+    if isinstance(event, PartialText):
+        return bool(event.text)
+    content = event.get("content") or {}
+    return any(isinstance(part, dict) and part.get("text") for part in content.get("parts") or [])
+
+
+def load_mix(path):
+    """Reads a query mix from a JSON file: [{"weight": 3, "endpoint": "/run_sse", "query": "..."}]."""
+    with open(path) as f:
+        return [(item.get("weight", 1), item.get("endpoint", "/run_sse"), item["query"]) for item in json.load(f)]
+
+
+async def create_sessions(client, app, user, count):
+    session_ids = [f"s_load_{uuid.uuid4().hex[:12]}" for _ in range(count)]
+
+    async def create(session_id):
+        response = await client.post(f"/apps/{app}/users/{user}/sessions/{session_id}",
+                                     headers=JSON_HEADERS, json={"state": {}})
+        if response.status_code == 400 and "Session already exists" in response.text:
+            return
+        response.raise_for_status()
+
+    await asyncio.gather(*(create(session_id) for session_id in session_ids))
+    return session_ids
+
+
+async def issue(client, app, user, session_id, endpoint, query):
+    sample = Sample(endpoint, time.perf_counter())
+    try:
+        if endpoint == "/run":
+            response = await client.post("/run", headers=JSON_HEADERS,
+                                         json=run_payload(app, user, session_id, query))
+            sample.status = response.status_code
+            response.raise_for_status()
+            events = response.json()
+            sample.events = len(events)
+            sample.first_event = sample.first_text = time.perf_counter()
+        else:
+            payload = run_payload(app, user, session_id, query, streaming=True)
+            async with client.stream("POST", "/run_sse", headers=SSE_HEADERS, json=payload) as response:
+                sample.status = response.status_code
+                response.raise_for_status()
+                decoder = SSEDecoder(raw=True)
+                # aiter_bytes undoes the Content-Encoding (SSE_HEADERS accept gzip, which
+                # api_server.py applies by default).
+                async for chunk in response.aiter_bytes():
+                    for sse_event in decoder.feed(chunk):
+                        _record_event(sample, sse_event)
+                for sse_event in decoder.close():
+                    _record_event(sample, sse_event)
+            if not sample.events:
+                raise ValueError("no events in the /run_sse response")
+        sample.ok = True
+    except (httpx.HTTPError, ValueError) as e:
+        sample.error = f"{type(e).__name__}: {e}"
+    sample.end = time.perf_counter()
+    return sample
+
+
+def _record_event(sample, sse_event):
+    now = time.perf_counter()
+    sample.events += 1
+    if sample.first_event is None:
+        sample.first_event = now
+    if sample.first_text is None and sse_event.data:
+        try:
+            if has_text(decode_event(sse_event.data)):
+                sample.first_text = now
+        except ValueError:
+            pass
+
+
+async def run_load(url, app, user, sessions, mix, requests_total=None, concurrency=10,
+                   rate=None, duration=None, timeout=300.0, seed=0):
+    """Runs the load test and returns (samples, wall_seconds).
+
+    Closed loop (rate=None): `concurrency` workers each issue requests back to back until
+    `requests_total` have been sent. Open loop: requests start at `rate` per second for
+    `duration` seconds (or until `requests_total`), with at most `concurrency` in flight.
+    """
+    rng = random.Random(seed)
+    weights = [w for w, _, _ in mix]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+        session_ids = await create_sessions(client, app, user, sessions)
+        idle_sessions = asyncio.Queue()
+        for session_id in session_ids:
+            idle_sessions.put_nowait(session_id)
+        samples = []
+
+        async def one_request():
+            _, endpoint, query = rng.choices(mix, weights)[0]
+            session_id = await idle_sessions.get()
+            try:
+                samples.append(await issue(client, app, user, session_id, endpoint, query))
+            finally:
+                idle_sessions.put_nowait(session_id)
+
+        start = time.perf_counter()
+        if rate is None:
+            remaining = [requests_total]
+
+            async def worker():
+                while remaining[0] > 0:
+                    remaining[0] -= 1
+                    await one_request()
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            in_flight = asyncio.Semaphore(concurrency)
+            tasks = []
+            sent = 0
+            interval = 1.0 / rate
+
+            async def limited():
+                async with in_flight:
+                    await one_request()
+
+            while True:
+                elapsed = time.perf_counter() - start
+                if duration is not None and elapsed >= duration:
+                    break
+                if requests_total is not None and sent >= requests_total:
+                    break
+                tasks.append(asyncio.create_task(limited()))
+                sent += 1
+                await asyncio.sleep(max(0.0, start + sent * interval - time.perf_counter()))
+            await asyncio.gather(*tasks)
+        return samples, time.perf_counter() - start
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float("nan")
+    rank = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(samples, wall_seconds):
+    ok = [s for s in samples if s.ok]
+    metrics = {
+        "time_to_first_event": [s.first_event - s.start for s in ok if s.first_event is not None],
+        "time_to_first_text": [s.first_text - s.start for s in ok if s.first_text is not None],
+        "end_to_end": [s.end - s.start for s in ok],
+    }
+    summary = {
+        "requests": len(samples),
+        "errors": len(samples) - len(ok),
+        "wall_seconds": wall_seconds,
+        "throughput_rps": len(ok) / wall_seconds if wall_seconds else 0.0,
+        "events": sum(s.events for s in ok),
+        "by_endpoint": {},
+    }
+    for endpoint in sorted({s.endpoint for s in samples}):
+        summary["by_endpoint"][endpoint] = sum(1 for s in samples if s.endpoint == endpoint)
+    for name, values in metrics.items():
+        values.sort()
+        summary[name] = {f"p{p}": percentile(values, p) for p in (50, 90, 95, 99)}
+        summary[name]["max"] = values[-1] if values else float("nan")
+    errors = sorted({s.error for s in samples if s.error})
+    if errors:
+        summary["error_kinds"] = errors[:10]
+    return summary
+
+
+def print_summary(summary):
+    print(f"requests: {summary['requests']}  errors: {summary['errors']}  "
+          f"wall: {summary['wall_seconds']:.2f}s  throughput: {summary['throughput_rps']:.1f} req/s  "
+          f"events: {summary['events']}")
+    print("  by endpoint: " + ", ".join(f"{k}={v}" for k, v in summary["by_endpoint"].items()))
+    print(f"  {'latency (ms)':<22} {'p50':>9} {'p90':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for name in ("time_to_first_event", "time_to_first_text", "end_to_end"):
+        row = summary[name]
+        print(f"  {name:<22} " + " ".join(f"{row[k] * 1000:>9.1f}" for k in ("p50", "p90", "p95", "p99", "max")))
+    for error in summary.get("error_kinds", []):
+        print(f"  error: {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--stub", action="store_true",
+                        help="Start benchmarks.stub_server in-process and target it (no model, no network)")
+    parser.add_argument("--app", default="multi_tool_agent")
+    parser.add_argument("--user", default="u_load_test")
+    parser.add_argument("--sessions", type=int, default=None, help="Sessions to open (default: concurrency)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=None, help="Total requests (default 100 in closed loop)")
+    parser.add_argument("--rate", type=float, default=None, help="Open loop: requests started per second")
+    parser.add_argument("--duration", type=float, default=None, help="Open loop: seconds to keep sending")
+    parser.add_argument("--mix", help="JSON file with the query mix (default: built-in weather/time mix)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_out", help="Also write the summary to this JSON file")
+    parser.add_argument("--stub-partials", type=int, default=20)
+    parser.add_argument("--stub-token-delay", type=float, default=0.005)
+    parser.add_argument("--stub-tool-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.rate is None and args.requests is None:
+        args.requests = 100
+    if args.rate is not None and args.requests is None and args.duration is None:
+        parser.error("--rate needs --duration or --requests")
+    sessions = args.sessions or args.concurrency
+
+    server = None
+    url = args.url
+    if args.stub:
+        from benchmarks.stub_server import start_stub_server
+        server = start_stub_server(partials=args.stub_partials, token_delay=args.stub_token_delay,
+                                   tool_delay=args.stub_tool_delay)
+        url = server.base_url
+    try:
+        samples, wall = asyncio.run(run_load(
+            url, args.app, args.user, sessions, load_mix(args.mix) if args.mix else DEFAULT_MIX,
+            requests_total=args.requests, concurrency=args.concurrency, rate=args.rate,
+            duration=args.duration, timeout=args.timeout, seed=args.seed))
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    summary = summarize(samples, wall)
+    print(f"target: {url}  sessions: {sessions}  concurrency: {args.concurrency}"
+          + (f"  rate: {args.rate:g}/s" if args.rate else ""))
+    print_summary(summary)
+    if args.json_out:
+        with open(args.json_out, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Local stand-in for `adk api_server`, for offline benchmarks of the client side.
+
+Serves the endpoints the clients in this repo call, with canned events instead of a model:
+    POST /apps/{app}/users/{user}/sessions/{id}   session create ("Session already exists" on repeat)
+    GET  /apps/{app}/users/{user}/sessions/{id}   session with the non-partial events sent so far
+    DELETE /apps/{app}/users/{user}/sessions/{id}  session delete
+    POST /run                                      JSON list of ADK events
+    POST /run_sse                                  ADK events as SSE (chunked, keep-alive)
+    POST /session, GET /run_sse                    the speak/tool_code/tool_result protocol used by streamlit_app.py
+
+A turn is: `partials` partial-text events `token_delay` seconds apart, a get_weather function
+call and response (with `tool_delay` between them), then the final text event. With
+`progress_interval` set, tool progress events are sent during the tool delay, at the call and
+then every interval, as multi_tool_agent.progress does. Creating a session (either protocol)
+takes `session_delay` seconds, standing in for a persistent session store.
+
+`drop_after` cuts the connection of each new stream after that many events (mid-chunk, like
+a proxy reset), to exercise client reconnects. GET /run_sse resumes a turn from
+`Last-Event-ID`: asking the same question again with the id of one of its events replays
+the events after it instead of starting a new turn.
+
+Run standalone (then point the clients at http://localhost:8000):
+    python -m benchmarks.stub_server --port 8000 --partials 40 --token-delay 0.02
+"""
+import argparse
+import itertools
+import json
+import re
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_SESSION_PATH = re.compile(r"^/apps/([^/]+)/users/([^/]+)/sessions/([^/]+)$")
+
+AGENT_NAME = "weather_time_agent"
+WEATHER_RESULT = {
+    "status": "success",
+    "report": "The weather in New York is sunny with a temperature of 25 degrees Celsius (77 degrees Fahrenheit).",
+}
+
+
+def _tool_progress(tool_delay, progress_interval):
+    """Yields (delay_before, message) progress updates during a tool call, then (rest of delay, None)."""
+    waited = 0.0
+    if progress_interval:
+        yield 0.0, "Fetching the weather for New York..."
+        while tool_delay - waited > progress_interval:
+            waited += progress_interval
+            yield progress_interval, f"Still fetching the weather for New York ({waited:.1f}s of {tool_delay:g}s)"
+    yield tool_delay - waited, None
+
+
+def _progress_count(tool_delay, progress_interval):
+    return sum(1 for _, message in _tool_progress(tool_delay, progress_interval) if message is not None)
+
+
+def adk_turn_events(partials=20, tool_delay=0.0, token_delay=0.0, progress_interval=0.0):
+    """Yields (delay_before, event_dict) pairs shaped like ADK's Event JSON on /run_sse."""
+    invocation_id = f"e-{uuid.uuid4()}"
+    call_id = f"adk-{uuid.uuid4()}"
+
+    def event(parts, role="model", partial=None):
+        ev = {
+            "invocationId": invocation_id,
+            "author": AGENT_NAME,
+            "actions": {"stateDelta": {}, "artifactDelta": {}, "requestedAuthConfigs": {}},
+            "id": str(uuid.uuid4()),
+            "timestamp": time.time(),
+        }
+        if parts is not None:
+            ev["content"] = {"parts": parts, "role": role}
+        if partial is not None:
+            ev["partial"] = partial
+        return ev
+
+    yield 0.0, event([{"functionCall": {"id": call_id, "args": {"city": "New York"}, "name": "get_weather"}}])
+    for delay, message in _tool_progress(tool_delay, progress_interval):
+        if message is None:
+            yield delay, event(
+                [{"functionResponse": {"id": call_id, "name": "get_weather", "response": WEATHER_RESULT}}], role="user")
+        else:
+            progress = event(None, partial=True)
+            progress["customMetadata"] = {"progress": {"tool": "get_weather", "message": message}}
+            yield delay, progress
+    words = [f"word{i} " for i in range(partials)]
+    for word in words:
+        yield token_delay, event([{"text": word}], partial=True)
+    yield 0.0, event([{"text": "".join(words)}])
+
+
+def speak_turn_events(partials=20, tool_delay=0.0, token_delay=0.0, progress_interval=0.0, first_id=1):
+    """Yields (delay_before, event_dict) pairs in the speak/tool_code protocol streamlit_app.py reads."""
+    ids = itertools.count(first_id)
+    yield 0.0, {"id": next(ids), "event": "tool_code", "data": {
+        "tool_name": "get_weather", "tool_input": '{"city": "New York"}', "utterance_id": "utterance_1"}}
+    for delay, message in _tool_progress(tool_delay, progress_interval):
+        if message is None:
+            yield delay, {"id": next(ids), "event": "tool_result", "data": {
+                "tool_name": "get_weather", "tool_output": json.dumps(WEATHER_RESULT), "utterance_id": "utterance_1"}}
+        else:
+            yield delay, {"id": next(ids), "event": "progress", "data": {
+                "tool_name": "get_weather", "message": message, "utterance_id": "utterance_1"}}
+    text = ""
+    for i in range(partials):
+        text += f"word{i} "
+        yield token_delay, {"id": next(ids), "event": "speak", "data": {
+            "text": text, "partial": True, "utterance_id": "utterance_2"}}
+    yield 0.0, {"id": next(ids), "event": "speak", "data": {
+        "text": text, "partial": False, "utterance_id": "utterance_2"}}
+    yield 0.0, {"id": next(ids), "event": "end", "data": {}}
+
+
+class StubADKHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients can reuse connections
+    # Headers and body go out in separate writes; without this, Nagle plus delayed ACKs adds
+    # ~40 ms to every response on a reused connection (uvicorn sets TCP_NODELAY too).
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body) if body else {}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_sse(self, events, drop_after=None, on_event=None):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for index, (delay, event) in enumerate(events):
+            if delay:
+                time.sleep(delay)
+            data = f"data: {json.dumps(event)}\n\n".encode("utf-8")
+            if index == drop_after:
+                # Half a chunk, then a reset: the client sees a truncated chunked body.
+                self.wfile.write(b"%x\r\n%s" % (len(data), data[: len(data) // 2]))
+                self.wfile.flush()
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            if on_event is not None:
+                on_event(event)
+            try:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True  # the client went away (e.g. a stopped stream)
+                return
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _drop_once(self, key):
+        """drop_after for the first stream of `key`, None for its reconnects."""
+        server = self.server
+        if server.drop_after is None:
+            return None
+        with server.stats_lock:
+            if key in server.dropped:
+                return None
+            server.dropped.add(key)
+        return server.drop_after
+
+    def _turn_kwargs(self):
+        server = self.server
+        return {"partials": server.partials, "tool_delay": server.tool_delay, "token_delay": server.token_delay,
+                "progress_interval": server.progress_interval}
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        match = _SESSION_PATH.match(path)
+        if match:
+            self._read_json()
+            time.sleep(self.server.session_delay)
+            with self.server.stats_lock:
+                exists = match.groups() in self.server.sessions
+                self.server.sessions.add(match.groups())
+            if exists:
+                self._send_json(400, {"detail": f"Session already exists: {match.group(3)}"})
+            else:
+                app, user, session_id = match.groups()
+                self._send_json(200, {"id": session_id, "appName": app, "userId": user,
+                                      "state": {}, "events": [], "lastUpdateTime": time.time()})
+        elif path == "/run":
+            self._read_json()
+            events = [event for delay, event in adk_turn_events(**self._turn_kwargs())
+                      if not event.get("partial")]
+            self._send_json(200, events)
+        elif path == "/run_sse":
+            body = self._read_json()
+            key = (body.get("app_name"), body.get("user_id"), body.get("session_id"))
+            stored = self.server.session_events.setdefault(key, [])
+
+            def store(event):  # ADK stores non-partial events in the session as they are yielded
+                if not event.get("partial"):
+                    stored.append(event)
+
+            self._send_sse(adk_turn_events(**self._turn_kwargs()), self._drop_once(object()), store)
+        elif path == "/session":
+            self._read_json()
+            time.sleep(self.server.session_delay)
+            self._send_json(200, {"session_id": str(uuid.uuid4())})
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+    def do_GET(self):
+        split = urlsplit(self.path)
+        match = _SESSION_PATH.match(split.path)
+        if match:
+            app, user, session_id = match.groups()
+            self._send_json(200, {"id": session_id, "appName": app, "userId": user, "state": {},
+                                  "events": self.server.session_events.get(match.groups(), []),
+                                  "lastUpdateTime": time.time()})
+        elif split.path == "/run_sse":
+            query = parse_qs(split.query)
+            key = (query.get("session_id", [""])[0], query.get("question", [""])[0])
+            last_event_id = self.headers.get("Last-Event-ID")
+            server = self.server
+            with server.stats_lock:
+                first_id, count = server.speak_turns.get(key, (None, 0))
+                resume_from = None
+                if first_id is not None and last_event_id and last_event_id.isdigit() \
+                        and first_id <= int(last_event_id) < first_id + count:
+                    resume_from = int(last_event_id)
+                else:
+                    first_id = server.speak_next_id.get(key[0], 1)
+                    count = server.partials + 4 + _progress_count(server.tool_delay, server.progress_interval)
+                    server.speak_turns[key] = (first_id, count)
+                    server.speak_next_id[key[0]] = first_id + count
+            events = speak_turn_events(**self._turn_kwargs(), first_id=first_id)
+            if resume_from is not None:
+                events = ((0.0, event) for _, event in events if event["id"] > resume_from)
+                self._send_sse(events)
+            else:
+                self._send_sse(events, self._drop_once(key))
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+    def do_DELETE(self):
+        match = _SESSION_PATH.match(urlsplit(self.path).path)
+        if match:
+            with self.server.stats_lock:
+                self.server.sessions.discard(match.groups())
+                self.server.session_events.pop(match.groups(), None)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(404, {"detail": "Not Found"})
+
+
+class StubADKServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # listen backlog; the default of 5 resets bursts of new connections
+
+    def __init__(self, address, partials=20, tool_delay=0.0, token_delay=0.0, progress_interval=0.0,
+                 drop_after=None, session_delay=0.0):
+        super().__init__(address, StubADKHandler)
+        self.session_delay = session_delay
+        self.drop_after = drop_after
+        self.dropped = set()
+        self.session_events = {}  # (app, user, session id) -> stored ADK events
+        self.speak_turns = {}  # (session id, question) -> (first event id, event count)
+        self.speak_next_id = {}  # session id -> next event id
+        self.partials = partials
+        self.tool_delay = tool_delay
+        self.token_delay = token_delay
+        self.progress_interval = progress_interval
+        self.sessions = set()
+        self.connections = 0
+        self.stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(host="127.0.0.1", port=0, **turn_kwargs):
+    """Starts a StubADKServer on a background thread and returns it (call .shutdown() when done)."""
+    server = StubADKServer((host, port), **turn_kwargs)
+    threading.Thread(target=server.serve_forever, name="stub-adk-server", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--partials", type=int, default=20)
+    parser.add_argument("--tool-delay", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--progress-interval", type=float, default=0.0,
+                        help="Send tool progress events this often during the tool delay (0: none)")
+    parser.add_argument("--drop-after", type=int, default=None,
+                        help="Reset each new stream's connection after this many events")
+    parser.add_argument("--session-delay", type=float, default=0.0, help="Seconds to create a session")
+    args = parser.parse_args()
+    server = StubADKServer((args.host, args.port), partials=args.partials, tool_delay=args.tool_delay,
+                           token_delay=args.token_delay, progress_interval=args.progress_interval,
+                           drop_after=args.drop_after, session_delay=args.session_delay)
+    print(f"Stub ADK server on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
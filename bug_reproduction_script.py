@@ -1,17 +1,56 @@
 #%%
 import requests
+import argparse
 import json
+import os
+import queue
+import statistics
 import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from adk_client.client import DEFAULT_SERVER_URL, get_client
+from adk_client.events import PartialText, progress_of
+from adk_client.metrics import JsonlSink, LatencyHistogram, StreamTimer, format_record
+from adk_client.partials import DELTA, PartialMerger
+from adk_client.resume import ResumableStream, adk_run_sse
+from adk_client.session_pool import SessionPool, adk_session_factory
 
 # --- Global Variables for Session State ---
 global_agent_name = 'multi_tool_agent'
 global_user_id = 'u_interactive_test' 
 global_session_id = 's_interactive_test' # Initial session ID, Cell 1 can update this
 
-# --- Helper to print headers for common requests ---
-common_headers = {
-    "Content-Type": "application/json"
-}
+# --- Shared pooled HTTP client (keep-alive connections reused across all cells) ---
+http_client = get_client(DEFAULT_SERVER_URL)
+
+# --- Session pools per (agent, user): sessions are created in the background and handed out on demand ---
+session_pools = {}
+
+def session_pool_for(agent_name, user_id):
+    key = (agent_name, user_id)
+    if key not in session_pools:
+        create, delete = adk_session_factory(http_client, agent_name, user_id)
+        session_pools[key] = SessionPool(create, size=0, delete=delete) # Only named sessions are used here
+    return session_pools[key]
+
+# --- Stream timing: every streamed query is recorded in-process; set ADK_TIMINGS_JSONL to also export records ---
+timing_histogram = LatencyHistogram()
+timing_sinks = [timing_histogram]
+if os.environ.get("ADK_TIMINGS_JSONL"):
+    timing_sinks.append(JsonlSink(os.environ["ADK_TIMINGS_JSONL"]))
+
+def print_timing_summary():
+    """Prints the histogram of every stream timed so far: percentiles are bucket upper bounds."""
+    summary = timing_histogram.summary()
+    if not summary["total_ms"]["count"]:
+        print("No streams timed yet.")
+        return
+    print("Stream timings so far (p50/p90/p99 at most, in ms):")
+    for metric, row in summary.items():
+        if row["count"]:
+            print(f"  {metric:<17} n={row['count']:<5} " + " / ".join(f"{row[p]:g}" for p in ("p50", "p90", "p99")))
 
 # --- Cell 1: Create a New Session --- 
 def run_cell1():
@@ -22,28 +61,17 @@ def run_cell1():
     user_input = input(f"Enter User ID (default: {global_user_id}): ") or global_user_id
     session_input = input(f"Enter Session ID for new session (default: {global_session_id}): ") or global_session_id
 
-    url_create_session = f"http://localhost:8000/apps/{agent_input}/users/{user_input}/sessions/{session_input}"
-    data_create_session = {"state": {}}
-
     try:
-        response = requests.post(url_create_session, headers=common_headers, data=json.dumps(data_create_session))
-        if response.status_code == 400 and "Session already exists" in response.text:
+        # Returns at once if this session was reserved while the prompts above were shown
+        session = session_pool_for(agent_input, user_input).acquire(session_input)
+        if session.existed:
             print(f"Session '{session_input}' already exists. Using this existing session for subsequent operations.")
-            global_agent_name = agent_input
-            global_user_id = user_input
-            global_session_id = session_input
-            print(response.json())
-        elif response.ok:
-            # response.raise_for_status() # .ok already checks for < 400
-            print("New session creation successful:")
-            global_agent_name = agent_input
-            global_user_id = user_input
-            global_session_id = session_input
-            print(response.json())
         else:
-            response.raise_for_status() # For other errors > 400
-            print(f"New session creation returned: {response.status_code}")
-            print(response.text)
+            print("New session creation successful:")
+        global_agent_name = agent_input
+        global_user_id = user_input
+        global_session_id = session_input
+        print(session.response.json())
 
     except requests.exceptions.RequestException as e:
         print(f"Error creating/validating session: {e}")
@@ -58,15 +86,8 @@ def run_cell2():
     query_text_run = "weather in new york" # Preset query
     print(f"Using preset query: '{query_text_run}'")
 
-    url_run = "http://localhost:8000/run"
-    data_run = {
-        "app_name": global_agent_name,
-        "user_id": global_user_id,
-        "session_id": global_session_id,
-        "new_message": {"role": "user", "parts": [{"text": query_text_run}]}
-    }
     try:
-        response = requests.post(url_run, headers=common_headers, data=json.dumps(data_run))
+        response = http_client.run(global_agent_name, global_user_id, global_session_id, query_text_run)
         response.raise_for_status()
         print(f"Query response for '{query_text_run}' (using /run):")
         print(json.dumps(response.json(), indent=2))
@@ -83,130 +104,118 @@ def run_cell3():
     query_text_sse = "slow weather in new york" # Preset query
     print(f"'{query_text_sse}'")
     
-    url_sse = "http://localhost:8000/run_sse"
-    headers_sse = {**common_headers, "Accept": "text/event-stream"}
-    data_sse = {
-        "app_name": global_agent_name,
-        "user_id": global_user_id,
-        "session_id": global_session_id,
-        "new_message": {"role": "user", "parts": [{"text": query_text_sse}]},
-        "streaming": True
-    }
     try:
         print(f"Streaming full JSON response for '{query_text_sse}' (SSE enabled, to /run_sse):")
-        with requests.post(url_sse, headers=headers_sse, data=json.dumps(data_sse), stream=True) as response:
-            response.raise_for_status()
-            buffer = b''
-            for chunk in response.iter_content(chunk_size=None):
-                if not chunk: continue
-                buffer += chunk
-                while True:
-                    try: newline_pos = buffer.index(b'\n')
-                    except ValueError: break
-                    line_bytes = buffer[:newline_pos]
-                    buffer = buffer[newline_pos+1:]
-                    if not line_bytes.strip(): continue
-                    try: decoded_line = line_bytes.decode('utf-8')
-                    except UnicodeDecodeError: continue
-                    if decoded_line.startswith('data: '):
-                        json_str = decoded_line[len('data: '):].strip()
-                        if not json_str: continue
-                        try:
-                            event_data = json.loads(json_str)
-                            print(json.dumps(event_data, indent=2)) # Print full JSON event
-                        except json.JSONDecodeError:
-                            sys.stderr.write(f"[Error] JSONDecodeError for: {json_str}\n")
+        timer = StreamTimer("cell3", sinks=timing_sinks)
+        stream = open_adk_stream(query_text_sse, timer, typed=False) # Full dicts, partial events included
+        for sse_event, event_data in stream:
+            if event_data is None:
+                sys.stderr.write(f"[Error] JSONDecodeError for: {sse_event.text.strip()}\n")
+                continue
+            timer.observe(event_data)
+            print(json.dumps(event_data, indent=2)) # Print full JSON event
         sys.stdout.write("\n") # Ensure prompt is on new line after stream
         sys.stdout.flush()
+        print_resume_summary(stream)
+        print(f"[timing] {format_record(timer.finish())}")
     except requests.exceptions.RequestException as e:
         print(f"Error sending streaming SSE query to /run_sse: {e}")
         if hasattr(e, 'response') and e.response is not None:
             print(f"Response content: {e.response.text}")
     # print("--- Cell 3 End ---\n")
 
-# --- Cell 4: Stream and Print Only Text Parts from /run_sse (showing build-up) ---
-def run_cell4():
-    # print("--- Running Cell 4: Stream and Print Only Text Parts from /run_sse (showing build-up) ---")
-    # print(f"Using: Agent='{global_agent_name}', User='{global_user_id}', Session='{global_session_id}'")
-    query_text_sse_text_only = "weather in new york" # Preset query
-    print(f"'{query_text_sse_text_only}'")
+# --- Shared by Cells 3-5: open a /run_sse stream that survives dropped connections ---
+def open_adk_stream(query_text, timer, typed=True):
+    """Events of a /run_sse request. If the connection drops, the events the server stored for
+    the turn are recovered from the session (without re-sending the query) and deduplicated.
+    Partial text events come back as PartialText objects unless typed=False."""
+    def on_reconnect(attempt, delay, error):
+        sys.stdout.write(f"\n[reconnect] Stream dropped ({type(error).__name__}); "
+                         f"recovering stored events in {delay:.1f}s (attempt {attempt})\n")
+        sys.stdout.flush()
+
+    connect = adk_run_sse(http_client, global_agent_name, global_user_id, global_session_id,
+                          query_text, wrap_chunks=timer.chunks, typed=typed)
+    return ResumableStream(connect, on_reconnect=on_reconnect)
 
-    url_sse_text_only = "http://localhost:8000/run_sse"
-    headers_sse_text_only = {**common_headers, "Accept": "text/event-stream"}
-    data_sse_text_only = {
-        "app_name": global_agent_name,
-        "user_id": global_user_id,
-        "session_id": global_session_id,
-        "new_message": {"role": "user", "parts": [{"text": query_text_sse_text_only}]},
-        "streaming": True
-    }
+def print_resume_summary(stream):
+    if stream.reconnects:
+        print(f"[reconnect] {stream.reconnects} reconnect(s), {stream.duplicates} replayed event(s) skipped. "
+              "The query was not re-sent; a turn cut short by the drop is not re-run.")
+
+# --- Shared by Cells 4 and 5: stream one query and print only its text parts (showing build-up) ---
+def stream_text_parts(query_text, label):
+    timer = StreamTimer(label, sinks=timing_sinks) # Request start is timed from here
     try:
-        # print(f"Streaming only text parts for query '{query_text_sse_text_only}' (SSE enabled, to /run_sse):")
-        # Tracks if the current line being printed has received any text from partials
-        printed_partials_for_current_utterance = False 
-        # Keep track of the very last piece of text printed to manage newlines correctly
-        last_printed_text_segment = ""
-
-        with requests.post(url_sse_text_only, headers=headers_sse_text_only, data=json.dumps(data_sse_text_only), stream=True) as response:
-            response.raise_for_status()
-            buffer = b''
-            for chunk in response.iter_content(chunk_size=None):
-                if not chunk: continue
-                buffer += chunk
-                while True:
-                    try: newline_pos = buffer.index(b'\n')
-                    except ValueError: break
-                    line_bytes = buffer[:newline_pos]
-                    buffer = buffer[newline_pos+1:]
-                    if not line_bytes.strip(): continue
-                    try: decoded_line = line_bytes.decode('utf-8')
-                    except UnicodeDecodeError: continue
-                    if decoded_line.startswith('data: '):
-                        json_str = decoded_line[len('data: '):].strip()
-                        if not json_str: continue
-                        try:
-                            event_data = json.loads(json_str)
-                            if event_data.get("content") and isinstance(event_data["content"].get("parts"), list):
-                                for part_content in event_data["content"]["parts"]:
-                                    if isinstance(part_content, dict) and "text" in part_content:
-                                        text_from_event = part_content['text'].replace('\r', '')
-                                        is_final_event = not event_data.get('partial', False)
-
-                                        if not is_final_event: # This is a partial event (partial:true)
-                                            if text_from_event:
-                                                sys.stdout.write(text_from_event)
-                                                sys.stdout.flush()
-                                                printed_partials_for_current_utterance = True
-                                                last_printed_text_segment = text_from_event
-                                        else: # This is the final event for an utterance
-                                            # If partials were printed, the final event's text is mostly for confirmation/completeness.
-                                            # We only print its text if no partials were received for this utterance.
-                                            if not printed_partials_for_current_utterance and text_from_event:
-                                                sys.stdout.write(text_from_event)
-                                                sys.stdout.flush()
-                                                last_printed_text_segment = text_from_event
-                                            
-                                            # Ensure a newline after a completed utterance if the last printed part didn't end with one.
-                                            if (printed_partials_for_current_utterance or text_from_event) and not last_printed_text_segment.endswith('\n'):
-                                                sys.stdout.write('\n')
-                                                sys.stdout.flush()
-                                            
-                                            printed_partials_for_current_utterance = False # Reset for next utterance
-                                            last_printed_text_segment = "" # Reset
-                                            
-                        except json.JSONDecodeError:
-                            sys.stderr.write(f"[Error] JSONDecodeError for: {json_str}\n")
+        # Text of the utterance being printed. ADK sends partials as deltas; the merger also
+        # applies the final text, so only what is new (or a corrected utterance) is printed.
+        merger = PartialMerger(DELTA)
+
+        def show(new_text):
+            if new_text is None: # The server corrected text already printed: print the utterance again
+                sys.stdout.write("\n" + merger.text)
+            elif new_text:
+                sys.stdout.write(new_text)
+            sys.stdout.flush()
+
+        def line_open():
+            return len(merger) > 0 and not merger.text.endswith('\n')
+
+        stream = open_adk_stream(query_text, timer)
+        for sse_event, event_data in stream:
+            if event_data is None:
+                sys.stderr.write(f"[Error] JSONDecodeError for: {sse_event.text.strip()}\n")
+                continue
+            timer.observe(event_data)
+            if isinstance(event_data, PartialText): # The bulk of the stream: print the text as it comes
+                show(merger.add(event_data.text.replace('\r', '')))
+                continue
+            progress = progress_of(event_data)
+            if progress:
+                # A long-running tool is still working (see multi_tool_agent/progress.py)
+                if line_open():
+                    sys.stdout.write('\n')
+                sys.stdout.write(f"[progress] {progress.get('tool')}: {progress.get('message')}\n")
+                sys.stdout.flush()
+                continue
+            if event_data.get("content") and isinstance(event_data["content"].get("parts"), list):
+                texts = [part_content['text'] for part_content in event_data["content"]["parts"]
+                         if isinstance(part_content, dict) and "text" in part_content]
+                if not texts:
+                    continue
+                text_from_event = "".join(texts).replace('\r', '')
+                if event_data.get('partial', False): # This is a partial event (partial:true)
+                    show(merger.add(text_from_event))
+                else: # This is the final event for an utterance: it completes or corrects the printed text
+                    show(merger.final(text_from_event))
+                    # Ensure a newline after a completed utterance if the printed text didn't end with one.
+                    if line_open():
+                        sys.stdout.write('\n')
+                        sys.stdout.flush()
+                    merger = PartialMerger(merger.mode) # Reset for next utterance; the chunk kind stays
+
         # After loop, if the last thing printed didn't end with a newline (e.g. stream cut off)
-        if printed_partials_for_current_utterance and not last_printed_text_segment.endswith('\n'): 
+        if line_open():
             sys.stdout.write("\n")
             sys.stdout.flush()
+        print_resume_summary(stream)
+        print(f"[timing] {format_record(timer.finish())}")
             
     except NameError as ne:
         print(f"\n[Script Error] A variable was not defined. This might happen if Cell 1 was not run successfully. Details: {ne}")
     except requests.exceptions.RequestException as e:
+        timer.finish(error=str(e))
         print(f"Error sending streaming SSE query for text parts: {e}")
         if hasattr(e, 'response') and e.response is not None:
             print(f"Response content: {e.response.text}")
+
+# --- Cell 4: Stream and Print Only Text Parts from /run_sse (showing build-up) ---
+def run_cell4():
+    # print("--- Running Cell 4: Stream and Print Only Text Parts from /run_sse (showing build-up) ---")
+    # print(f"Using: Agent='{global_agent_name}', User='{global_user_id}', Session='{global_session_id}'")
+    query_text_sse_text_only = "weather in new york" # Preset query
+    print(f"'{query_text_sse_text_only}'")
+    stream_text_parts(query_text_sse_text_only, "cell4")
     # print("--- Cell 4 End ---\n")
 
 # --- Cell 5: Stream Text Parts from /run_sse using slow_get_weather tool ---
@@ -215,84 +224,198 @@ def run_cell5():
     # print(f"Using: Agent='{global_agent_name}', User='{global_user_id}', Session='{global_session_id}'")
     query_text_slow_weather = "get slow weather for new york" # Preset query to target the slow tool
     print(f"'{query_text_slow_weather}'")
+    stream_text_parts(query_text_slow_weather, "cell5")
+    # print("--- Cell 5 End ---\n")
+
+# --- Headless mode: a file of queries fanned out across sessions, one JSONL result per query ---
+HEADLESS_WORKERS = 4
 
-    url_sse_slow = "http://localhost:8000/run_sse"
-    headers_sse_slow = {**common_headers, "Accept": "text/event-stream"}
-    data_sse_slow = {
-        "app_name": global_agent_name,
-        "user_id": global_user_id,
-        "session_id": global_session_id,
-        "new_message": {"role": "user", "parts": [{"text": query_text_slow_weather}]},
-        "streaming": True
-    }
+def load_queries(path):
+    """Queries from a file (or stdin for '-'), one per line; blank lines and '#' comments are skipped."""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
     try:
-        # print(f"Streaming only text parts for query '{query_text_slow_weather}' (SSE enabled, to /run_sse):")
-        printed_partials_for_current_utterance = False 
-        last_printed_text_segment = ""
-
-        with requests.post(url_sse_slow, headers=headers_sse_slow, data=json.dumps(data_sse_slow), stream=True) as response:
-            response.raise_for_status()
-            buffer = b''
-            for chunk in response.iter_content(chunk_size=None):
-                if not chunk: continue
-                buffer += chunk
-                while True:
-                    try: newline_pos = buffer.index(b'\n')
-                    except ValueError: break
-                    line_bytes = buffer[:newline_pos]
-                    buffer = buffer[newline_pos+1:]
-                    if not line_bytes.strip(): continue
-                    try: decoded_line = line_bytes.decode('utf-8')
-                    except UnicodeDecodeError: continue
-                    if decoded_line.startswith('data: '):
-                        json_str = decoded_line[len('data: '):].strip()
-                        if not json_str: continue
-                        try:
-                            event_data = json.loads(json_str)
-                            if event_data.get("content") and isinstance(event_data["content"].get("parts"), list):
-                                for part_content in event_data["content"]["parts"]:
-                                    if isinstance(part_content, dict) and "text" in part_content:
-                                        text_from_event = part_content['text'].replace('\r', '')
-                                        is_final_event = not event_data.get('partial', False)
-
-                                        if not is_final_event: # This is a partial event (partial:true)
-                                            if text_from_event:
-                                                sys.stdout.write(text_from_event)
-                                                sys.stdout.flush()
-                                                printed_partials_for_current_utterance = True
-                                                last_printed_text_segment = text_from_event
-                                        else: # This is the final event for an utterance
-                                            if not printed_partials_for_current_utterance and text_from_event:
-                                                sys.stdout.write(text_from_event)
-                                                sys.stdout.flush()
-                                                last_printed_text_segment = text_from_event
-                                            
-                                            if (printed_partials_for_current_utterance or text_from_event) and not last_printed_text_segment.endswith('\n'):
-                                                sys.stdout.write('\n')
-                                                sys.stdout.flush()
-                                            
-                                            printed_partials_for_current_utterance = False 
-                                            last_printed_text_segment = "" 
-                                            
-                        except json.JSONDecodeError:
-                            sys.stderr.write(f"[Error] JSONDecodeError for: {json_str}\n")
-        if printed_partials_for_current_utterance and not last_printed_text_segment.endswith('\n'): 
-            sys.stdout.write("\n")
-            sys.stdout.flush()
-            
-    except NameError as ne:
-        print(f"\n[Script Error] A variable was not defined. This might happen if Cell 1 was not run successfully. Details: {ne}")
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+def collect_text(stream, timer):
+    """Final text of a streamed turn, one line per utterance, merged like stream_text_parts but not printed."""
+    utterances = []
+    merger = PartialMerger(DELTA)
+    for sse_event, event_data in stream:
+        if event_data is None:
+            continue
+        timer.observe(event_data)
+        if isinstance(event_data, PartialText):
+            merger.add(event_data.text)
+            continue
+        parts = (event_data.get("content") or {}).get("parts")
+        if progress_of(event_data) or not isinstance(parts, list):
+            continue
+        texts = [part['text'] for part in parts if isinstance(part, dict) and "text" in part]
+        if not texts:
+            continue
+        if event_data.get('partial', False):
+            merger.add("".join(texts))
+        else:
+            merger.final("".join(texts))
+            utterances.append(merger.text)
+            merger = PartialMerger(merger.mode)
+    if len(merger): # Stream cut off mid-utterance
+        utterances.append(merger.text)
+    return "\n".join(utterances)
+
+def run_headless_query(index, query_text, agent_name, user_id, session_id):
+    """Streams one query from /run_sse and returns its result record (timing fields included)."""
+    timer = StreamTimer("headless", sinks=timing_sinks)
+    stream = ResumableStream(adk_run_sse(http_client, agent_name, user_id, session_id, query_text,
+                                         wrap_chunks=timer.chunks))
+    text, error = None, None
+    try:
+        text = collect_text(stream, timer)
     except requests.exceptions.RequestException as e:
-        print(f"Error sending streaming SSE query for text parts: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Response content: {e.response.text}")
-    # print("--- Cell 5 End ---\n")
+        error = f"{type(e).__name__}: {e}"
+    record = timer.finish(error=error)
+    return {"index": index, "query": query_text, "session_id": session_id, "text": text,
+            "reconnects": stream.reconnects, **record}
+
+def percentiles(values):
+    if not values:
+        return "-"
+    if len(values) == 1:
+        return f"p50 {values[0]:.0f}ms"
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return f"p50 {cuts[49]:.0f}ms, p90 {cuts[89]:.0f}ms, p99 {cuts[98]:.0f}ms, max {max(values):.0f}ms"
+
+def print_headless_summary(records, wall, out):
+    errors = [record for record in records if record["error"]]
+    print(f"[headless] {len(records)} queries, {len(errors)} failed, {wall:.2f}s wall, "
+          f"{len(records) / wall if wall else 0:.2f} queries/s", file=out)
+    ok = [record for record in records if not record["error"]]
+    metrics = [("ttfb", [r["ttfb_ms"] for r in ok if r["ttfb_ms"] is not None]),
+               ("first text", [r["ttft_ms"] for r in ok if r["ttft_ms"] is not None]),
+               ("total", [r["total_ms"] for r in ok]),
+               ("tool gap", [call["gap_ms"] for r in ok for call in r["tool_calls"] if call["gap_ms"] is not None])]
+    model_calls = [call for r in ok for call in r.get("model_calls", ())]
+    metrics.append(("model ttft", [call["ttft_ms"] for call in model_calls if call["ttft_ms"] is not None]))
+    for name, values in metrics:
+        print(f"[headless]   {name:<10} n={len(values):<5} {percentiles(values)}", file=out)
+    input_tokens = [call["input_tokens"] for call in model_calls if call["input_tokens"] is not None]
+    if input_tokens:
+        cached = sum(call["cached_tokens"] for call in model_calls)
+        print(f"[headless]   input tokens per model call: mean {statistics.fmean(input_tokens):.0f}, "
+              f"max {max(input_tokens)}, {cached / sum(input_tokens):.0%} cached", file=out)
+    for record in errors[:5]:
+        print(f"[headless]   failed #{record['index']} {record['query']!r}: {record['error']}", file=out)
+
+def run_headless(args, queries):
+    """Runs every query (x --repeat) on --workers threads and writes one JSON line per result as it
+    completes. Each query runs on a session no other query is using at the time: one of --sessions
+    sessions created up front, or with --fresh-sessions a new one per query. Returns the exit status."""
+    queries = [query for query in queries for _ in range(args.repeat)]
+    if not queries:
+        print("[headless] No queries to run.", file=sys.stderr)
+        return 2
+    workers = max(1, min(args.workers, len(queries)))
+    log = sys.stderr if args.output == "-" else sys.stdout # Summary and progress stay out of the JSONL stream
+    create, delete = adk_session_factory(http_client, global_agent_name, global_user_id)
+    if args.fresh_sessions:
+        pool = SessionPool(create, size=workers, delete=delete)
+        pool.fill()
+        def take_session():
+            return pool.acquire().session_id
+        def release_session(session_id):
+            pass
+    else:
+        run_id = uuid.uuid4().hex[:8]
+        session_count = max(1, min(args.sessions or workers, len(queries)))
+        try:
+            with ThreadPoolExecutor(max_workers=session_count) as executor:
+                session_ids = list(executor.map(lambda i: create(f"s_headless_{run_id}_{i}").session_id,
+                                                range(session_count)))
+        except requests.exceptions.RequestException as e:
+            print(f"[headless] Error creating sessions: {e}", file=sys.stderr)
+            return 2
+        free_sessions = queue.Queue()
+        for session_id in session_ids:
+            free_sessions.put(session_id)
+        take_session = free_sessions.get # Blocks while every session is busy with a turn
+        release_session = free_sessions.put
+    try:
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    except OSError as e:
+        print(f"[headless] Cannot write --output: {e}", file=sys.stderr)
+        if args.fresh_sessions:
+            pool.close()
+        return 2
+
+    def run_one(index, query_text):
+        try:
+            session_id = take_session()
+        except requests.exceptions.RequestException as e: # A fresh session could not be created
+            return {"index": index, "query": query_text, "session_id": None, "text": None, "reconnects": 0,
+                    **StreamTimer("headless").finish(error=f"{type(e).__name__}: {e}")}
+        try:
+            return run_headless_query(index, query_text, global_agent_name, global_user_id, session_id)
+        finally:
+            release_session(session_id)
+
+    print(f"[headless] {len(queries)} queries on {workers} workers against {http_client.base_url} "
+          f"(agent '{global_agent_name}', user '{global_user_id}')", file=log)
+    records = []
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(run_one, i, query) for i, query in enumerate(queries)]
+            for future in as_completed(futures):
+                record = future.result()
+                records.append(record)
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                status = f"failed: {record['error']}" if record["error"] else f"{record['total_ms']:.0f}ms"
+                print(f"[headless] {len(records)}/{len(queries)} #{record['index']} {status}", file=log)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if args.fresh_sessions:
+            pool.close()
+    print_headless_summary(records, time.perf_counter() - start, log)
+    return 1 if any(record["error"] for record in records) else 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Interactive ADK streaming test script, or a headless "
+                                                 "regression/performance run with --queries.")
+    parser.add_argument("--url", default=DEFAULT_SERVER_URL, help="ADK api_server URL")
+    parser.add_argument("--agent", default=global_agent_name, help="Agent (app) name")
+    parser.add_argument("--user", default=global_user_id, help="User ID")
+    parser.add_argument("--queries", metavar="FILE", help="Run headless: one query per line ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=HEADLESS_WORKERS, help="Queries streamed at once")
+    parser.add_argument("--sessions", type=int, default=None, help="Sessions to spread queries over (default: one per worker)")
+    parser.add_argument("--fresh-sessions", action="store_true", help="Run every query on a new session")
+    parser.add_argument("--repeat", type=int, default=1, help="Times each query is run")
+    parser.add_argument("--output", default="-", help="JSONL file for results ('-' for stdout)")
+    return parser.parse_args(argv)
 
 # --- Main Interactive Loop ---
-def main():
+def main(argv=None):
+    global http_client, global_agent_name, global_user_id
+    args = parse_args(argv)
+    http_client = get_client(args.url) # Shared per URL, so the default is the client created above
+    global_agent_name, global_user_id = args.agent, args.user
+    if args.queries:
+        try:
+            queries = load_queries(args.queries)
+        except OSError as e:
+            print(f"[headless] Cannot read --queries: {e}", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(run_headless(args, queries))
+
     # Automatically run Cell 1 on script start to ensure session variables are set, 
     # or at least an attempt is made and user is informed.
     print("Initializing: Attempting to set up or validate session (equivalent to running Cell 1 first).")
+    # Start creating the default session now, so accepting the defaults below does not wait for it
+    session_pool_for(global_agent_name, global_user_id).reserve(global_session_id)
     run_cell1() 
     print("Initialization complete. Main menu will now be shown.\n")
 
@@ -303,9 +426,10 @@ def main():
         print("3. Stream Full JSON Events from /run_sse (Cell 3)")
         print("4. Stream Text Parts from /run_sse (showing build-up) (Cell 4)")
         print("5. Stream Text Parts using slow_get_weather (Cell 5)")
+        print("6. Show stream timing summary")
         print("exit. Exit the script")
         
-        choice = input("Enter your choice (1-5 or exit): ").strip().lower()
+        choice = input("Enter your choice (1-6 or exit): ").strip().lower()
         
         if choice == '1':
             run_cell1()
@@ -317,7 +441,10 @@ def main():
             run_cell4()
         elif choice == '5':
             run_cell5()
+        elif choice == '6':
+            print_timing_summary()
         elif choice == 'exit':
+            print_timing_summary()
             print("Exiting script.")
             break
         else:
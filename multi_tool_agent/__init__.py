@@ -1 +1,16 @@
-from . import agent
+"""The weather and time agent served by `adk api_server`.
+
+`root_agent` (and the `agent` module that builds it) is loaded on first access, so importing
+this package, or one of its modules that does not need ADK (sse_coalescing, sse_compression,
+parallel_tools, timezones, tool_cache), does not import ADK or build the agent.
+"""
+import importlib
+
+
+def __getattr__(name):
+    if name == "root_agent":
+        from .agent import root_agent
+        return root_agent
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,71 @@
+import asyncio
 import datetime
-from zoneinfo import ZoneInfo
-from google.adk.agents import Agent
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+from . import mock_model  # registers the "mock" model name
+from .parallel_tools import parallel_tools
+from .progress import ProgressAgent, streams_progress
+from .prompt_prefix import summary_docstrings
+from .timezones import city_key, lookup_city, zone_info
+from .tool_cache import cached_tool, normalize_city
+
+# Model root_agent runs on. "mock" (options: see mock_model.py) runs offline, without an API key.
+ROOT_AGENT_MODEL = os.environ.get("ROOT_AGENT_MODEL", "gemini-2.0-flash")
+
+# Sent as the system instruction of every model call, so kept short and free of {state}
+# placeholders: the same on every turn, it starts every request with the tool declarations.
+ROOT_AGENT_INSTRUCTION = """Answer questions about the current weather and time in cities.
+For several cities, call the list variant (get_weather_for_cities, slow_get_weather_for_cities, get_current_time_for_cities) once with all of them.
+Use slow_get_weather (or its list variant) only if the user asks for slow weather. Then tell the user before calling it (don't ask permission) and again once it has returned. Otherwise never use or mention it."""
+
+# Seconds slow_get_weather waits before answering. Benchmarks lower this to keep runs short.
+SLOW_WEATHER_DELAY_SECONDS = 5
+# Seconds between progress updates slow_get_weather streams while it waits.
+SLOW_WEATHER_PROGRESS_INTERVAL_SECONDS = 0.5
+
+# Tool result cache lifetimes. Weather reports change slowly; time reports go stale within seconds.
+WEATHER_CACHE_TTL_SECONDS = 600
+TIME_CACHE_TTL_SECONDS = 1
+TOOL_CACHE_MAXSIZE = 1024
+
+# Shared pool for tools that have to block (sleeps, sync HTTP clients, file IO).
+# Sized for I/O-bound work: each worker mostly waits, so this caps concurrent blocking calls
+# across all sessions served by one api_server process, not CPU use.
+BLOCKING_TOOL_MAX_WORKERS = 32
+_blocking_tool_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_TOOL_MAX_WORKERS, thread_name_prefix="blocking-tool"
+)
+
+
+def run_in_thread_pool(func):
+    """Wraps a blocking tool function so it runs on the shared thread pool.
+
+    The wrapper is a coroutine function, so ADK awaits it instead of calling it on the
+    event loop thread. Name, docstring and signature are preserved, so the tool declaration
+    the model sees is unchanged.
+
+    Args:
+        func: A synchronous tool function.
+
+    Returns:
+        An async function with the same name, docstring and signature as func.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _blocking_tool_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    return wrapper
+
+
+@cached_tool(WEATHER_CACHE_TTL_SECONDS, TOOL_CACHE_MAXSIZE, normalize={"city": normalize_city})
 def get_weather(city: str) -> dict:
     """Retrieves the current weather report for a specified city.
 
@@ -12,7 +75,7 @@ def get_weather(city: str) -> dict:
     Returns:
         dict: status and result or error msg.
     """
-    if city.lower() == "new york":
+    if normalize_city(city) == "new york":
         # time.sleep(1) # Temporarily remove sleep completely
         return {
             "status": "success",
@@ -28,19 +91,8 @@ def get_weather(city: str) -> dict:
         }
 
 
-def slow_get_weather(city: str) -> dict:
-    """Retrieves the current weather report for a specified city, with an artificial delay.
-
-    Args:
-        city (str): The name of the city for which to retrieve the weather report.
-
-    Returns:
-        dict: status and result or error msg.
-    """
-    if city.lower() == "new york":
-        # print(f"--- slow_get_weather TOOL: Simulating 5 second delay for {city} ---")
-        time.sleep(5)
-        # print(f"--- slow_get_weather TOOL: Delay finished for {city} ---")
+def _slow_weather_result(city: str) -> dict:
+    if normalize_city(city) == "new york":
         return {
             "status": "success",
             "report": (
@@ -55,6 +107,49 @@ def slow_get_weather(city: str) -> dict:
         }
 
 
+@cached_tool(WEATHER_CACHE_TTL_SECONDS, TOOL_CACHE_MAXSIZE, normalize={"city": normalize_city})
+@streams_progress
+async def slow_get_weather(city: str) -> dict:
+    """Retrieves the current weather report for a specified city, with an artificial delay.
+
+    Args:
+        city (str): The name of the city for which to retrieve the weather report.
+
+    Returns:
+        dict: status and result or error msg.
+    """
+    if normalize_city(city) == "new york":
+        # Yields the event loop while waiting, so other sessions keep streaming, and reports
+        # progress every interval so this session's stream does not go silent either.
+        yield f"Fetching the weather for {city}..."
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SLOW_WEATHER_DELAY_SECONDS
+        while (remaining := deadline - loop.time()) > SLOW_WEATHER_PROGRESS_INTERVAL_SECONDS:
+            await asyncio.sleep(SLOW_WEATHER_PROGRESS_INTERVAL_SECONDS)
+            elapsed = SLOW_WEATHER_DELAY_SECONDS - (deadline - loop.time())
+            yield f"Still fetching the weather for {city} ({elapsed:.1f}s of {SLOW_WEATHER_DELAY_SECONDS:g}s)"
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
+    yield _slow_weather_result(city)
+
+
+# Original synchronous version, kept for reproducing the stalled-stream behaviour: it holds the
+# calling thread for the whole delay. Wrap it with run_in_thread_pool before giving it to an agent.
+# (Kept out of the docstring, which becomes the tool description the model sees.)
+def blocking_slow_get_weather(city: str) -> dict:
+    """Retrieves the current weather report for a specified city, with an artificial delay.
+
+    Args:
+        city (str): The name of the city for which to retrieve the weather report.
+
+    Returns:
+        dict: status and result or error msg.
+    """
+    if normalize_city(city) == "new york":
+        time.sleep(SLOW_WEATHER_DELAY_SECONDS)
+    return _slow_weather_result(city)
+
+
+@cached_tool(TIME_CACHE_TTL_SECONDS, TOOL_CACHE_MAXSIZE, normalize={"city": city_key})
 def get_current_time(city: str) -> dict:
     """Returns the current time in a specified city.
 
@@ -65,9 +160,8 @@ def get_current_time(city: str) -> dict:
         dict: status and result or error msg.
     """
 
-    if city.lower() == "new york":
-        tz_identifier = "America/New_York"
-    else:
+    match = lookup_city(city)
+    if match is None:
         return {
             "status": "error",
             "error_message": (
@@ -75,7 +169,8 @@ def get_current_time(city: str) -> dict:
             ),
         }
 
-    tz = ZoneInfo(tz_identifier)
+    _, tz_identifier = match
+    tz = zone_info(tz_identifier)
     now = datetime.datetime.now(tz)
     report = (
         f'The current time in {city} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
@@ -83,20 +178,84 @@ def get_current_time(city: str) -> dict:
     return {"status": "success", "report": report}
 
 
-root_agent = Agent(
-    name="weather_time_agent",
-    model="gemini-2.0-flash",
-    description=(
-        "Agent to answer questions about the time and weather in a city. Can also get weather slowly."
-    ),
-    instruction=(
-        """You are a helpful agent who can answer user questions about the time and weather in a city.
-        You have two tools for weather: get_weather (fast) and slow_get_weather (slow).
-        IMPORTANT: before calling the slow weather app, inform the user BEFORE making the call (don't ask permission, just inform). 
-        Once the slow weather tool has run inform the user again.
-        Use slow weather if user asks for it. 
-        Otherwise never use it, and no need to inform the user about it. 
-        Thank you agent for your service."""
-    ),
-    tools=[get_weather, slow_get_weather, get_current_time],
-)
\ No newline at end of file
+def _batch_result(cities: list, results: list) -> dict:
+    succeeded = any(result.get("status") == "success" for result in results)
+    return {
+        "status": "success" if succeeded else "error",
+        "results": [{"city": city, **result} for city, result in zip(cities, results)],
+    }
+
+
+def get_weather_for_cities(cities: list[str]) -> dict:
+    """Retrieves the current weather report for several cities in one call.
+
+    Args:
+        cities (list[str]): The names of the cities for which to retrieve the weather report.
+
+    Returns:
+        dict: status and a list of per-city results (city, status and report or error msg).
+    """
+    return _batch_result(cities, [get_weather(city) for city in cities])
+
+
+async def slow_get_weather_for_cities(cities: list[str]) -> dict:
+    """Retrieves the current weather report for several cities in one call, with an artificial delay.
+
+    Args:
+        cities (list[str]): The names of the cities for which to retrieve the weather report.
+
+    Returns:
+        dict: status and a list of per-city results (city, status and report or error msg).
+    """
+    # The per-city waits overlap, so the batch takes about one delay, not one per city.
+    results = await asyncio.gather(*(slow_get_weather(city) for city in cities))
+    return _batch_result(cities, list(results))
+
+
+def get_current_time_for_cities(cities: list[str]) -> dict:
+    """Returns the current time in several cities in one call.
+
+    Args:
+        cities (list[str]): The names of the cities for which to retrieve the current time.
+
+    Returns:
+        dict: status and a list of per-city results (city, status and report or error msg).
+    """
+    return _batch_result(cities, [get_current_time(city) for city in cities])
+
+
+def create_root_agent():
+    """Builds the agent served as root_agent, on ROOT_AGENT_MODEL."""
+    # ProgressAgent is an LlmAgent that also streams the tools' progress updates on /run_sse.
+    return ProgressAgent(
+        name="weather_time_agent",
+        model=ROOT_AGENT_MODEL,
+        description=(
+            "Agent to answer questions about the time and weather in a city. Can also get weather slowly."
+        ),
+        instruction=ROOT_AGENT_INSTRUCTION,
+        # The function calls of one model turn run concurrently, sync tools on the blocking pool,
+        # and a call that raises returns an error result instead of failing the turn. The tool
+        # descriptions are the first paragraph of each docstring.
+        tools=summary_docstrings(parallel_tools([
+            get_weather_for_cities,
+            slow_get_weather_for_cities,
+            get_current_time_for_cities,
+            get_weather,
+            slow_get_weather,
+            get_current_time,
+        ], _blocking_tool_executor)),
+    )
+
+
+_root_agent_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # root_agent is built on first access; later accesses find it in the module namespace.
+    if name == "root_agent":
+        with _root_agent_lock:
+            if "root_agent" not in globals():
+                globals()["root_agent"] = create_root_agent()
+        return globals()["root_agent"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,147 @@
+"""Offline stand-in for the Gemini model, for deterministic runs without network or API key.
+
+MockLlm answers each model turn from a script, or else by keyword routing on the question:
+"slow" and "weather" call slow_get_weather (after announcing it, as the instruction asks),
+"weather" calls get_weather, "time" calls get_current_time, several cities ("in London and
+Paris") use the list variants. A turn that follows function responses answers with the
+tools' reports. In SSE streaming mode, text is streamed as partial responses of
+`chunk_tokens` words at `tokens_per_second`, followed by the complete turn, as Gemini does.
+The complete turn carries usage metadata like Gemini's, with token counts estimated from the
+request's size (prompt_prefix.request_footprint), so prompt footprint shows offline too.
+
+It is registered with ADK's model registry, so any agent can name it as a model string with
+options after a colon, e.g. `ROOT_AGENT_MODEL="mock:tokens_per_second=200,latency=0.05"
+adk api_server`. In code, pass an instance: `MockLlm(script=[[("get_weather", {"city": "Paris"})]])`.
+"""
+import asyncio
+import re
+
+from google.adk.models import BaseLlm, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+from .prompt_prefix import estimate_tokens, request_footprint
+
+_CITIES = re.compile(r"\b(?:in|for)\s+(.+?)\s*[?.!]*$", re.IGNORECASE)
+_CITY_SEPARATORS = re.compile(r"\s*(?:,|\band\b)\s*", re.IGNORECASE)
+
+
+def cities_in(question):
+    """Cities named after the first "in"/"for" in the question, e.g. ["London", "Paris"]."""
+    match = _CITIES.search(question)
+    if not match:
+        return []
+    return [city.title() if city.islower() else city
+            for city in _CITY_SEPARATORS.split(match.group(1)) if city]
+
+
+def route(question):
+    """(text announced before the calls or None, [(tool name, args)]) for a user question."""
+    words = question.lower()
+    cities = cities_in(question) or ["New York"]
+    many = len(cities) > 1
+    calls = []
+    text = None
+    if "weather" in words:
+        tool = "slow_get_weather" if "slow" in words else "get_weather"
+        calls.append((f"{tool}_for_cities", {"cities": cities}) if many else (tool, {"city": cities[0]}))
+        if tool == "slow_get_weather":
+            text = f"I'm getting the weather for {', '.join(cities)} with the slow weather tool; this takes a few seconds."
+    if "time" in words:
+        calls.append(("get_current_time_for_cities", {"cities": cities}) if many
+                     else ("get_current_time", {"city": cities[0]}))
+    if not calls:
+        text = "I can tell you the current weather or time in a city. Which city would you like?"
+    return text, calls
+
+
+def summarize(responses):
+    """Final answer text from a turn's function responses."""
+    lines = []
+    for response in responses:
+        results = (response or {}).get("results") or [response or {}]
+        for result in results:
+            line = result.get("report") or result.get("error_message")
+            if line:
+                lines.append(line)
+    return " ".join(lines) or "Done."
+
+
+def usage(llm_request, content):
+    """Usage metadata for a turn, with estimated token counts."""
+    prompt = estimate_tokens(sum(request_footprint(llm_request).values()))
+    candidates = estimate_tokens(len(content.model_dump_json(exclude_none=True)))
+    return types.GenerateContentResponseUsageMetadata(
+        prompt_token_count=prompt, candidates_token_count=candidates, total_token_count=prompt + candidates)
+
+
+class MockLlm(BaseLlm):
+    """Scripted or keyword-routed model turns; see the module docstring.
+
+    `script` entries are played back first, one per model turn: a string answers with that
+    text, a list of (tool name, args) pairs calls those tools. `turns` and `tool_calls` count
+    what was produced.
+    """
+
+    model: str = "mock"
+    script: list = []
+    latency: float = 0.0  # seconds before each turn's first output
+    tokens_per_second: float = 0.0  # streaming rate of text, in words; 0 sends text at once
+    chunk_tokens: int = 1  # words per partial response
+    final_text: str = ""  # answer after the tool calls, instead of the tools' reports
+    turns: int = 0
+    tool_calls: int = 0
+
+    @classmethod
+    def supported_models(cls):
+        return [r"mock(:.*)?"]
+
+    def model_post_init(self, context):
+        super().model_post_init(context)
+        # "mock:tokens_per_second=200,latency=0.05" -> field values
+        _, _, options = self.model.partition(":")
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            key = key.strip()
+            if key not in ("latency", "tokens_per_second", "chunk_tokens", "final_text"):
+                raise ValueError(f"Unknown MockLlm option {key!r} in model {self.model!r}")
+            setattr(self, key, type(getattr(self, key))(value.strip()))
+
+    def plan_turn(self, llm_request):
+        """(text or None, [(tool name, args)]) for the next model turn."""
+        turn = self.turns
+        self.turns += 1
+        if turn < len(self.script):
+            step = self.script[turn]
+            return (step, []) if isinstance(step, str) else (None, list(step))
+        last = llm_request.contents[-1] if llm_request.contents else None
+        parts = (last.parts or []) if last is not None else []
+        responses = [part.function_response.response for part in parts if part.function_response]
+        if responses:
+            return self.final_text or summarize(responses), []
+        question = " ".join(part.text for part in parts if part.text)
+        return route(question)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        text, calls = self.plan_turn(llm_request)
+        self.tool_calls += len(calls)
+        await asyncio.sleep(self.latency)
+        if text:
+            words = text.split(" ")
+            delay = self.chunk_tokens / self.tokens_per_second if self.tokens_per_second else 0.0
+            if stream:
+                for i in range(0, len(words), self.chunk_tokens):
+                    if delay:
+                        await asyncio.sleep(delay)
+                    chunk = " ".join(words[i:i + self.chunk_tokens]) + (" " if i + self.chunk_tokens < len(words) else "")
+                    yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                                      partial=True)
+            elif delay:
+                await asyncio.sleep(delay * len(words) / self.chunk_tokens)
+        parts = [types.Part(text=text)] if text else []
+        parts += [types.Part(function_call=types.FunctionCall(name=name, args=args)) for name, args in calls]
+        content = types.Content(role="model", parts=parts)
+        yield LlmResponse(content=content, usage_metadata=usage(llm_request, content))
+
+
+LLMRegistry.register(MockLlm)
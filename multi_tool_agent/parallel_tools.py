@@ -0,0 +1,65 @@
+"""Concurrent execution of the function calls a model makes in one turn.
+
+When a model turn holds several function calls, ADK starts a task per call and gathers them,
+so their responses are merged in call order. But a sync tool is called directly on the event
+loop: sync tools of one turn run one after another, and block every other session served by
+the process meanwhile. And an exception from any call fails the whole turn, losing the
+results of the calls next to it.
+
+`parallel_tool` wraps a tool so that:
+
+* a sync function runs on a bounded thread pool (with the caller's context variables, so
+  `report_progress` still reaches the ProgressAgent), and the turn's calls overlap: the turn
+  takes as long as its slowest tool, not the sum,
+* a coroutine function is awaited as before (its waits already overlap),
+* an exception becomes an error result for that call only, like the tools' own errors.
+
+Name, docstring and signature are preserved, so the declarations the model sees are unchanged.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def tool_error(name, error):
+    """Error result for a tool call that raised, in the shape the tools use."""
+    return {"status": "error", "error_message": f"{name} failed: {type(error).__name__}: {error}"}
+
+
+def parallel_tool(func, executor=None):
+    """Wraps one tool function as described in the module docstring.
+
+    Args:
+        func: A sync or async tool function.
+        executor: Thread pool sync tools run on; None uses the event loop's default executor.
+
+    Returns:
+        An async function with the same name, docstring and signature as func.
+    """
+    if inspect.iscoroutinefunction(func):
+        async def call(args, kwargs):
+            return await func(*args, **kwargs)
+    else:
+        async def call(args, kwargs):
+            context = contextvars.copy_context()
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(context.run, func, *args, **kwargs))
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await call(args, kwargs)
+        except Exception as e:
+            logger.exception("Tool %s failed", func.__name__)
+            return tool_error(func.__name__, e)
+
+    return wrapper
+
+
+def parallel_tools(tools, executor=None):
+    """parallel_tool applied to each tool function of a list."""
+    return [parallel_tool(tool, executor) for tool in tools]
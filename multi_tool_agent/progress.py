@@ -0,0 +1,123 @@
+"""Progress events from long-running tools, sent on the event stream while the tool runs.
+
+ADK tools are request/response on /run and /run_sse: nothing is streamed between the function
+call event and the function response event, so a 5 s tool means 5 s of silence. Here a tool
+calls `report_progress(message)` (or is written as an async generator and wrapped with
+`streams_progress`), and a ProgressAgent turns each report into a partial Event, yielded
+between the agent's own events while the tool keeps working.
+
+Progress events carry no content, so clients that only read text are unaffected. The report is
+in the event's custom metadata:
+    {"partial": true, "customMetadata": {"progress": {"tool": "slow_get_weather", "message": "..."}}, ...}
+Being partial, they are streamed but not stored in the session.
+"""
+import asyncio
+import contextlib
+import contextvars
+import functools
+
+from google.adk.agents import LlmAgent
+from google.adk.events import Event
+
+from .tool_cache import shared_call_contexts
+
+PROGRESS_METADATA_KEY = "progress"  # read by adk_client.events.progress_of
+
+# Callback (tool, message) of the ProgressAgent running the current invocation, if any.
+_progress_sink = contextvars.ContextVar("progress_sink", default=None)
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def report_progress(message, tool=None):
+    """Sends a progress update for the running tool. A no-op outside a ProgressAgent.
+
+    In a call cached_tool shares between callers, the update goes to each caller still waiting.
+    """
+    callers = shared_call_contexts()
+    sinks = [_progress_sink.get()] if callers is None else [caller.get(_progress_sink) for caller in list(callers)]
+    for sink in sinks:
+        if sink is not None:
+            sink(tool, message)
+
+
+def streams_progress(func):
+    """Turns an async generator tool into a coroutine tool ADK can call on /run and /run_sse.
+
+    The generator yields progress messages as strings and its result as the last non-string
+    value. Name, docstring and signature are preserved, so the tool declaration is unchanged.
+    (ADK reserves async generator tools for live streaming, hence the wrapper.)
+    """
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = None
+        async with contextlib.aclosing(func(*args, **kwargs)) as steps:
+            async for step in steps:
+                if isinstance(step, str):
+                    report_progress(step, func.__name__)
+                else:
+                    result = step
+        return result
+
+    return wrapper
+
+
+class ProgressAgent(LlmAgent):
+    """LlmAgent that streams its tools' progress reports as partial events."""
+
+    async def _run_async_impl(self, ctx):
+        queue = asyncio.Queue()
+        done = object()
+        loop = asyncio.get_running_loop()
+
+        def sink(tool, message):
+            event = Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                branch=ctx.branch,
+                partial=True,
+                custom_metadata={PROGRESS_METADATA_KEY: {"tool": tool, "message": message}},
+            )
+            if _running_loop() is loop:
+                queue.put_nowait((event, None))
+            else:  # a sync tool on a worker thread (see parallel_tools.py)
+                loop.call_soon_threadsafe(queue.put_nowait, (event, None))
+
+        async def pump():
+            # Runs the normal agent loop in its own task so progress can be yielded while it is
+            # suspended inside a tool. Each of its events waits for an ack, so the runner has
+            # handled (and stored) it before the loop continues, exactly as without the pump.
+            _progress_sink.set(sink)
+            try:
+                async with contextlib.aclosing(LlmAgent._run_async_impl(self, ctx)) as events:
+                    async for event in events:
+                        ack = asyncio.Event()
+                        queue.put_nowait((event, ack))
+                        await ack.wait()
+            except Exception as e:
+                queue.put_nowait((done, e))
+            else:
+                queue.put_nowait((done, None))
+
+        task = asyncio.create_task(pump())
+        try:
+            while True:
+                event, signal = await queue.get()
+                if event is done:
+                    if signal is not None:  # the agent loop failed
+                        raise signal
+                    return
+                yield event
+                if signal is not None:  # an agent event: let the loop continue
+                    signal.set()
+        finally:
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
@@ -0,0 +1,63 @@
+"""The static prompt prefix every model call repeats, kept small and byte-identical.
+
+Each model call of a turn sends the system instruction and every tool declaration again,
+ahead of the conversation. For root_agent both are fixed: the instruction has no `{state}`
+placeholders and the tools do not change, so the prefix is byte-identical across turns,
+sessions and users, and only the contents differ.
+
+* `summary_docstrings` trims each tool's docstring, which ADK sends whole as the tool
+  description, to its first paragraph: the parameters are declared by the signature already.
+* There is no explicit context cache: at about 490 tokens the prefix is below the minimum size
+  Gemini accepts for one. Caching is left to the implicit prefix caching of the models that
+  have it (Gemini 2.5 and later, not the default gemini-2.0-flash), which matches a request
+  against earlier ones from its first token on. With an identical prefix, each call of a
+  session that is over the model's minimum can reuse the tokens of the call before it.
+* `request_footprint` sizes the parts of a request, for MockLlm's usage reports and the
+  benchmark. Token counts from it are estimates (4 characters a token); the usage metadata of
+  a real model's final response has the actual counts, cached tokens included.
+"""
+import hashlib
+import math
+
+from google.genai import types
+
+
+def summary_docstrings(tools):
+    """Cuts each tool's docstring to its first paragraph, in place, and returns the list.
+
+    Use on wrappers (e.g. from parallel_tools), whose __doc__ is a copy: the wrapped
+    functions keep their full docstrings.
+    """
+    for tool in tools:
+        if tool.__doc__:
+            tool.__doc__ = tool.__doc__.strip().split("\n\n", 1)[0]
+    return tools
+
+
+def estimate_tokens(chars):
+    """Rough token count for a number of characters of English text or JSON."""
+    return math.ceil(chars / 4)
+
+
+def request_footprint(llm_request):
+    """Characters of system instruction, tool declarations and contents an LlmRequest sends."""
+    config = llm_request.config
+    system = (config.system_instruction if config else None) or ""
+    if isinstance(system, types.Content):
+        system = "".join(part.text or "" for part in system.parts or ())
+    tools = sum(len(tool.model_dump_json(exclude_none=True)) for tool in (config.tools if config else None) or ())
+    contents = sum(len(content.model_dump_json(exclude_none=True)) for content in llm_request.contents)
+    return {"system_chars": len(str(system)), "tool_chars": tools, "content_chars": contents}
+
+
+def prefix_key(llm_request):
+    """Hash of the model, system instruction and tool declarations of an LlmRequest."""
+    config = llm_request.config
+    digest = hashlib.sha256(str(llm_request.model).encode())
+    for value in (config.system_instruction, config.tools, config.tool_config):
+        if isinstance(value, list):
+            value = [item.model_dump_json(exclude_none=True) for item in value]
+        elif isinstance(value, (types.Content, types.ToolConfig)):
+            value = value.model_dump_json(exclude_none=True)
+        digest.update(b"\0" + repr(value).encode())
+    return digest.hexdigest()
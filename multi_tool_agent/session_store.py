@@ -0,0 +1,214 @@
+"""SQLite session storage for the api_server: sessions survive restarts, events are indexed.
+
+`adk api_server` keeps sessions in memory by default, so they are lost on restart and the
+process grows with every event. ADK's DatabaseSessionService can store them with SQLAlchemy,
+but on SQLite it runs in rollback-journal mode, commits each event in its own transaction
+(a sync to disk per event, on the event loop), and the events table's primary key starts with
+the event id, so loading one session reads through every stored event.
+
+SqliteSessionService keeps ADK's schema and adds:
+
+* WAL journal with synchronous=NORMAL: readers do not block the writer and commits do not
+  wait for the disk,
+* an index on events (app_name, user_id, session_id, timestamp), the order sessions are
+  loaded in (sessions are already keyed by (app_name, user_id, id)),
+* batched event writes: `append_event` updates the session in memory and queues the event; a
+  writer thread commits whatever is queued, up to `batch_size` events, in one transaction
+  (group commit: no added delay when idle, larger batches under load). A read or delete
+  first waits for the queued events of the sessions it covers (not for other sessions'
+  events), and `close()` for all of them, so a session is always read back complete. Each
+  batch also moves its sessions' update_time to their last event, as ADK does per event.
+
+Queued events are lost if the process dies before their batch commits, a few milliseconds at
+most. One api_server process should own the database file; the stale-session check ADK does
+on each append (against other writers) is not repeated per event.
+"""
+import asyncio
+import logging
+import queue
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from google.adk.sessions.database_session_service import (
+    DatabaseSessionService,
+    StorageAppState,
+    StorageEvent,
+    StorageSession,
+    StorageUserState,
+    _extract_state_delta,
+)
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+EVENT_BATCH_SIZE = 256  # events committed per transaction at most
+SESSION_EVENTS_INDEX = ("CREATE INDEX IF NOT EXISTS ix_events_session_timestamp "
+                        "ON events (app_name, user_id, session_id, timestamp)")
+
+_STOP = object()
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+
+class SqliteSessionService(DatabaseSessionService):
+    """DatabaseSessionService on a SQLite file, tuned as described in the module docstring.
+
+    `written` and `failed` count events committed and events that could not be stored.
+    """
+
+    def __init__(self, path, batch_size=EVENT_BATCH_SIZE):
+        super().__init__(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+        sqlalchemy_event.listen(self.db_engine, "connect", _set_sqlite_pragmas)
+        self.db_engine.dispose()  # connections opened while creating the tables lack the pragmas
+        with self.db_engine.begin() as connection:
+            connection.execute(text(SESSION_EVENTS_INDEX))
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        # (app name, user id, session id) -> events queued and not yet committed, and the
+        # flush() calls waiting on them: (key prefix, future).
+        self._pending = {}
+        self._waiters = []
+        self._pending_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="session-writer", daemon=True)
+        self._writer.start()
+
+    async def append_event(self, session, event):
+        if event.partial:
+            return event
+        # The in-memory update of BaseSessionService; the database write is queued.
+        await super(DatabaseSessionService, self).append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+        key = (session.app_name, session.user_id, session.id)
+        with self._pending_lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+        self._queue.put((SimpleNamespace(app_name=session.app_name, user_id=session.user_id, id=session.id), event))
+        return event
+
+    async def get_session(self, *, app_name, user_id, session_id, config=None):
+        await self.flush(app_name, user_id, session_id)
+        return await super().get_session(app_name=app_name, user_id=user_id, session_id=session_id, config=config)
+
+    async def list_sessions(self, *, app_name, user_id):
+        await self.flush(app_name, user_id)
+        return await super().list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, app_name, user_id, session_id):
+        await self.flush(app_name, user_id, session_id)
+        return await super().delete_session(app_name, user_id, session_id)
+
+    async def flush(self, *key):
+        """Waits until the queued events of the sessions under key are committed (or have failed).
+
+        key is (app name, user id, session id) or a prefix of it; no key waits for all sessions.
+        """
+        with self._pending_lock:
+            if not self._has_pending(key):
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((key, future))
+        await future
+
+    def _has_pending(self, key):
+        return any(pending[:len(key)] == key for pending in self._pending)
+
+    def _committed(self, events):
+        """Called by the writer after a batch: counts its events done, wakes flush() calls."""
+        with self._pending_lock:
+            for session, _ in events:
+                key = (session.app_name, session.user_id, session.id)
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+            waiting = []
+            for key, future in self._waiters:
+                if self._has_pending(key):
+                    waiting.append((key, future))
+                else:
+                    try:
+                        future.get_loop().call_soon_threadsafe(_wake, future)
+                    except RuntimeError:  # its event loop is closed
+                        pass
+            self._waiters = waiting
+
+    def close(self):
+        """Commits the queued events, stops the writer thread and closes the connections."""
+        self._queue.put(_STOP)
+        self._writer.join()
+        self.db_engine.dispose()
+
+    def _write_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            while batch[-1] is not _STOP and len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _STOP
+            events = batch[:-1] if stop else batch
+            if events:
+                self._write(events)
+                self._committed(events)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, events):
+        try:
+            self._store(events)
+            self.written += len(events)
+            return
+        except Exception:
+            logger.exception("Writing a batch of %d session events failed; retrying one by one", len(events))
+        for entry in events:
+            try:
+                self._store([entry])
+                self.written += 1
+            except Exception:
+                self.failed += 1
+                logger.exception("Session event %s could not be stored", entry[1].id)
+
+    def _store(self, events):
+        with self.database_session_factory() as sql_session:
+            updated = {}  # session key -> timestamp of its last event in the batch
+            for session, event in events:
+                state_delta = event.actions.state_delta if event.actions else None
+                if state_delta:
+                    self._apply_state_delta(sql_session, session, state_delta)
+                sql_session.add(StorageEvent.from_event(session, event))
+                updated[(session.app_name, session.user_id, session.id)] = event.timestamp
+            for key, timestamp in updated.items():
+                row = sql_session.get(StorageSession, key)
+                if row is not None:
+                    # Naive UTC, as SQLite stores the column's func.now() default.
+                    row.update_time = datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+            sql_session.commit()
+
+    @staticmethod
+    def _apply_state_delta(sql_session, session, state_delta):
+        app_delta, user_delta, session_delta = _extract_state_delta(state_delta)
+        rows = ((StorageAppState, (session.app_name,), app_delta),
+                (StorageUserState, (session.app_name, session.user_id), user_delta),
+                (StorageSession, (session.app_name, session.user_id, session.id), session_delta))
+        for table, key, delta in rows:
+            if delta:
+                row = sql_session.get(table, key)
+                if row is not None:
+                    row.state = {**row.state, **delta}
+
+
+def _wake(future):
+    if not future.done():  # the waiter may have been cancelled
+        future.set_result(None)
@@ -0,0 +1,189 @@
+"""Merging of adjacent partial text events on the api_server's /run_sse stream.
+
+With streaming on, ADK sends one SSE event per model chunk, often a single token, and every
+event repeats the whole envelope: content, role, invocation id, author, actions, event id and
+timestamp. For a long answer most of the bytes on the wire, and most of the clients' parse
+time, are envelope rather than text.
+
+CoalescingMiddleware is an ASGI middleware for the api_server app. On /run_sse responses it
+holds back a partial text event (`"partial": true`, text parts only) and appends the text of
+the partial events that follow it for the same invocation and author, until `max_delay`
+seconds have passed since the first one, the held text reaches `max_bytes`, or any other
+event arrives. It then sends one event: the envelope of the last merged event with the joined
+text. Tool calls, tool results, progress updates and final events pass through untouched, and
+always after the text that came before them. A partial event that merged with nothing is sent
+as it came.
+
+Partial chunks from ADK are deltas, so merged chunks are a delta too; clients that merge with
+adk_client.partials.PartialMerger see the same text in fewer, larger events. Text is delayed
+by `max_delay` at most, which is the price of the savings: keep it below what a reader notices.
+"""
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+COALESCE_DELAY = 0.05  # seconds a partial text event may be held back for merging
+COALESCE_BYTES = 4096  # text bytes held back at most before the merged event is sent
+COALESCE_PATHS = ("/run_sse",)
+
+PARTIAL_MARKER = b'"partial":true'  # compact JSON, as ADK's model_dump_json writes it
+
+
+def mergeable_text(event):
+    """The text of a partial event made only of text parts, else None."""
+    if not isinstance(event, dict) or event.get("partial") is not True:
+        return None
+    parts = (event.get("content") or {}).get("parts")
+    if not parts or not all(isinstance(part, dict) and part.keys() == {"text"} for part in parts):
+        return None
+    return "".join(part["text"] for part in parts)
+
+
+class _PendingText:
+    """Partial text events held back: the raw first event, the last parsed one, their texts."""
+
+    __slots__ = ("raw", "event", "key", "texts", "size")
+
+    def __init__(self, raw, event, key, text):
+        self.raw = raw
+        self.event = event
+        self.key = key
+        self.texts = [text]
+        self.size = len(text)
+
+    def add(self, event, text):
+        self.event = event
+        self.texts.append(text)
+        self.size += len(text)
+
+    def encode(self):
+        if len(self.texts) == 1:
+            return self.raw
+        event = dict(self.event)
+        event["content"] = {**event["content"], "parts": [{"text": "".join(self.texts)}]}
+        return b"data: " + json.dumps(event, ensure_ascii=False, separators=(",", ":")).encode() + b"\n\n"
+
+
+class _CoalescingResponse:
+    """The `send` of one /run_sse response, rewritten as described in the module docstring."""
+
+    def __init__(self, send, max_delay, max_bytes):
+        self._send = send
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self._streaming = False
+        self._buffer = b""
+        self._pending = None
+        self._timer = None
+        self._lock = asyncio.Lock()
+
+    async def send(self, message):
+        async with self._lock:
+            if message["type"] == "http.response.start":
+                headers = dict(message.get("headers") or ())
+                self._streaming = headers.get(b"content-type", b"").startswith(b"text/event-stream")
+                await self._send(message)
+            elif message["type"] != "http.response.body" or not self._streaming:
+                await self._send(message)
+            else:
+                out = self._process(message.get("body", b""))
+                more_body = message.get("more_body", False)
+                if not more_body:
+                    out.append(self._flush_pending())
+                    out.append(self._buffer)  # an unterminated last event, passed on as is
+                    self._buffer = b""
+                body = b"".join(out)
+                if body or not more_body:
+                    await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _process(self, body):
+        """Outgoing byte strings for the complete events in body; holds back mergeable ones."""
+        out = []
+        buffer = self._buffer + body if self._buffer else body
+        start = 0
+        while True:
+            end = buffer.find(b"\n\n", start)
+            if end == -1:
+                break
+            raw = buffer[start:end + 2]
+            start = end + 2
+            event = text = None
+            if PARTIAL_MARKER in raw and raw.startswith(b"data: "):
+                try:
+                    event = json.loads(raw[6:])
+                except ValueError:
+                    pass
+                text = mergeable_text(event)
+            if text is None:
+                out.append(self._flush_pending())
+                out.append(raw)
+                continue
+            key = (event.get("invocationId"), event.get("author"))
+            pending = self._pending
+            if pending is not None and pending.key == key:
+                pending.add(event, text)
+            else:
+                out.append(self._flush_pending())
+                self._pending = _PendingText(raw, event, key, text)
+                self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._on_timer)
+            if self._pending.size >= self.max_bytes:
+                out.append(self._flush_pending())
+        self._buffer = buffer[start:]
+        return out
+
+    def _flush_pending(self):
+        pending = self._pending
+        if pending is None:
+            return b""
+        self._pending = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return pending.encode()
+
+    def _on_timer(self):
+        self._timer = None
+        asyncio.get_running_loop().create_task(self._send_held())
+
+    async def _send_held(self):
+        async with self._lock:
+            if self._pending is None or self._timer is not None:
+                return  # already sent, or a new batch with its own timer
+            body = self._flush_pending()
+            try:
+                await self._send({"type": "http.response.body", "body": body, "more_body": True})
+            except Exception:  # the client went away; the response itself will fail next
+                logger.debug("Sending held partial text failed", exc_info=True)
+
+
+class CoalescingMiddleware:
+    """ASGI middleware merging adjacent partial text events on /run_sse responses.
+
+    Args:
+        app: The ASGI app, e.g. from api_server.create_app.
+        max_delay: Seconds a partial text event may be held back waiting for more.
+        max_bytes: Size of held text at which the merged event is sent at once.
+        paths: Request paths whose event streams are coalesced.
+    """
+
+    def __init__(self, app, max_delay=COALESCE_DELAY, max_bytes=COALESCE_BYTES, paths=COALESCE_PATHS):
+        self.app = app
+        self.max_delay = max_delay
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+        response = _CoalescingResponse(send, self.max_delay, self.max_bytes)
+        try:
+            await self.app(scope, receive, response.send)
+        finally:
+            response.close()
@@ -0,0 +1,118 @@
+"""Streaming compression of the api_server's event streams, flushed after every event.
+
+Each /run_sse event repeats the same JSON keys (content, parts, invocationId, author,
+actions, ...), so a long answer compresses well. Response compression usually buffers output
+until it has a block worth compressing, and Starlette's GZipMiddleware leaves
+`text/event-stream` alone for that reason: a buffered event stream stalls.
+
+CompressionMiddleware compresses `text/event-stream` responses for clients that accept it
+(`Accept-Encoding`), with brotli when the optional `brotli` package is installed and the
+client accepts `br`, else gzip. After every body chunk the server sends (one event, as ADK
+writes them) it flushes the compressor, so the event goes out whole and the client can decode
+it at once; only the dictionary is shared across events. Other responses pass through.
+
+adk_client's requests-based client decodes gzip (and br, with `brotli` installed)
+transparently, so `iter_content` yields the same bytes as before.
+"""
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # brotli's cost grows fast above this, and events are flushed one by one
+
+
+def available_encodings():
+    """Content codings this server can produce, in order of preference."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def accepted_encodings(header):
+    """Codings in an Accept-Encoding header value, without those refused with q=0."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        q = params.strip()
+        try:
+            refused = q.startswith("q=") and float(q[2:]) == 0
+        except ValueError:
+            refused = False
+        if coding and not refused:
+            accepted.add(coding)
+    return accepted
+
+
+class _GzipStream:
+    def __init__(self, level=GZIP_LEVEL):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 16 + 15: gzip wrapper
+
+    def flush(self, data):
+        """Compressed data, ending on a byte boundary the client can decode up to."""
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data):
+        return self._compressor.compress(data) + self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality=BROTLI_QUALITY):
+        self._compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    def flush(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data):
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+STREAMS = {"gzip": _GzipStream, "br": _BrotliStream}
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing event-stream responses, one flush per body chunk.
+
+    Args:
+        app: The ASGI app, e.g. from api_server.create_app.
+        encodings: Codings to offer, in order of preference; defaults to available_encodings().
+    """
+
+    def __init__(self, app, encodings=None):
+        self.app = app
+        self.encodings = tuple(encodings or available_encodings())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or ())
+        accepted = accepted_encodings(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        encoding = next((coding for coding in self.encodings if coding in accepted), None)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        stream = None
+
+        async def compressing_send(message):
+            nonlocal stream
+            if message["type"] == "http.response.start":
+                response_headers = dict(message.get("headers") or ())
+                if (response_headers.get(b"content-type", b"").startswith(b"text/event-stream")
+                        and b"content-encoding" not in response_headers):
+                    stream = STREAMS[encoding]()
+                    message = {**message, "headers": [
+                        *((k, v) for k, v in message.get("headers") or () if k != b"content-length"),
+                        (b"content-encoding", encoding.encode()), (b"vary", b"Accept-Encoding")]}
+            elif message["type"] == "http.response.body" and stream is not None:
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if more_body and not body:
+                    return
+                message = {**message, "body": stream.flush(body) if more_body else stream.finish(body)}
+            await send(message)
+
+        await self.app(scope, receive, compressing_send)
@@ -0,0 +1,82 @@
+"""City name -> IANA time zone index for get_current_time.
+
+The index is read once, on first use, from the bundled `data/city_timezones.tsv`: one line
+per zone with its city names and aliases. Names are matched case-, accent- and
+punctuation-insensitively through a single dict, so a lookup is O(1) however many cities
+the table holds. ZoneInfo objects are memoized per zone.
+"""
+import functools
+import os
+import re
+import threading
+import unicodedata
+from zoneinfo import ZoneInfo
+
+TIMEZONE_DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "city_timezones.tsv")
+
+_PUNCTUATION = re.compile(r"[\s.,'’_\-]+")
+
+
+def city_key(name):
+    """Lookup key for a city name: "  São-Paulo " -> "sao paulo", "St. John's" -> "st john s"."""
+    name = str(name)
+    if not name.isascii():  # most names are: NFKD would leave them as they are
+        name = unicodedata.normalize("NFKD", name)
+        name = "".join(c for c in name if not unicodedata.combining(c))
+    return _PUNCTUATION.sub(" ", name).strip().casefold()
+
+
+class CityTimezoneIndex:
+    """Maps city names and aliases to (display name, IANA zone)."""
+
+    def __init__(self):
+        self._by_key = {}  # city_key(name) -> (display name, zone)
+
+    def __len__(self):
+        return len(self._by_key)
+
+    def add(self, zone, names):
+        """Registers names for a zone. The first name is the display name; earlier entries win."""
+        display = names[0]
+        for name in names:
+            self._by_key.setdefault(city_key(name), (display, zone))
+
+    def lookup(self, city):
+        """Returns (display name, zone) for a city name or alias, or None if unknown."""
+        return self._by_key.get(city_key(city))
+
+    @classmethod
+    def from_file(cls, path):
+        index = cls()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.startswith("#"):
+                    continue
+                zone, names = line.rstrip("\n").split("\t", 1)
+                index.add(zone, names.split("|"))
+        return index
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """The process-wide index, loaded from TIMEZONE_DATA_PATH on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CityTimezoneIndex.from_file(TIMEZONE_DATA_PATH)
+    return _index
+
+
+def lookup_city(city):
+    """Returns (display name, zone) for a city name or alias, or None if unknown."""
+    return get_index().lookup(city)
+
+
+@functools.lru_cache(maxsize=None)
+def zone_info(zone):
+    """Memoized ZoneInfo for an IANA zone name."""
+    return ZoneInfo(zone)
@@ -0,0 +1,230 @@
+"""TTL + LRU result cache for agent tools.
+
+`cached_tool` wraps a sync or async tool function. Arguments are normalized per parameter
+(e.g. case- and whitespace-insensitive city names) to build the key, entries expire after a
+per-tool TTL, and the least recently used entry is evicted once `maxsize` is reached.
+Concurrent calls for a key that is already being computed wait for that call instead of
+running the tool again. An async tool runs in a task of its own that its callers share: a
+caller that is cancelled (its client went away) stops waiting, and the tool is cancelled only
+once no caller is left. The progress the shared call reports reaches every caller (see
+`shared_call_contexts`). Name, docstring and signature of the tool are preserved, so the
+declaration ADK builds for the model is unchanged.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+# All caches created by cached_tool, by tool name, for reporting.
+TOOL_CACHES = {}
+
+# Inside the task running a shared async call: the contexts of the callers waiting for it.
+_shared_callers = contextvars.ContextVar("shared_callers", default=None)
+
+
+def shared_call_contexts():
+    """Contexts of the callers of the cached async call running in this task, or None.
+
+    progress.report_progress sends a shared call's progress to each of these callers.
+    """
+    return _shared_callers.get()
+
+
+def normalize_city(city):
+    """Case-folds a city name and collapses whitespace: "  New   york " -> "new york"."""
+    return " ".join(str(city).split()).casefold()
+
+
+def cache_success_only(result):
+    """Default cache predicate: keep successful tool results, recompute errors."""
+    return not (isinstance(result, dict) and result.get("status") == "error")
+
+
+class ToolCache:
+    """Thread-safe TTL/LRU store with in-flight call coalescing and hit/miss counters."""
+
+    def __init__(self, name, ttl, maxsize=1024, clock=time.monotonic):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, result)
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> _SharedCall (async tools) or _PendingCall (sync tools)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns (True, result) for a live entry, (False, None) otherwise. Counts hits only."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                del self._entries[key]
+            return False, None
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+            }
+
+
+class _PendingCall:
+    """Result slot shared by threads waiting on the same in-flight sync call."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _SharedCall:
+    """The task running an in-flight async call and the contexts of the callers awaiting it."""
+
+    __slots__ = ("task", "callers")
+
+    def __init__(self):
+        self.task = None
+        self.callers = []
+
+
+def cached_tool(ttl, maxsize=1024, normalize=None, cache_if=cache_success_only):
+    """Decorator caching a tool's results.
+
+    Args:
+        ttl: Seconds a result stays valid.
+        maxsize: Maximum number of cached results (least recently used are evicted).
+        normalize: Optional {parameter name: function} applied to argument values when
+            building the cache key, e.g. {"city": normalize_city}.
+        cache_if: Predicate deciding whether a result is stored. By default error results
+            are not cached.
+
+    The wrapper exposes the cache as `.cache` (see ToolCache.stats()).
+    """
+    normalize = normalize or {}
+
+    def decorator(func):
+        cache = ToolCache(func.__name__, ttl, maxsize)
+        TOOL_CACHES[func.__name__] = cache
+        signature = inspect.signature(func)
+
+        def make_key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return tuple(normalize.get(name, _identity)(value) for name, value in bound.arguments.items())
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                found, result = cache.get(key)
+                if found:
+                    return result
+                loop = asyncio.get_running_loop()
+                with cache._lock:
+                    shared = cache._inflight.get(key)
+                    if isinstance(shared, _SharedCall) and shared.task.get_loop() is loop:
+                        cache.coalesced += 1
+                    else:
+                        shared = cache._inflight[key] = _SharedCall()
+                        cache.misses += 1
+                        shared.task = loop.create_task(run(shared, key, args, kwargs))
+                    caller = contextvars.copy_context()
+                    shared.callers.append(caller)
+                try:
+                    return await asyncio.shield(shared.task)
+                except asyncio.CancelledError:
+                    # Only this caller went away: the others keep waiting for the same call.
+                    with cache._lock:
+                        shared.callers.remove(caller)
+                        abandoned = not shared.callers
+                    if abandoned:
+                        shared.task.cancel()
+                    raise
+
+            async def run(shared, key, args, kwargs):
+                _shared_callers.set(shared.callers)
+                try:
+                    result = await func(*args, **kwargs)
+                    if cache_if(result):
+                        cache.put(key, result)
+                    return result
+                finally:
+                    with cache._lock:
+                        if cache._inflight.get(key) is shared:
+                            del cache._inflight[key]
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+                found, result = cache.get(key)
+                if found:
+                    return result
+                with cache._lock:
+                    pending = cache._inflight.get(key)
+                    if isinstance(pending, _PendingCall):
+                        cache.coalesced += 1
+                        owner = False
+                    else:
+                        pending = cache._inflight[key] = _PendingCall()
+                        cache.misses += 1
+                        owner = True
+                if not owner:
+                    pending.done.wait()
+                    if pending.error is not None:
+                        raise pending.error
+                    return pending.result
+                try:
+                    result = pending.result = func(*args, **kwargs)
+                    if cache_if(result):
+                        cache.put(key, result)
+                    return result
+                except BaseException as e:
+                    pending.error = e
+                    raise
+                finally:
+                    with cache._lock:
+                        if cache._inflight.get(key) is pending:
+                            del cache._inflight[key]
+                    pending.done.set()
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def _identity(value):
+    return value
+
+
+def cache_stats():
+    """Hit/miss counters of every cached tool, by tool name."""
+    return {name: cache.stats() for name, cache in TOOL_CACHES.items()}
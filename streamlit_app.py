@@ -1,8 +1,26 @@
 import streamlit as st
 import requests
-import json
+import os
 import time # For unique keys or other purposes
 
+from adk_client.client import DEFAULT_SERVER_URL, SSE_ACCEPT_HEADERS, get_client
+from adk_client.consumer import DONE, ITEM, STATUS, StreamConsumer
+from adk_client.events import PartialText
+from adk_client.message import AssistantMessage
+from adk_client.metrics import JsonlSink, StreamTimer
+from adk_client.raw_events import RawEventStore
+from adk_client.resume import ResumableStream, sse_json_events
+from adk_client.session_pool import PooledSession, SessionPool
+
+# How often the in-flight assistant message is refreshed from the stream queue (overridable in the sidebar).
+RENDER_INTERVAL_SECONDS = 0.05
+MIN_RENDER_INTERVAL_SECONDS = 0.01
+# Events applied per refresh at most, so a burst cannot stall a frame; the rest wait in the queue.
+MAX_EVENTS_PER_FRAME = 500
+
+# Each response's timing record is kept on its chat message; set ADK_TIMINGS_JSONL to also export them.
+TIMING_SINKS = [JsonlSink(os.environ["ADK_TIMINGS_JSONL"])] if os.environ.get("ADK_TIMINGS_JSONL") else []
+
 # Initialize session state variables
 if 'session_id' not in st.session_state:
     st.session_state.session_id = None
@@ -10,231 +28,284 @@ if 'last_event_id' not in st.session_state:
     st.session_state.last_event_id = None
 if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
+if 'raw_event_store' not in st.session_state:
+    st.session_state.raw_event_store = RawEventStore() # Byte budget for raw events across the chat
 if 'current_query_active' not in st.session_state:
     st.session_state.current_query_active = False
 if 'prompt_to_process' not in st.session_state:
     st.session_state.prompt_to_process = None
+if 'active_stream' not in st.session_state:
+    st.session_state.active_stream = None # Consumer thread, message and timer of the answer streaming now
+
+@st.cache_resource(show_spinner=False, on_release=SessionPool.close)
+def get_session_pool(server_url):
+    """Process-wide pool of pre-created sessions for server_url, shared by all browser sessions.
+
+    Closed when the cache releases it. The /session API has no delete, so sessions it made
+    ahead of time are left to the server to expire."""
+    client = get_client(server_url)
+
+    def create(session_id=None):
+        response = client.post("/session")
+        response.raise_for_status()
+        return PooledSession(response.json().get("session_id"), response)
+
+    pool = SessionPool(create)
+    pool.fill() # Start creating sessions in the background right away
+    return pool
 
 def create_session(server_url):
-    """Creates a new session with the ADK agent."""
+    """Creates a new session with the ADK agent (handed out from the pre-created pool)."""
     try:
         st.session_state.current_query_active = False # Reset query flag
-        response = requests.post(f"{server_url}/session")
-        response.raise_for_status()
-        session_data = response.json()
-        st.session_state.session_id = session_data.get("session_id")
+        stop_agent_response_stream() # Its message is about to be cleared with the history
+        st.session_state.active_stream = None
+        st.session_state.session_id = get_session_pool(server_url).acquire().session_id
         st.session_state.last_event_id = None
         st.session_state.chat_history = [] # Clear history for new session
+        st.session_state.raw_event_store = RawEventStore()
         st.session_state.prompt_to_process = None # Clear any pending prompt
         st.success(f"Session created successfully! Session ID: {st.session_state.session_id}")
     except requests.exceptions.RequestException as e:
         st.error(f"Error creating session: {e}")
         st.session_state.session_id = None
 
-def process_agent_response_stream(server_url, question):
-    """Processes the streaming response from the ADK agent for the chat."""
+def start_agent_response_stream(server_url, question):
+    """Starts streaming the agent's answer to `question` on a background thread.
+
+    The assistant message is added to the history right away. A StreamConsumer reads the SSE
+    stream into a bounded queue, so this returns at once and the script run is not held
+    while the agent works; `show_active_stream` drains the queue into the message.
+    """
     if not st.session_state.session_id:
         st.error("Session not created. Please create a session first.")
         st.session_state.current_query_active = False
         return
 
-    headers = {"Accept": "text/event-stream"}
     params = {
         "session_id": st.session_state.session_id,
         "question": question,
         "streaming": "true"
     }
-    if st.session_state.last_event_id:
-        headers["Last-Event-ID"] = str(st.session_state.last_event_id)
 
-    url = f"{server_url}/run_sse"
-    
     assistant_message_idx = len(st.session_state.chat_history)
-    st.session_state.chat_history.append({
+    current_message_entry = {
         "role": "assistant", 
-        "content": "", # Initial content, will be built by build_display_text
-        "raw_events": [], 
-        "utterances": {}, # To store text, partial_received, final_text_set per utterance_id
+        "content": "", # Shown only if no event text arrives (e.g. connection errors)
+        "raw_events": st.session_state.raw_event_store.new_log(), # Bounded, compressed once older
+        "message": AssistantMessage(), # Utterances and text segments in arrival order
         "current_display_text": "▌" # Initial display with cursor
-    })
-    # Initial rerun to show the assistant placeholder with a cursor
-    st.rerun()
+    }
+    st.session_state.chat_history.append(current_message_entry)
+    timer = StreamTimer(f"assistant message {assistant_message_idx + 1}", sinks=TIMING_SINKS)
+
+    # Runs on the consumer thread: no st.* calls here, only the queue.
+    def connect(last_event_id, attempt):
+        # The server replays the events after Last-Event-ID, so a reconnect resumes the answer
+        # instead of asking the question again. Replayed duplicates are dropped by id.
+        headers = dict(SSE_ACCEPT_HEADERS) # gzip/br streams are decoded by requests
+        if last_event_id:
+            headers["Last-Event-ID"] = str(last_event_id)
+        with get_client(server_url).get("/run_sse", headers=headers, params=params, stream=True) as r:
+            consumer.watch(r) # Lets Stop shut the socket down mid-read
+            try:
+                r.raise_for_status()
+                yield from sse_json_events(timer.chunks(r.iter_content(chunk_size=None)))
+            finally:
+                consumer.watch(None)
+
+    def on_reconnect(attempt, delay, error):
+        consumer.status(f"Connection lost, reconnecting in {delay:.1f}s (attempt {attempt})")
+
+    stream = ResumableStream(connect, last_event_id=st.session_state.last_event_id, on_reconnect=on_reconnect)
+    consumer = StreamConsumer(stream, name=f"sse-{st.session_state.session_id[:8]}")
+    st.session_state.active_stream = {
+        "consumer": consumer.start(),
+        "entry": current_message_entry,
+        "timer": timer,
+        "utterance_id": None, # Events without an utterance_id belong to the one currently streaming
+        "error": None,
+    }
 
 
-    current_utterance_id_streaming = None # Renamed to avoid conflict
-    
+def apply_stream_event(active, sse_event, event_data):
+    """Applies one event to the in-flight message. Returns True when the stream is over."""
+    current_message_entry = active["entry"]
+    decoded_line = f"data: {sse_event.text}"
+    current_message_entry["raw_events"].append(decoded_line)
+    if event_data is None:
+        current_message_entry["raw_events"].append(f"Could not parse JSON: {sse_event.text}")
+        return False
+
     try:
-        with requests.get(url, headers=headers, params=params, stream=True) as r:
-            r.raise_for_status()
-            for line in r.iter_lines():
-                if not st.session_state.current_query_active:
-                    print("Stream stopped as current_query_active is false.")
-                    break 
-                if line:
-                    decoded_line = line.decode('utf-8')
-                    # Ensure assistant_message_idx is still valid (e.g. session not reset)
-                    if assistant_message_idx >= len(st.session_state.chat_history) or \
-                       st.session_state.chat_history[assistant_message_idx]["role"] != "assistant":
-                        print("Chat history changed unexpectedly. Aborting stream processing for this message.")
-                        break
-                    
-                    current_message_entry = st.session_state.chat_history[assistant_message_idx]
-                    current_message_entry["raw_events"].append(decoded_line)
-
-                    if decoded_line.startswith("data:"):
-                        try:
-                            event_data_str = decoded_line[len("data:"):]
-                            event_data = json.loads(event_data_str)
-                            
-                            st.session_state.last_event_id = event_data.get("id")
-                            event_type = event_data.get("event")
-                            data = event_data.get("data", {})
-                            utterance_id_from_event = data.get("utterance_id")
-
-                            if utterance_id_from_event and utterance_id_from_event != current_utterance_id_streaming:
-                                current_utterance_id_streaming = utterance_id_from_event
-                                if current_utterance_id_streaming not in current_message_entry["utterances"]:
-                                    current_message_entry["utterances"][current_utterance_id_streaming] = \
-                                        {"text": "", "partial_received": False, "final_text_set": False}
-                            
-                            utt_data = current_message_entry["utterances"].get(current_utterance_id_streaming)
-
-                            if event_type == "speak":
-                                text = data.get("text", "")
-                                partial = data.get("partial", False)
-                                if utt_data:
-                                    utt_data["text"] = text # ADK often sends cumulative text for partials
-                                    if partial:
-                                        utt_data["partial_received"] = True
-                                        utt_data["final_text_set"] = False
-                                    else: # Final event for this speak
-                                        utt_data["final_text_set"] = True
-                                else: # Fallback if speak event has no utterance_id context
-                                    current_message_entry["content"] += text + ("" if partial else "\n")
-
-
-                            elif event_type == "tool_code":
-                                tool_name = data.get("tool_name")
-                                tool_input_str = data.get("tool_input", "{}")
-                                tool_msg = f'''\n*Executing tool: `{tool_name}` with input:*\n```json\n{tool_input_str}\n```\n'''
-                                if utt_data: utt_data["text"] += tool_msg
-                                else: current_message_entry["content"] += tool_msg
-                            
-                            elif event_type == "tool_result":
-                                tool_name = data.get("tool_name")
-                                tool_output_str = data.get("tool_output", "{}")
-                                result_msg = f'''\n*Tool `{tool_name}` result:*\n```json\n{tool_output_str}\n```\n'''
-                                if utt_data: utt_data["text"] += result_msg
-                                else: current_message_entry["content"] += result_msg
-
-                            elif event_type == "error":
-                                error_message = data.get("message", "Unknown error")
-                                error_msg_display = f"\n**Agent error:** {error_message}"
-                                if utt_data: utt_data["text"] += error_msg_display
-                                else: current_message_entry["content"] += error_msg_display
-                                st.session_state.current_query_active = False
-                            
-                            elif event_type == "end":
-                                if utt_data and not utt_data["final_text_set"]:
-                                    utt_data["final_text_set"] = True 
-                                st.session_state.current_query_active = False
-
-
-                            current_message_entry["current_display_text"] = build_display_text(current_message_entry)
-                            st.rerun()
-                            
-                            if event_type == "end" or event_type == "error":
-                                return # Exit processing loop
-
-                        except json.JSONDecodeError:
-                            current_message_entry["raw_events"].append(f"Could not parse JSON: {event_data_str}")
-                            st.rerun()
-                        except Exception as e:
-                            error_info = f"Error processing event: {e} - Line: {decoded_line}"
-                            current_message_entry["raw_events"].append(error_info)
-                            current_message_entry["content"] += f"\n{error_info}" # Add to visible content
-                            current_message_entry["current_display_text"] = build_display_text(current_message_entry, final_pass=True)
-                            st.error(f"Stream error: {e}") 
-                            st.session_state.current_query_active = False
-                            st.rerun()
-                            return
-            
-            # Stream ended naturally if loop finishes
-            st.session_state.current_query_active = False
-            if assistant_message_idx < len(st.session_state.chat_history):
-                current_message_entry = st.session_state.chat_history[assistant_message_idx]
-                # Mark all utterances as final if not already, just in case ADK stream ends without final partial=false
-                for utt_id_key in current_message_entry["utterances"]:
-                    if not current_message_entry["utterances"][utt_id_key]["final_text_set"]:
-                        current_message_entry["utterances"][utt_id_key]["final_text_set"] = True
-                current_message_entry["current_display_text"] = build_display_text(current_message_entry, final_pass=True)
+        active["timer"].observe(event_data)
+
+        if isinstance(event_data, PartialText): # Partial speak events, the bulk of the stream
+            st.session_state.last_event_id = event_data.id
+            if event_data.utterance_id:
+                active["utterance_id"] = event_data.utterance_id
+            current_message_entry["message"].speak(active["utterance_id"], event_data.text, True)
+            return False
+    
+        st.session_state.last_event_id = event_data.get("id")
+        event_type = event_data.get("event")
+        data = event_data.get("data", {})
+        utterance_id_from_event = data.get("utterance_id")
+
+        if utterance_id_from_event:
+            active["utterance_id"] = utterance_id_from_event
+        current_utterance_id_streaming = active["utterance_id"]
+        message = current_message_entry["message"]
+
+        if event_type == "speak":
+            text = data.get("text", "")
+            partial = data.get("partial", False)
+            # Partials may be cumulative or delta chunks; the message merges only the new suffix
+            message.speak(current_utterance_id_streaming, text, partial)
+
+        elif event_type == "tool_code":
+            tool_name = data.get("tool_name")
+            tool_input_str = data.get("tool_input", "{}")
+            tool_msg = f'''\n*Executing tool: `{tool_name}` with input:*\n```json\n{tool_input_str}\n```\n'''
+            message.append(current_utterance_id_streaming, tool_msg)
+        
+        elif event_type == "tool_result":
+            tool_name = data.get("tool_name")
+            tool_output_str = data.get("tool_output", "{}")
+            result_msg = f'''\n*Tool `{tool_name}` result:*\n```json\n{tool_output_str}\n```\n'''
+            message.append(current_utterance_id_streaming, result_msg)
+
+        elif event_type == "progress":
+            # A long-running tool is still working; shown below the text, not kept in it
+            message.progress(f"`{data.get('tool_name')}`: {data.get('message', '')}")
+
+        elif event_type == "error":
+            error_message = data.get("message", "Unknown error")
+            error_msg_display = f"\n**Agent error:** {error_message}"
+            message.append(current_utterance_id_streaming, error_msg_display)
+
+        return event_type == "end" or event_type == "error"
+
+    except Exception as e:
+        error_info = f"Error processing event: {e} - Line: {decoded_line}"
+        current_message_entry["raw_events"].append(error_info)
+        current_message_entry["message"].append(active["utterance_id"], f"\n{error_info}") # Add to visible content
+        active["error"] = f"Stream error: {e}"
+        return True
+
+
+def drain_agent_response_stream(active, max_events=MAX_EVENTS_PER_FRAME):
+    """Applies the events queued since the last frame. Returns True when the stream is over."""
+    consumer = active["consumer"]
+    for kind, value in consumer.poll(max_items=max_events):
+        if kind == STATUS:
+            active["entry"]["message"].progress(value)
+        elif kind == ITEM:
+            if apply_stream_event(active, *value):
+                consumer.cancel() # Done: stop reading and release the socket now
+                return True
+        elif kind == DONE:
+            if isinstance(value, requests.exceptions.HTTPError):
+                active["error"] = f"HTTP Error: {value.response.status_code} {value.response.reason}"
+            elif isinstance(value, requests.exceptions.RequestException):
+                active["error"] = f"Error querying agent: {value}"
+            elif value is not None:
+                active["error"] = f"Stream error: {value}"
+            if active["error"] and not active["entry"]["message"]:
+                active["entry"]["content"] = active["error"] # Shown instead of the (empty) message
+            return True
+    return consumer.cancelled
+
+
+def finish_agent_response_stream():
+    """Finalizes the in-flight message once its stream is over and re-enables input."""
+    active = st.session_state.active_stream
+    st.session_state.active_stream = None
+    active["consumer"].cancel()
+    current_message_entry = active["entry"]
+    # Mark all utterances as final, just in case ADK stream ends without final partial=false
+    current_message_entry["message"].finish()
+    st.session_state.current_query_active = False
+    current_message_entry["raw_events"].seal() # Message is done, compress its remaining events
+    current_message_entry["timings"] = active["timer"].finish(error=active["error"])
+    current_message_entry["current_display_text"] = build_display_text(current_message_entry, final_pass=True)
+
+
+def stop_agent_response_stream():
+    """Stop button: cancels the stream. Its socket is shut down at once, even mid-read."""
+    if st.session_state.active_stream is not None:
+        st.session_state.active_stream["consumer"].cancel()
+
+
+def show_active_stream(render_interval=RENDER_INTERVAL_SECONDS):
+    """Draws the in-flight assistant message, refreshed from the stream queue every interval.
+
+    Only this fragment reruns while the answer streams; the rest of the page stays usable.
+    When the stream is over, one full rerun redraws the finished history.
+    """
+    @st.fragment(run_every=max(render_interval, MIN_RENDER_INTERVAL_SECONDS))
+    def active_stream_fragment():
+        active = st.session_state.active_stream
+        if active is None:
+            return
+        if drain_agent_response_stream(active):
+            finish_agent_response_stream()
             st.rerun()
+        entry = active["entry"]
+        entry["current_display_text"] = build_display_text(entry)
+        with st.chat_message("assistant"):
+            st.markdown(entry["current_display_text"])
+            st.button("Stop", key="stop_stream_button", on_click=stop_agent_response_stream)
 
-
-    except requests.exceptions.HTTPError as e:
-        err_msg = f"HTTP Error: {e.response.status_code} {e.response.reason}"
-        st.error(err_msg)
-        # st.text(e.response.text) # Can be too verbose
-        st.session_state.current_query_active = False
-        if assistant_message_idx < len(st.session_state.chat_history):
-            st.session_state.chat_history[assistant_message_idx]["content"] = err_msg
-            st.session_state.chat_history[assistant_message_idx]["current_display_text"] = err_msg
-        st.rerun()
-    except requests.exceptions.RequestException as e:
-        err_msg = f"Error querying agent: {e}"
-        st.error(err_msg)
-        st.session_state.current_query_active = False
-        if assistant_message_idx < len(st.session_state.chat_history):
-            st.session_state.chat_history[assistant_message_idx]["content"] = err_msg
-            st.session_state.chat_history[assistant_message_idx]["current_display_text"] = err_msg
-        st.rerun()
-    finally:
-        # Ensure query active is false and final display update
-        st.session_state.current_query_active = False
-        if assistant_message_idx < len(st.session_state.chat_history) and \
-           st.session_state.chat_history[assistant_message_idx]["role"] == "assistant":
-            current_message_entry = st.session_state.chat_history[assistant_message_idx]
-            current_message_entry["current_display_text"] = build_display_text(current_message_entry, final_pass=True)
-        # Final rerun to clean up cursor etc.
-        st.rerun()
+    active_stream_fragment()
 
 
 def build_display_text(assistant_message_entry, final_pass=False):
     """Constructs the text to display for an assistant message from its utterances."""
-    parts = []
-    # Sort by first appearance if utterance_ids are not strictly ordered numbers
-    # For now, assuming they are received in a somewhat logical order or ADK handles it.
-    # Or, one could sort keys if they are sortable e.g. utterance_1, utterance_2
-    
-    sorted_utterance_ids = sorted(assistant_message_entry["utterances"].keys())
-
-    for utt_id in sorted_utterance_ids: 
-        utt_data = assistant_message_entry["utterances"][utt_id]
-        text_to_display = utt_data["text"]
-        # Add cursor only if it's the very last part of the overall message and it's still partial
-        # This logic is simplified: cursor is shown if any part is streaming and it's the last one.
-        # More precise: only the last utterance that is partial should have a cursor.
-        # This function builds the full text. Cursor handling will be at the end.
-        parts.append(text_to_display)
-    
-    full_text = "".join(parts) # Join all utterance texts. ADK usually provides cumulative text or distinct segments.
+    message = assistant_message_entry["message"]
+    # Rendered incrementally by AssistantMessage: cached prefix plus the still-changing tail
+    full_text = message.text()
 
-    # Add any content that wasn't part of an utterance (e.g. initial errors, or simple non-utterance messages)
-    if not assistant_message_entry["utterances"] and assistant_message_entry["content"]:
-        full_text = assistant_message_entry["content"] + full_text # Prepend or append as makes sense
+    # Show content that wasn't part of any event (e.g. connection errors)
+    if not message and assistant_message_entry["content"]:
+        full_text = assistant_message_entry["content"]
 
-    # Determine if a cursor should be shown
+    # Cursor while the last utterance is still partial, or before any text arrived
     show_cursor = False
     if not final_pass and st.session_state.current_query_active:
-        if sorted_utterance_ids:
-            last_utt_id = sorted_utterance_ids[-1]
-            if not assistant_message_entry["utterances"][last_utt_id]["final_text_set"]:
-                show_cursor = True
-        elif not full_text: # No utterances and no text yet, but query is active (initial state)
-             show_cursor = True
-
-
-    return full_text + ("▌" if show_cursor else "")
+        show_cursor = message.streaming or not full_text
+
+    status = ""
+    if not final_pass and message.status:
+        status = f"\n\n⏳ *{message.status}*"
+        show_cursor = False
+
+    return full_text + ("▌" if show_cursor else "") + status
+
+
+def timing_breakdown(record):
+    """Markdown table of one message's timing record (request start to each milestone)."""
+    def ms(value):
+        return "–" if value is None else f"{value:,.0f} ms"
+
+    rows = [
+        ("First byte", ms(record["ttfb_ms"])),
+        ("First event", ms(record["first_event_ms"])),
+        ("First text", ms(record["ttft_ms"])),
+    ]
+    for call in record["tool_calls"]:
+        rows.append((f"`{call['tool']}` call → result", ms(call["gap_ms"])))
+        if call.get("feedback_ms") is not None and call["feedback_ms"] != call["gap_ms"]:
+            rows.append((f"`{call['tool']}` call → first progress", ms(call["feedback_ms"])))
+    rows += [
+        ("Longest gap between events", ms(record["max_inter_event_ms"])),
+        ("Stream end", ms(record["total_ms"])),
+        ("Events", str(record["events"])),
+    ]
+    lines = ["| Stage | Time |", "|---|---:|"] + [f"| {stage} | {value} |" for stage, value in rows]
+    if record["error"]:
+        lines.append(f"\n**Error:** {record['error']}")
+    return "\n".join(lines)
 
 
 # --- Streamlit UI ---
@@ -242,7 +313,12 @@ st.set_page_config(layout="wide")
 st.title("ADK Agent Chat Client")
 
 st.sidebar.header("Connection")
-server_url = st.sidebar.text_input("ADK Server URL", "http://localhost:8000", key="server_url_input")
+server_url = st.sidebar.text_input("ADK Server URL", DEFAULT_SERVER_URL, key="server_url_input")
+render_interval_ms = st.sidebar.number_input(
+    "Render interval (ms)", min_value=int(MIN_RENDER_INTERVAL_SECONDS * 1000), max_value=1000,
+    value=int(RENDER_INTERVAL_SECONDS * 1000), step=10,
+    help="The streaming answer is refreshed from the background stream once per interval.",
+    key="render_interval_input")
 
 if st.sidebar.button("Create New Session", key="new_session_button"):
     create_session(server_url)
@@ -257,17 +333,32 @@ else:
         st.session_state.first_run_done = True # Ensure this only happens once automatically
         if st.session_state.session_id: st.rerun() 
 
+# Per-message timing breakdown (time to first byte/text, tool gaps, end of stream)
+timed_messages = {f"Assistant message {i + 1}": message["timings"]
+                  for i, message in enumerate(st.session_state.chat_history) if message.get("timings")}
+if timed_messages:
+    st.sidebar.header("Timing")
+    timing_choice = st.sidebar.selectbox("Message", list(timed_messages)[::-1], key="timing_message_select")
+    st.sidebar.markdown(timing_breakdown(timed_messages[timing_choice]))
+
 # Display chat messages
 st.header("Chat")
+active_entry = st.session_state.active_stream and st.session_state.active_stream["entry"]
 for i, message in enumerate(st.session_state.chat_history):
+    if message is active_entry:
+        continue # Drawn by show_active_stream below, which refreshes it on its own
     with st.chat_message(message["role"]):
         display_content = message.get("current_display_text", message["content"])
         st.markdown(display_content)
         
         if message["role"] == "assistant" and message.get("raw_events"):
-            with st.expander(f"Show Raw Events (Assistant Message {i+1})", expanded=False):
-                # Display raw events as a list of strings for readability
-                st.text("\n".join(message["raw_events"]))
+            # Tracks open state, so events are only decompressed and sent while the expander is open
+            raw_events_expander = st.expander(f"Show Raw Events (Assistant Message {i+1})", expanded=False,
+                                              key=f"raw_events_{i}", on_change="rerun")
+            with raw_events_expander:
+                if raw_events_expander.open:
+                    # Display raw events as a list of strings for readability
+                    st.text(message["raw_events"].text())
 
 
 # Handle chat input and processing trigger
@@ -286,8 +377,11 @@ if prompt_from_input := st.chat_input("What is your question?",
 if st.session_state.prompt_to_process and st.session_state.current_query_active:
     prompt_to_run = st.session_state.prompt_to_process
     st.session_state.prompt_to_process = None # Clear the flag
-    process_agent_response_stream(server_url, prompt_to_run)
-    # process_agent_response_stream handles its own reruns and eventually sets current_query_active to False
+    start_agent_response_stream(server_url, prompt_to_run)
+
+if st.session_state.active_stream is not None:
+    # Refreshes only this part of the page while the answer streams, then reruns once when it is done
+    show_active_stream(render_interval=render_interval_ms / 1000)
 
 
 # Status indicator when agent is responding
@@ -298,8 +392,8 @@ if st.session_state.current_query_active and not st.session_state.prompt_to_proc
        "▌" in st.session_state.chat_history[-1].get("current_display_text", ""):
         st.info("Agent is responding...")
     elif not st.session_state.chat_history or st.session_state.chat_history[-1]["role"] == "user":
-        # This implies current_query_active but assistant placeholder not yet added by process_agent_response_stream
-        # This state should be very brief due to the immediate rerun in process_agent_response_stream
+        # This implies current_query_active but assistant placeholder not yet added by start_agent_response_stream
+        # This state should be very brief, as the stream is started in the same run
         pass
 
 
@@ -308,14 +402,16 @@ st.markdown('''
 ### Notes on Streaming Logic:
 - **Chat Interface**: User questions and agent responses are displayed sequentially. `st.chat_message` is used for styling.
 - **Real-time Updates**: Agent responses are updated live as text streams in. A `▌` cursor indicates ongoing generation for the assistant's message.
-- **Utterance Handling**: The app groups related pieces of text using `utterance_id` from ADK events. Each utterance is built up from partials (where ADK often sends cumulative text for a given partial `speak` event) and then finalized. Tool calls and results are interspersed.
-- **`st.rerun()` Strategy**:
+- **Utterance Handling**: The app groups related pieces of text using `utterance_id` from ADK events, in arrival order. Each utterance is built up from partials, which may carry the cumulative text so far or only the new delta (detected by `adk_client.partials.PartialMerger`, which appends just the new suffix), and then finalized, with the final text correcting it if it differs. Tool calls and results are interspersed as their own segments. Finished segments are joined once into a cached prefix, so each redraw only re-joins the text that is still streaming.
+- **Tool Progress**: `progress` events from long-running tools (e.g. the slow weather tool) are shown as a ⏳ status line below the message while the tool runs, and replaced by the next text or tool result.
+- **Rendering Strategy**:
     - User submits input: Add to history, set `prompt_to_process` flag, `st.rerun()`.
-    - Script reruns: User message is displayed. `prompt_to_process` flag triggers `process_agent_response_stream`.
-    - `process_agent_response_stream` adds an assistant message placeholder to history and calls `st.rerun()` to show it (often just the cursor initially).
-    - As SSE events arrive, `process_agent_response_stream` updates the assistant's message in `st.session_state.chat_history` and calls `st.rerun()` to refresh the display.
-    - On stream `end` or `error`, or if the stream connection closes, `current_query_active` is set to `False`, and a final `st.rerun()` ensures the UI is clean.
-- **Raw JSON Events**: Each assistant message has an expandable section to view the raw SSE events.
-- **Session Management**: A session can be created via a sidebar button. A new session clears chat history. An attempt to auto-create a session is made on the first load if a server URL is present.
+    - Script reruns: User message is displayed. `prompt_to_process` flag triggers `start_agent_response_stream`.
+    - `start_agent_response_stream` adds an assistant message to history and starts a background thread (`adk_client.consumer.StreamConsumer`) that reads the SSE stream into a bounded queue. The script run then finishes, so the page stays responsive however slow the agent is, and several browser sessions can stream at once without holding script threads.
+    - The in-flight message is drawn by a fragment that reruns on its own once per render interval (50 ms by default, configurable in the sidebar). Each run applies the events queued since the last one and redraws the message. The rest of the page is not re-executed. If the page falls behind, the queue fills up and the reader thread stops reading from the socket until it catches up. If nothing drains the queue for a minute (the tab was closed), the consumer cancels the stream, which releases the thread and its socket.
+    - The **Stop** button under the streaming message cancels the stream. Its socket is shut down right away, even while the agent is silent (e.g. during a slow tool).
+    - On stream `end` or `error`, Stop, or if the stream connection closes for good, `current_query_active` is set to `False`, and a single `st.rerun()` redraws the finished history.
+- **Raw JSON Events**: Each assistant message has an expandable section to view the raw SSE events. Capture is bounded: each message keeps at most 2000 events, older events are stored zlib-compressed, and the whole chat shares a 4 MB budget (oldest messages give up events first). Events are only decompressed while the expander is open.
+- **Session Management**: A session can be created via a sidebar button. A new session clears chat history. An attempt to auto-create a session is made on the first load if a server URL is present. Sessions come from a pool shared by the whole Streamlit server, which creates them in the background ahead of time, so a new session is usually ready at once.
 ''')
 
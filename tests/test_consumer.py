@@ -0,0 +1,40 @@
+import itertools
+import time
+
+from adk_client.consumer import DONE, ITEM, StreamConsumer
+
+
+class EndlessStream:
+    """An answer that never ends, like a long stream whose page was closed."""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def __iter__(self):
+        for i in itertools.count():
+            if self.cancelled:
+                raise ConnectionError("socket shut down")
+            yield i
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_consumer_cancels_itself_when_nobody_polls():
+    stream = EndlessStream()
+    consumer = StreamConsumer(stream, maxsize=5, stall_timeout=0.3).start()
+    start = time.monotonic()
+    assert consumer.join(timeout=5)
+    assert 0.3 <= time.monotonic() - start < 5
+    assert consumer.stalled and consumer.cancelled and stream.cancelled
+    assert consumer.poll() == [(DONE, None)]
+
+
+def test_consumer_that_is_polled_does_not_stall():
+    consumer = StreamConsumer(iter(range(50)), maxsize=5, stall_timeout=0.3).start()
+    items = []
+    while not consumer.done:
+        items += [value for kind, value in consumer.poll(timeout=0.05) if kind == ITEM]
+        time.sleep(0.01)
+    assert items == list(range(50))
+    assert not consumer.stalled
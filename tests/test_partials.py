@@ -0,0 +1,70 @@
+from adk_client.partials import CUMULATIVE, DELTA, PartialMerger
+
+
+def merge(chunks, mode=None):
+    """(merger, what each add() returned) after adding every chunk."""
+    merger = PartialMerger(mode)
+    return merger, [merger.add(chunk) for chunk in chunks]
+
+
+def test_delta_chunks_are_appended():
+    merger, added = merge(["The ", "weather ", "is ", "sunny."])
+    assert merger.text == "The weather is sunny."
+    assert merger.mode == DELTA
+    assert added == ["The ", "weather ", "is ", "sunny."]
+
+
+def test_cumulative_chunks_add_their_new_suffix():
+    merger, added = merge(["The", "The weather", "The weather is", "The weather is sunny."])
+    assert merger.text == "The weather is sunny."
+    assert merger.mode == CUMULATIVE
+    assert added == ["The", " weather", " is", " sunny."]
+    assert merger.corrections == 0
+
+
+def test_repeated_deltas_are_not_taken_for_cumulative_text():
+    merger, _ = merge(["ha", "ha", "ha", " done"])
+    assert merger.text == "hahaha done"
+    assert merger.mode == DELTA
+
+
+def test_deltas_that_look_cumulative_at_first_are_rebuilt():
+    # "ha" then "hah" reads as cumulative until "a" breaks the pattern.
+    merger, added = merge(["ha", "hah", "a", "!"])
+    assert merger.text == "hahaha!"
+    assert merger.mode == DELTA
+    assert added[2] is None  # the shown text is rebuilt once...
+    assert merger.corrections == 0  # ...which is not a server correction
+    assert added[3] == "!"
+
+
+def test_known_mode_skips_detection():
+    merger, _ = merge(["ab", "abc", "abcd", "abcde"], mode=DELTA)
+    assert merger.text == "ababcabcdabcde"
+
+
+def test_final_text_extending_the_partials_is_appended():
+    merger, _ = merge(["The ", "weather"], mode=DELTA)
+    assert merger.final("The weather is sunny.") == " is sunny."
+    assert merger.text == "The weather is sunny."
+    assert merger.corrections == 0
+
+
+def test_final_text_equal_to_the_partials_adds_nothing():
+    merger, _ = merge(["The ", "weather"], mode=DELTA)
+    assert merger.final("The weather") == ""
+    assert merger.corrections == 0
+
+
+def test_final_text_differing_from_the_partials_replaces_them():
+    merger, _ = merge(["The ", "wether"], mode=DELTA)
+    assert merger.final("The weather") is None
+    assert merger.text == "The weather"
+    assert merger.corrections == 1
+
+
+def test_cumulative_chunk_rewriting_earlier_text_replaces_it():
+    merger, added = merge(["a", "ab", "abc", "abcd", "abXde"])
+    assert added[-1] is None
+    assert merger.text == "abXde"
+    assert merger.corrections == 1
@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from multi_tool_agent import agent, progress
+from multi_tool_agent.mock_model import MockLlm
+from multi_tool_agent.progress import report_progress, streams_progress
+from multi_tool_agent.tool_cache import TOOL_CACHES, cached_tool
+
+TOOL_DELAY = 2.0
+
+
+async def time_slow_call(root):
+    """(seconds from the function call to the next event and to the result, progress events)."""
+    runner = InMemoryRunner(agent=root, app_name="test")
+    session = await runner.session_service.create_session(app_name="test", user_id="test")
+    message = types.Content(role="user", parts=[types.Part(text="get slow weather for new york")])
+    called = first_after_call = responded = None
+    progress_events = 0
+    async for event in runner.run_async(user_id="test", session_id=session.id, new_message=message):
+        now = time.perf_counter()
+        if called is not None and first_after_call is None:
+            first_after_call = now
+        if event.get_function_calls():
+            called = now
+        if event.get_function_responses():
+            responded = now
+        if event.custom_metadata and progress.PROGRESS_METADATA_KEY in event.custom_metadata:
+            progress_events += 1
+    return first_after_call - called, responded - called, progress_events
+
+
+def slow_weather_model():
+    return MockLlm(script=[[("slow_get_weather", {"city": "New York"})]], final_text="Sunny.")
+
+
+def run_slow_call(root, monkeypatch):
+    monkeypatch.setattr(agent, "SLOW_WEATHER_DELAY_SECONDS", TOOL_DELAY)
+    for cache in TOOL_CACHES.values():
+        cache.clear()
+    return asyncio.run(time_slow_call(root))
+
+
+def test_progress_event_follows_the_call_within_a_second(monkeypatch):
+    root = agent.create_root_agent().clone(update={"model": slow_weather_model()})
+    feedback, result, progress_events = run_slow_call(root, monkeypatch)
+    assert feedback < 1.0
+    assert result >= TOOL_DELAY * 0.9  # the tool itself still takes its time
+    assert progress_events >= 1
+
+
+def test_plain_agent_is_silent_until_the_result(monkeypatch):
+    tools = agent.create_root_agent().tools
+    root = LlmAgent(name="plain_agent", model=slow_weather_model(), tools=tools)
+    feedback, result, progress_events = run_slow_call(root, monkeypatch)
+    assert feedback >= TOOL_DELAY * 0.9
+    assert progress_events == 0
+
+
+def test_shared_call_progress_reaches_every_caller():
+    first_reported, joined = asyncio.Event(), asyncio.Event()
+
+    @cached_tool(ttl=60)
+    @streams_progress
+    async def slow(city: str) -> dict:
+        for step in range(3):
+            yield f"step {step}"
+            if step == 0:
+                first_reported.set()
+                await joined.wait()  # the rest is reported once the second caller shares the call
+        yield {"status": "success", "report": city}
+
+    reports = {"first": [], "second": []}
+
+    def listen(name):
+        progress._progress_sink.set(lambda tool, message: reports[name].append((tool, message)))
+
+    async def first():
+        listen("first")
+        return await slow("x")
+
+    async def second():
+        listen("second")
+        await first_reported.wait()
+        call = asyncio.ensure_future(slow("x"))
+        while not slow.cache.stats()["coalesced"]:  # registered as a caller of the shared call
+            await asyncio.sleep(0)
+        joined.set()
+        return await call
+
+    async def main():
+        return await asyncio.gather(first(), second())
+
+    assert [r["report"] for r in asyncio.run(main())] == ["x", "x"]
+    assert reports["first"] == [("slow", f"step {step}") for step in range(3)]
+    # The second caller joined after the first report and gets the ones after it.
+    assert reports["second"] == [("slow", f"step {step}") for step in (1, 2)]
+    assert slow.cache.stats()["misses"] == 1
+
+
+def test_report_progress_outside_an_agent_is_a_no_op():
+    report_progress("nobody listening")
@@ -0,0 +1,36 @@
+import threading
+
+from adk_client.session_pool import PooledSession, SessionPool
+
+
+def test_close_deletes_ready_sessions_and_keeps_handed_out_ones():
+    created, deleted = [], []
+    lock = threading.Lock()
+
+    def create(session_id=None):
+        session = PooledSession(session_id or f"s{len(created)}")
+        with lock:
+            created.append(session.session_id)
+        return session
+
+    pool = SessionPool(create, size=2, delete=lambda session: deleted.append(session.session_id))
+    pool.fill()
+    taken = pool.acquire()  # refills the pool up to 2 ready sessions
+    pool.reserve("named")
+    pool._executor.submit(lambda: None).result()  # let the pending creations start
+    pool.close()
+    pool._executor.shutdown(wait=True)
+    assert taken.session_id not in deleted and "named" not in deleted
+    assert sorted(deleted) == sorted(set(created) - {taken.session_id, "named"})
+    assert len(deleted) == 2
+
+
+def test_failed_delete_is_logged(caplog):
+    def delete(session):
+        raise ConnectionError("server gone")
+
+    pool = SessionPool(lambda session_id=None: PooledSession("s1"), size=1, delete=delete)
+    pool.fill()
+    pool._ready[0].result()
+    pool.close()
+    assert "could not delete session s1: server gone" in caplog.text
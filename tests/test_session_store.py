@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+
+from google.adk.events import Event
+from google.genai import types
+
+from multi_tool_agent.session_store import SqliteSessionService
+
+
+def user_event(text):
+    return Event(author="user", content=types.Content(role="user", parts=[types.Part(text=text)]))
+
+
+def test_append_moves_update_time(tmp_path):
+    async def main():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"))
+        try:
+            session = await service.create_session(app_name="app", user_id="u", session_id="s")
+            created = session.last_update_time
+            await asyncio.sleep(0.05)
+            event = user_event("hello")
+            await service.append_event(session, event)
+            loaded = await service.get_session(app_name="app", user_id="u", session_id="s")
+            listed = (await service.list_sessions(app_name="app", user_id="u")).sessions
+            return created, event.timestamp, loaded, listed
+        finally:
+            service.close()
+
+    created, appended_at, loaded, listed = asyncio.run(main())
+    assert [e.content.parts[0].text for e in loaded.events] == ["hello"]
+    assert loaded.last_update_time > created
+    assert abs(loaded.last_update_time - appended_at) < 1e-3
+    assert abs(listed[0].last_update_time - appended_at) < 1e-3
+
+
+def test_reads_wait_only_for_their_own_session(tmp_path):
+    async def main():
+        service = SqliteSessionService(str(tmp_path / "sessions.db"))
+        release = threading.Event()
+        store = service._store
+
+        def slow_store(events):
+            if any(session.id == "busy" for session, _ in events):
+                release.wait(5)
+            store(events)
+
+        service._store = slow_store
+        try:
+            busy = await service.create_session(app_name="app", user_id="u", session_id="busy")
+            await service.create_session(app_name="app", user_id="other", session_id="idle")
+            await service.append_event(busy, user_event("queued"))
+            start = time.perf_counter()
+            idle = await service.get_session(app_name="app", user_id="other", session_id="idle")
+            elapsed = time.perf_counter() - start
+            waiting = asyncio.create_task(service.get_session(app_name="app", user_id="u", session_id="busy"))
+            await asyncio.sleep(0.1)
+            blocked = not waiting.done()
+            release.set()
+            return idle, elapsed, blocked, await waiting
+        finally:
+            release.set()
+            service.close()
+
+    idle, elapsed, blocked, busy = asyncio.run(main())
+    assert idle is not None and elapsed < 1
+    assert blocked  # a read of the busy session waits for its queued event...
+    assert [e.content.parts[0].text for e in busy.events] == ["queued"]  # ...and then sees it
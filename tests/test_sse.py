@@ -0,0 +1,22 @@
+from adk_client.sse import SSEDecoder
+
+
+def decode(chunks):
+    decoder = SSEDecoder()
+    events = [event for chunk in chunks for event in decoder.feed(chunk)]
+    return [(event.event, event.id, event.data) for event in events + decoder.close()], decoder
+
+
+def test_event_spanning_many_chunks():
+    body = b"id: 7\r\ndata: " + b"x" * 10_000 + b"\r\ndata: end\r\n\r\n: keep-alive\n\ndata: next\n\n"
+    whole, _ = decode([body])
+    for size in (1, 3, 1024):
+        split, decoder = decode([body[i:i + size] for i in range(0, len(body), size)])
+        assert split == whole
+        assert decoder.last_event_id == "7"
+    assert whole == [("message", "7", "x" * 10_000 + "\nend"), ("message", "7", "next")]
+
+
+def test_bare_carriage_returns_split_lines():
+    events, _ = decode([b"event: a\rdata: 1\r", b"\rdata: 2\n\n"])
+    assert events == [("a", None, "1"), ("message", None, "2")]
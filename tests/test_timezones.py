@@ -0,0 +1,22 @@
+from multi_tool_agent.timezones import get_index, lookup_city
+
+
+def test_major_cities_have_their_own_names():
+    for city, zone in [("Portland", "America/Los_Angeles"), ("Seattle", "America/Los_Angeles"),
+                       ("San Jose", "America/Los_Angeles"), ("Mumbai", "Asia/Kolkata"),
+                       ("Hyderabad", "Asia/Kolkata"), ("Boston", "America/New_York"),
+                       ("Ottawa", "America/Toronto")]:
+        assert lookup_city(city) == (city, zone)
+
+
+def test_aliases_and_shared_names():
+    assert lookup_city("nyc") == ("New York City", "America/New_York")
+    assert lookup_city("Bombay") == ("Mumbai", "Asia/Kolkata")
+    assert lookup_city(" st. petersburg ") == ("Saint Petersburg", "Europe/Moscow")
+    assert lookup_city("Springfield") is not None and lookup_city("Georgetown") is not None
+    assert lookup_city("McMurdo") == ("McMurdo", "Antarctica/McMurdo")
+    assert lookup_city("Nowhereville") is None
+
+
+def test_bundled_table_has_thousands_of_cities():
+    assert len({display for display, _ in get_index()._by_key.values()}) > 25_000
@@ -0,0 +1,86 @@
+import asyncio
+
+from multi_tool_agent.tool_cache import cached_tool, normalize_city
+
+
+def slow_tool(delay=0.2):
+    """A cached async tool counting its runs and cancellations."""
+    calls = {"runs": 0, "cancelled": 0}
+
+    @cached_tool(ttl=60, normalize={"city": normalize_city})
+    async def slow(city: str) -> dict:
+        calls["runs"] += 1
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            calls["cancelled"] += 1
+            raise
+        return {"status": "success", "report": city}
+
+    return slow, calls
+
+
+def test_concurrent_calls_share_one_run():
+    slow, calls = slow_tool()
+
+    async def main():
+        return await asyncio.gather(slow("Paris"), slow(" paris "), slow("PARIS"))
+
+    results = asyncio.run(main())
+    assert [r["report"] for r in results] == ["Paris"] * 3  # the first caller's arguments
+    assert calls["runs"] == 1
+    assert slow.cache.stats()["coalesced"] == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    slow, calls = slow_tool()
+
+    async def main():
+        first = asyncio.create_task(slow("x"))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(slow("x"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        return first, second, result
+
+    first, second, result = asyncio.run(main())
+    assert first.cancelled()
+    assert not second.cancelled()
+    assert result == {"status": "success", "report": "x"}
+    assert calls == {"runs": 1, "cancelled": 0}
+    assert slow.cache.get(("x",)) == (True, result)
+
+
+def test_tool_is_cancelled_when_every_caller_is():
+    slow, calls = slow_tool()
+
+    async def main():
+        tasks = [asyncio.create_task(slow("x")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        return await slow("x")
+
+    assert asyncio.run(main())["report"] == "x"
+    assert calls == {"runs": 2, "cancelled": 1}
+
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    runs = []
+
+    @cached_tool(ttl=60)
+    async def failing(city: str) -> dict:
+        runs.append(city)
+        await asyncio.sleep(0.05)
+        raise ConnectionError("upstream unavailable")
+
+    async def main():
+        return await asyncio.gather(failing("x"), failing("x"), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert runs == ["x"]
+    assert failing.cache.get(("x",)) == (False, None)